@@ -1,14 +1,24 @@
 from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtCore import (
     Qt,
-    QVariantAnimation,
+    QRectF,
     QAbstractAnimation,
 )
-from PyQt6.QtGui import QCursor, QColor
+from PyQt6.QtGui import QCursor, QColor, QPainter, QPen
 import PyQt6
+from MangoUI.utils.AnimationClock import AnimationClock, ClockAnimation
+from MangoUI.utils.ColorFrames import colorFrames
 from MangoUI.utils.ColorOps import to_RGBAtuple
 
 
+PEN_STYLES = {
+    'none': Qt.PenStyle.NoPen,
+    'solid': Qt.PenStyle.SolidLine,
+    'dashed': Qt.PenStyle.DashLine,
+    'dotted': Qt.PenStyle.DotLine,
+}
+
+
 class Button(QPushButton):
     """
     Multi-colored, animated button.
@@ -66,6 +76,13 @@ class Button(QPushButton):
 
     borderRadius : int
         Border radius of button in pixels.
+
+    renderMode : str
+        How button colors are rendered. With ``'styleSheet'``, every color
+        change renders a new QSS style sheet. With ``'paint'``, the style sheet
+        only holds the font, border and padding and is set once, and the
+        button is painted with its current colors, so each animation frame
+        costs a single repaint.
     """
 
     def __init__(
@@ -82,6 +99,7 @@ class Button(QPushButton):
         borderStyle='solid',
         borderWidth=1,
         borderRadius=2,
+        renderMode='styleSheet',
     ):
         if parent:
             super().__init__(parent)
@@ -104,14 +122,41 @@ class Button(QPushButton):
         self.borderWidth = borderWidth
         self.borderRadius = borderRadius
 
+        self.renderMode = renderMode
+        self.buttonStyleSheet = None
+        self.colorAnimation = None
+
         self.setupAnimationColors()
         self.renderStyleSheet()
 
     def renderStyleSheet(self):
         """
         Set QSS style sheet for widget using defined attributes.
+
+        In paint render mode, the style sheet does not hold colors and is only
+        set again when it changes.
         """
 
+        if self.renderMode == 'paint':
+            buttonStyleSheet = f"""
+            QPushButton {{
+                border-style: {str(self.borderStyle)};
+                border-width: {str(self.borderWidth)}px;
+                border-radius: {str(self.borderRadius)}px;
+
+                font-family: {str(self.fontFamily)};
+                font-size: {str(self.fontSize)}pt;
+                font-weight: {self.fontWeight};
+                padding: 5px;
+            }}
+            """
+            if buttonStyleSheet != self.buttonStyleSheet:
+                self.buttonStyleSheet = buttonStyleSheet
+                self.setStyleSheet(self.buttonStyleSheet)
+
+            self.update()
+            return
+
         self.buttonStyleSheet = f"""
             QPushButton {{
                 color: rgba{to_RGBAtuple(self.textColor)};
@@ -134,6 +179,64 @@ class Button(QPushButton):
         """
         self.setStyleSheet(self.buttonStyleSheet)
 
+    def renderColors(self):
+        """
+        Render current colors, by repainting in paint render mode and by
+        rendering the style sheet otherwise.
+        """
+
+        if self.renderMode == 'paint':
+            self.update()
+        else:
+            self.renderStyleSheet()
+
+    def paintEvent(self, event):
+        """
+        Override paint event method for widget to paint the button with its
+        current colors in paint render mode.
+
+        Parameters
+        ----------
+        event : PyQt6.QtGui.QPaintEvent
+            Event passed to base method.
+        """
+
+        if self.renderMode != 'paint':
+            super().paintEvent(event)
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        borderColor = (
+            self.parentBackgroundColor if self.isDown() else self.borderColor
+        )
+        borderStyle = PEN_STYLES.get(
+            str(self.borderStyle), Qt.PenStyle.SolidLine
+        )
+        if self.borderWidth > 0 and borderStyle != Qt.PenStyle.NoPen:
+            pen = QPen(QColor(*borderColor))
+            pen.setWidth(self.borderWidth)
+            pen.setStyle(borderStyle)
+            painter.setPen(pen)
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+
+        inset = self.borderWidth / 2
+        painter.setBrush(QColor(*self.backgroundColor))
+        painter.drawRoundedRect(
+            QRectF(self.rect()).adjusted(inset, inset, -inset, -inset),
+            self.borderRadius,
+            self.borderRadius,
+        )
+
+        painter.setPen(QColor(*self.textColor))
+        painter.setFont(self.font())
+        painter.drawText(
+            self.rect(), Qt.AlignmentFlag.AlignCenter, self.text()
+        )
+        painter.end()
+
     def animateText(self, currentTextColor):
         """
         Update text color during animation.
@@ -145,7 +248,7 @@ class Button(QPushButton):
         """
 
         self.textColor = to_RGBAtuple(currentTextColor)
-        self.renderStyleSheet()
+        self.renderColors()
 
     def animateBackground(self, currentBackgroundColor):
         """
@@ -158,31 +261,54 @@ class Button(QPushButton):
         """
 
         self.backgroundColor = to_RGBAtuple(currentBackgroundColor)
-        self.renderStyleSheet()
+        self.renderColors()
+
+    def animateColors(self, frame):
+        """
+        Update text and background colors during animation.
+
+        Parameters
+        ----------
+        frame : tuple
+            RGBA tuples of current text and background colors.
+        """
+
+        self.textColor, self.backgroundColor = frame
+        self.renderColors()
 
     def setupAnimationColors(self):
         """
-        Set up button colors and animations.
+        Set up button colors and animation.
+
+        Text and background colors are animated together by a single
+        animation on the shared animation clock, so each frame renders the
+        button once. The colors of every frame are precomputed in tables
+        shared by all buttons with the same colors and animation.
         """
 
+        if self.colorAnimation is not None:
+            self.colorAnimation.stop()
+
         self.textColor = self.primaryColor
         self.backgroundColor = self.secondaryColor
         self.borderColor = self.primaryColor
 
-        self.textAnimation = QVariantAnimation(
-            startValue=QColor(*self.textColor),
-            endValue=QColor(*self.backgroundColor),
-            valueChanged=self.animateText,
-            duration=self.animationDuration,
-            easingCurve=self.animationType,
+        frames = colorFrames(
+            (
+                (self.primaryColor, self.secondaryColor),
+                (self.secondaryColor, self.primaryColor),
+            ),
+            self.animationType,
+            self.animationDuration,
+            AnimationClock.instance().frameRate,
         )
 
-        self.backgroundAnimation = QVariantAnimation(
-            startValue=QColor(*self.backgroundColor),
-            endValue=QColor(*self.textColor),
-            valueChanged=self.animateBackground,
+        self.colorAnimation = ClockAnimation(
+            self,
+            self.animateColors,
             duration=self.animationDuration,
             easingCurve=self.animationType,
+            frames=frames,
         )
 
     def enterEvent(self, event):
@@ -196,13 +322,8 @@ class Button(QPushButton):
             Event passed to base method.
         """
 
-        self.textAnimation.setDirection(QAbstractAnimation.Direction.Forward)
-        self.backgroundAnimation.setDirection(
-            QAbstractAnimation.Direction.Forward
-        )
-
-        self.textAnimation.start()
-        self.backgroundAnimation.start()
+        self.colorAnimation.setDirection(QAbstractAnimation.Direction.Forward)
+        self.colorAnimation.start()
 
         super().enterEvent(event)
 
@@ -217,13 +338,10 @@ class Button(QPushButton):
             Event passed to base method.
         """
 
-        self.textAnimation.setDirection(QAbstractAnimation.Direction.Backward)
-        self.backgroundAnimation.setDirection(
+        self.colorAnimation.setDirection(
             QAbstractAnimation.Direction.Backward
         )
-
-        self.textAnimation.start()
-        self.backgroundAnimation.start()
+        self.colorAnimation.start()
 
         super().leaveEvent(event)
 
@@ -261,8 +379,16 @@ class Button(QPushButton):
 
             The button border is set to this color on press and is used to
             provide an illusion of compression on press.
+
+            Setting the colors the button already has does nothing.
         """
 
+        colors = (
+            self.primaryColor,
+            self.secondaryColor,
+            self.parentBackgroundColor,
+        )
+
         if primaryColor is not None:
             self.primaryColor = to_RGBAtuple(primaryColor)
 
@@ -272,9 +398,31 @@ class Button(QPushButton):
         if parentBackgroundColor is not None:
             self.parentBackgroundColor = to_RGBAtuple(parentBackgroundColor)
 
+        if colors == (
+            self.primaryColor,
+            self.secondaryColor,
+            self.parentBackgroundColor,
+        ):
+            return
+
         self.setupAnimationColors()
         self.renderStyleSheet()
 
+    def setRenderMode(self, renderMode):
+        """
+        Set how button colors are rendered.
+
+        Parameters
+        ----------
+        renderMode : str
+            ``'styleSheet'`` to render colors in the style sheet, or
+            ``'paint'`` to paint them.
+        """
+
+        self.renderMode = renderMode
+        self.buttonStyleSheet = None
+        self.renderStyleSheet()
+
     def setFont(self, fontFamily=None, fontSize=None, fontWeight=None):
         """
         Set button text font properties.
@@ -3,11 +3,9 @@ from PyQt6.QtCore import (
     Qt,
     QPoint,
     pyqtSlot,
-    QParallelAnimationGroup,
-    QPropertyAnimation,
-    QAbstractAnimation,
 )
 import PyQt6
+from MangoUI.utils.AnimationClock import ClockAnimation
 
 
 class Slider(QStackedWidget):
@@ -54,6 +52,9 @@ class Slider(QStackedWidget):
         self.currentSlide = 0
         self.nextSlide = 0
         self.currentPosition = QPoint(0, 0)
+        self.slideStarts = ()
+        self.slideOffset = QPoint(0, 0)
+        self.slideAnimation = None
         self.active = False
 
     def setSlideDirection(self, slideDirection):
@@ -189,32 +190,38 @@ class Slider(QStackedWidget):
         self.widget(iNext).show()
         self.widget(iNext).raise_()
 
-        animationGroup = QParallelAnimationGroup(
+        self.slideStarts = (positionCurrent, positionNext - offset)
+        self.slideOffset = offset
+
+        self.slideAnimation = ClockAnimation(
             self,
+            self.animateSlide,
+            duration=self.animationDuration,
+            easingCurve=self.animationType,
             finished=self.animationDoneSlot,
         )
 
-        for idx, start, end in zip(
-            (i, iNext),
-            (positionCurrent, positionNext - offset),
-            (positionCurrent + offset, positionNext),
-        ):
-            animation = QPropertyAnimation(
-                self.widget(idx),
-                b'pos',
-                startValue=start,
-                endValue=end,
-                easingCurve=self.animationType,
-                duration=self.animationDuration,
-            )
-            animationGroup.addAnimation(animation)
-
         self.nextSlide = iNext
         self.currentSlide = i
         self.active = True
-        animationGroup.start(
-            QAbstractAnimation.DeletionPolicy.DeleteWhenStopped
-        )
+        self.slideAnimation.start()
+
+    def animateSlide(self, progress):
+        """
+        Move current and next slides during animation.
+
+        Parameters
+        ----------
+        progress : float
+            Eased animation progress.
+        """
+
+        x = round(self.slideOffset.x() * progress)
+        y = round(self.slideOffset.y() * progress)
+        for idx, start in zip(
+            (self.currentSlide, self.nextSlide), self.slideStarts
+        ):
+            self.widget(idx).move(start + QPoint(x, y))
 
     @pyqtSlot()
     def animationDoneSlot(self):
@@ -0,0 +1,112 @@
+from PyQt6.QtWidgets import QApplication
+from MangoUI import Button
+
+
+class Theme:
+    """
+    Palette applied to a whole widget tree in one batch.
+
+    The palette fills in a single QSS style sheet, set on the application or
+    on the root widget of the tree, so widgets are styled by type selectors
+    and dynamic properties, such as ``QLabel[role="hint"]``, rather than by
+    style sheets of their own. Every MangoUI button in the tree takes its
+    colors from the palette, and buttons created with
+    ``buttonColorArguments`` already have them. Updates are suspended while
+    the theme is applied, so the tree is repainted once.
+
+    Parameters
+    ----------
+    palette : dict
+        Palette values by name, such as colors and font sizes.
+
+    styleSheet : str
+        QSS style sheet, with palette names in braces where their values go.
+        Braces of QSS rules are doubled, as in ``str.format``.
+
+    buttonColors : dict, optional
+        Palette names of button colors by argument name of
+        ``Button.setColors``, such as ``{'primaryColor': 'accent'}``.
+    """
+
+    def __init__(self, palette, styleSheet, buttonColors=None):
+        self.palette = dict(palette)
+        self.styleSheet = styleSheet
+        self.buttonColors = dict(buttonColors or {})
+
+    def renderStyleSheet(self):
+        """
+        Fill in style sheet with palette.
+
+        Returns
+        -------
+        str
+            QSS style sheet.
+        """
+
+        return self.styleSheet.format_map(self.palette)
+
+    def buttonColorArguments(self):
+        """
+        Button colors of the palette, to create buttons with.
+
+        Returns
+        -------
+        dict
+            Colors by argument name of ``Button`` and ``Button.setColors``.
+        """
+
+        return {
+            argument: self.palette[name]
+            for argument, name in self.buttonColors.items()
+        }
+
+    def setPalette(self, **palette):
+        """
+        Set palette values. Widgets are only restyled when the theme is
+        applied again.
+
+        Parameters
+        ----------
+        **palette
+            Palette values by name.
+        """
+
+        self.palette.update(palette)
+
+    def apply(self, root=None):
+        """
+        Apply theme to a widget tree.
+
+        Parameters
+        ----------
+        root : PyQt6.QtWidgets.QWidget, optional
+            Root widget of the tree. If not given, the style sheet is set on
+            the application and every top-level widget is themed.
+        """
+
+        app = QApplication.instance()
+        windows = app.topLevelWidgets() if root is None else [root]
+        suspended = [window for window in windows if window.updatesEnabled()]
+        for window in suspended:
+            window.setUpdatesEnabled(False)
+
+        try:
+            styleSheet = self.renderStyleSheet()
+            target = app if root is None else root
+            # setting a style sheet polishes every widget it applies to again,
+            # even when it has not changed
+            if target.styleSheet() != styleSheet:
+                target.setStyleSheet(styleSheet)
+
+            colors = self.buttonColorArguments()
+            if len(colors) > 0:
+                for window in windows:
+                    buttons = window.findChildren(Button)
+                    if isinstance(window, Button):
+                        buttons.append(window)
+
+                    for button in buttons:
+                        button.setColors(**colors)
+        finally:
+            for window in suspended:
+                window.setUpdatesEnabled(True)
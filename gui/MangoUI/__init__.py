@@ -1,5 +1,29 @@
-from .Button import Button  # noqa: F401
-from .Canvas import Canvas  # noqa: F401
-from .Slider import Slider  # noqa: F401
-from .FlowLayout import FlowLayout  # noqa: F401
-from .TagBox import TagBox  # noqa: F401
+import importlib
+
+__all__ = ['Button', 'Canvas', 'Slider', 'FlowLayout', 'TagBox', 'Theme']
+
+
+def __getattr__(name):
+    """
+    Import widget and theme classes on first access, so importing one of them
+    does not import all of them.
+
+    Classes are imported from the package, as in
+    ``from MangoUI import Button``. Importing a widget module such as
+    ``MangoUI.Button`` directly before its class binds the module to the
+    package under the name of the class.
+    """
+
+    if name not in __all__:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    module = importlib.import_module(f'.{name}', __name__)
+    cls = getattr(module, name)
+    # importing the module bound it to the package, under the same name
+    globals()[name] = cls
+
+    return cls
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
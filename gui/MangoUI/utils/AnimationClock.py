@@ -0,0 +1,287 @@
+import time
+
+from PyQt6 import sip
+from PyQt6.QtCore import (
+    Qt,
+    QObject,
+    QTimer,
+    QEasingCurve,
+    QAbstractAnimation,
+)
+from PyQt6.QtGui import QGuiApplication
+import PyQt6
+
+
+class AnimationClock(QObject):
+    """
+    Single timer that advances every running MangoUI animation once per
+    frame.
+
+    The timer only runs while animations do, so an idle application spends no
+    frames on animation. Frames are capped at the frame rate. Animations of
+    widgets that are hidden or in minimized windows, or of a hidden
+    application, skip to their end on the next frame, so the clock goes back
+    to sleep instead of animating what cannot be seen.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        Parent object that contains this object.
+
+    frameRate : int
+        Maximum number of frames per second.
+    """
+
+    sharedInstance = None
+
+    def __init__(self, parent=None, frameRate=60):
+        if parent:
+            super().__init__(parent)
+        else:
+            super().__init__()
+
+        self.animations = []
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.setFrameRate(frameRate)
+
+    @classmethod
+    def instance(cls):
+        """
+        Get clock shared by all MangoUI widgets, creating it on first use.
+
+        Returns
+        -------
+        AnimationClock
+            Shared clock.
+        """
+
+        if cls.sharedInstance is None:
+            cls.sharedInstance = cls()
+
+        return cls.sharedInstance
+
+    def setFrameRate(self, frameRate):
+        """
+        Set maximum number of frames per second.
+
+        Parameters
+        ----------
+        frameRate : int
+            Maximum number of frames per second.
+        """
+
+        self.frameRate = frameRate
+        self.timer.setInterval(max(1, round(1000 / frameRate)))
+
+    def addAnimation(self, animation):
+        """
+        Advance animation on every frame until it is removed, starting the
+        timer if it was asleep.
+
+        Parameters
+        ----------
+        animation : ClockAnimation
+            Animation to advance.
+        """
+
+        if animation not in self.animations:
+            self.animations.append(animation)
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def removeAnimation(self, animation):
+        """
+        Stop advancing animation, stopping the timer if no animations are
+        left.
+
+        Parameters
+        ----------
+        animation : ClockAnimation
+            Animation to stop advancing.
+        """
+
+        if animation in self.animations:
+            self.animations.remove(animation)
+
+        if len(self.animations) == 0:
+            self.timer.stop()
+
+    def tick(self):
+        """
+        Advance every running animation to the current time.
+        """
+
+        now = time.perf_counter() * 1000
+        hidden = QGuiApplication.applicationState() in (
+            Qt.ApplicationState.ApplicationHidden,
+            Qt.ApplicationState.ApplicationSuspended,
+        )
+
+        for animation in list(self.animations):
+            if sip.isdeleted(animation.target):
+                self.removeAnimation(animation)
+                continue
+
+            animation.advance(now, hidden or not animation.isTargetVisible())
+
+
+class ClockAnimation:
+    """
+    Eased progress from 0 to 1 over a duration, advanced by the shared
+    animation clock.
+
+    Like ``QVariantAnimation``, starting an animation that is running does
+    nothing, and changing its direction while it runs reverses it from its
+    current progress.
+
+    With a table of precomputed frames, the frame nearest to the current time
+    is passed instead of the progress, and only when it changes.
+
+    Parameters
+    ----------
+    target : PyQt6.QtWidgets.QWidget
+        Widget that is animated.
+
+    valueChanged : callable
+        Called with the eased progress on every frame, or with the current
+        frame of the table.
+
+    duration : int
+        Animation duration in milliseconds.
+
+    easingCurve : PyQt6.QtCore.QEasingCurve.Type
+        Animation easing curve.
+
+    finished : callable, optional
+        Called when the animation reaches its end.
+
+    clock : AnimationClock, optional
+        Clock that advances the animation, defaults to the shared clock.
+
+    frames : tuple, optional
+        Frames evenly spaced in time, with easing already applied.
+    """
+
+    def __init__(
+        self,
+        target,
+        valueChanged,
+        duration=400,
+        easingCurve=PyQt6.QtCore.QEasingCurve.Type.OutCubic,
+        finished=None,
+        clock=None,
+        frames=None,
+    ):
+        self.target = target
+        self.valueChanged = valueChanged
+        self.duration = duration
+        self.easingCurve = QEasingCurve(easingCurve)
+        self.finished = finished
+        self.clock = clock
+        self.frames = frames
+        self.frameIndex = None
+        self.direction = QAbstractAnimation.Direction.Forward
+        self.currentTime = 0
+        self.lastTick = None
+        self.running = False
+
+    def setDirection(self, direction):
+        """
+        Set animation direction.
+
+        Parameters
+        ----------
+        direction : PyQt6.QtCore.QAbstractAnimation.Direction
+            Animation direction.
+        """
+
+        self.direction = direction
+
+    def start(self):
+        """
+        Start animation from the end it is directed away from, unless it is
+        running.
+        """
+
+        if self.running:
+            return
+
+        if self.direction == QAbstractAnimation.Direction.Forward:
+            self.currentTime = 0
+        else:
+            self.currentTime = self.duration
+
+        self.running = True
+        self.frameIndex = None
+        self.lastTick = time.perf_counter() * 1000
+        (self.clock or AnimationClock.instance()).addAnimation(self)
+
+    def stop(self):
+        """
+        Stop animation at its current progress.
+        """
+
+        self.running = False
+        (self.clock or AnimationClock.instance()).removeAnimation(self)
+
+    def isTargetVisible(self):
+        """
+        Check whether the animated widget can be seen.
+
+        Returns
+        -------
+        bool
+            Whether the widget is visible and not in a minimized window.
+        """
+
+        return (
+            self.target.isVisible()
+            and not self.target.window().isMinimized()
+        )
+
+    def advance(self, now, skip=False):
+        """
+        Advance animation to a point in time.
+
+        Parameters
+        ----------
+        now : float
+            Current time in milliseconds.
+
+        skip : bool
+            Skip to the end of the animation.
+        """
+
+        elapsed = self.duration if skip else now - self.lastTick
+        self.lastTick = now
+
+        if self.direction == QAbstractAnimation.Direction.Forward:
+            self.currentTime = min(self.currentTime + elapsed, self.duration)
+            done = self.currentTime >= self.duration
+        else:
+            self.currentTime = max(self.currentTime - elapsed, 0)
+            done = self.currentTime <= 0
+
+        if self.duration > 0:
+            progress = self.currentTime / self.duration
+        elif self.direction == QAbstractAnimation.Direction.Forward:
+            progress = 1
+        else:
+            progress = 0
+
+        if self.frames is None:
+            self.valueChanged(self.easingCurve.valueForProgress(progress))
+        else:
+            frameIndex = round(progress * (len(self.frames) - 1))
+            if frameIndex != self.frameIndex:
+                self.frameIndex = frameIndex
+                self.valueChanged(self.frames[frameIndex])
+
+        if done:
+            self.stop()
+            if self.finished is not None:
+                self.finished()
@@ -0,0 +1,49 @@
+import functools
+
+from PyQt6.QtCore import QEasingCurve
+from MangoUI.utils.ColorOps import interpolate_RGBAtuple
+
+
+@functools.lru_cache(maxsize=256)
+def colorFrames(colorPairs, easingType, duration, frameRate):
+    """
+    Compute the colors of every frame of an animation between pairs of
+    colors.
+
+    Tables are cached, so every widget animating between the same colors in
+    the same way shares one table, and an animation frame is a lookup in it.
+
+    Parameters
+    ----------
+    colorPairs : tuple
+        Pairs of RGBA tuples of the first and last frame of each animated
+        color.
+
+    easingType : PyQt6.QtCore.QEasingCurve.Type
+        Animation easing curve.
+
+    duration : int
+        Animation duration in milliseconds.
+
+    frameRate : int
+        Frames per second.
+
+    Returns
+    -------
+    tuple
+        Frames evenly spaced in time, each holding an RGBA tuple per pair of
+        colors.
+    """
+
+    count = max(1, round(duration * frameRate / 1000))
+    curve = QEasingCurve(easingType)
+
+    frames = []
+    for i in range(count + 1):
+        progress = curve.valueForProgress(i / count)
+        frames.append(tuple(
+            interpolate_RGBAtuple(startColor, endColor, progress)
+            for startColor, endColor in colorPairs
+        ))
+
+    return tuple(frames)
@@ -1,20 +1,24 @@
 import re
+import functools
 from PyQt6.QtGui import QColor
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def RGBAstr_to_RGBAtuple(s):
-    if not isinstance(s, str):
-        raise TypeError(f'Invalid argument type {type(s)}, expected string')
 
-    pattern = (
-        r'^\s*rgba?\s*\(\s*(\d+)\s*,'
-        r'\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*(\d+)\s*)?\)\s*$'
-    )
-    search = re.search(pattern, s)
+RGBA_PATTERN = re.compile(
+    r'^\s*rgba?\s*\(\s*(\d+)\s*,'
+    r'\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*(\d+)\s*)?\)\s*$'
+)
+HEX_PATTERN = re.compile(r'^#?([0-9a-fA-F]{6,8})\S*$')
+
+# number of distinct strings and integers whose conversions are remembered
+COLOR_CACHE_SIZE = 1024
 
-    if search is None or len(search.groups()) < 3:
-        raise ValueError(f'Invalid RGBA string, {s}')
 
+def RGBAmatch_to_RGBAtuple(search):
     tup = (
         int(search.group(1)),
         int(search.group(2)),
@@ -25,6 +29,18 @@ def RGBAstr_to_RGBAtuple(s):
     return tup
 
 
+def RGBAstr_to_RGBAtuple(s):
+    if not isinstance(s, str):
+        raise TypeError(f'Invalid argument type {type(s)}, expected string')
+
+    search = RGBA_PATTERN.match(s)
+
+    if search is None:
+        raise ValueError(f'Invalid RGBA string, {s}')
+
+    return RGBAmatch_to_RGBAtuple(search)
+
+
 def RGBAtuple_to_RGBAstr(tup):
     if not isinstance(tup, tuple):
         raise TypeError(f'Invalid argument type {type(tup)}, expected tuple')
@@ -46,16 +62,7 @@ def RGBAtuple_to_RGBAstr(tup):
     return s
 
 
-def HEXstr_to_RGBAtuple(s):
-    if not isinstance(s, str):
-        raise TypeError(f'Invalid argument type {type(s)}, expected string')
-
-    pattern = r'^#?([0-9a-fA-F]{6,8})\S*$'
-    search = re.search(pattern, s.replace(' ', ''))
-
-    if search is None or len(search.groups()) < 1:
-        raise ValueError(f'Invalid HEX string, {s}')
-
+def HEXmatch_to_RGBAtuple(search):
     tup = (
         int(search.group(1)[2:4], 16),
         int(search.group(1)[4:6], 16),
@@ -72,6 +79,18 @@ def HEXstr_to_RGBAtuple(s):
     return tup
 
 
+def HEXstr_to_RGBAtuple(s):
+    if not isinstance(s, str):
+        raise TypeError(f'Invalid argument type {type(s)}, expected string')
+
+    search = HEX_PATTERN.match(s.replace(' ', ''))
+
+    if search is None:
+        raise ValueError(f'Invalid HEX string, {s}')
+
+    return HEXmatch_to_RGBAtuple(search)
+
+
 def RGBAtuple_to_HEXstr(tup):
     if not isinstance(tup, tuple):
         raise TypeError(f'Invalid argument type {type(tup)}, expected tuple')
@@ -159,6 +178,28 @@ def RGBAtuple_to_RGBAQColor(tup):
     return qcolor
 
 
+def interpolate_RGBAtuple(start, end, progress):
+    return tuple(
+        round(s + (e - s) * progress) for s, e in zip(start, end)
+    )
+
+
+@functools.lru_cache(maxsize=COLOR_CACHE_SIZE)
+def cached_to_RGBAtuple(color):
+    if isinstance(color, str):
+        search = RGBA_PATTERN.match(color)
+        if search is not None:
+            return RGBAmatch_to_RGBAtuple(search)
+
+        search = HEX_PATTERN.match(color.replace(' ', ''))
+        if search is not None:
+            return HEXmatch_to_RGBAtuple(search)
+
+        raise ValueError(f'Invalid string, {color}')
+
+    return RGBAint_to_RGBAtuple(color)
+
+
 def to_RGBAtuple(color):
     if isinstance(color, tuple):
         if len(color) < 3:
@@ -169,17 +210,122 @@ def to_RGBAtuple(color):
             return color + (255,)
         else:
             return color[:4]
-    elif isinstance(color, str):
-        try:
-            return RGBAstr_to_RGBAtuple(color)
-        except ValueError:
-            try:
-                return HEXstr_to_RGBAtuple(color)
-            except ValueError:
-                raise ValueError(f'Invalid string, {color}')
-    elif isinstance(color, int):
-        return RGBAint_to_RGBAtuple(color)
+    elif isinstance(color, (str, int)):
+        return cached_to_RGBAtuple(color)
     elif isinstance(color, QColor):
         return RGBAQColor_to_RGBAtuple(color)
     else:
         raise TypeError(f'Invalid argument type {type(color)}')
+
+
+# Batch conversions of NumPy arrays, for palettes and gradients of many
+# colors. Colors are rows of RGBA uint8 arrays, or ARGB uint32 integers as in
+# RGBAint_to_RGBAtuple. NumPy is optional, and is only needed to call these.
+
+def require_numpy():
+    if np is None:
+        raise ImportError('NumPy is required for batch color conversions')
+
+
+def RGBAints_to_RGBAarray(ints):
+    require_numpy()
+
+    ints = np.asarray(ints)
+    if ints.dtype.kind not in 'iu' and ints.size > 0:
+        raise TypeError(
+            f'Invalid array type {ints.dtype}, expected integers'
+        )
+
+    if ints.size > 0 and (ints.min() < 0 or ints.max() > (2**32) - 1):
+        raise ValueError(
+            'Invalid integer array, expected unsigned 32 bit integers'
+        )
+
+    # little-endian ARGB integers are stored as B, G, R, A bytes
+    channels = ints.astype('<u4')[..., np.newaxis].view(np.uint8)
+
+    return channels[..., [2, 1, 0, 3]]
+
+
+def RGBAarray_to_RGBAints(array):
+    require_numpy()
+
+    array = np.asarray(array)
+    if array.ndim == 0 or array.shape[-1] not in (3, 4):
+        raise ValueError(
+            f'Invalid array shape {array.shape}, expected 3 or 4 columns'
+        )
+
+    if array.size > 0 and (array.min() < 0 or array.max() > 255):
+        raise ValueError('Invalid RGBA array, expected values from 0 to 255')
+
+    channels = np.full(array.shape[:-1] + (4,), 255, dtype=np.uint8)
+    channels[..., 2::-1] = array[..., :3]
+    if array.shape[-1] == 4:
+        channels[..., 3] = array[..., 3]
+
+    return channels.view('<u4')[..., 0]
+
+
+if np is not None:
+    HEX_DIGITS = np.full(256, 255, dtype=np.uint8)
+    for digit in '0123456789abcdefABCDEF':
+        HEX_DIGITS[ord(digit)] = int(digit, 16)
+
+    HEX_CODES = np.array(
+        [ord(digit) for digit in '0123456789ABCDEF'], dtype=np.uint32
+    )
+
+
+def HEXstrs_to_RGBAarray(strings):
+    require_numpy()
+
+    digits = np.asarray(np.char.lstrip(np.asarray(strings, dtype=str), '#'))
+    lengths = np.char.str_len(digits)
+    if not np.isin(lengths, (6, 8)).all():
+        raise ValueError(
+            'Invalid HEX string array, expected 6 or 8 hexadecimal digits'
+        )
+
+    # code points of the digits, with strings of 6 digits padded by zeros
+    codes = digits.astype('U8')[..., np.newaxis].view(np.uint32)
+    nibbles = HEX_DIGITS[np.minimum(codes, 255)]
+    nibbles[codes > 255] = 255
+    nibbles[..., 6:][lengths == 6] = 0
+    if (nibbles == 255).any():
+        raise ValueError(
+            'Invalid HEX string array, expected 6 or 8 hexadecimal digits'
+        )
+
+    pairs = (nibbles[..., 0::2] << 4) | nibbles[..., 1::2]
+    array = np.where(
+        (lengths == 8)[..., np.newaxis],
+        pairs[..., [1, 2, 3, 0]],
+        pairs,
+    )
+    array[..., 3][lengths == 6] = 255
+
+    return array
+
+
+def RGBAarray_to_HEXstrs(array):
+    require_numpy()
+
+    ints = RGBAarray_to_RGBAints(array)
+
+    # code points of '#' and of the eight uppercase digits of each integer
+    codes = np.full(ints.shape + (9,), ord('#'), dtype=np.uint32)
+    shifts = np.arange(28, -1, -4, dtype=np.uint32)
+    codes[..., 1:] = HEX_CODES[(ints[..., np.newaxis] >> shifts) & 15]
+
+    return codes.view('U9')[..., 0]
+
+
+def interpolate_RGBAarray(start, end, progress):
+    require_numpy()
+
+    start = np.asarray(to_RGBAtuple(start), dtype=np.float64)
+    end = np.asarray(to_RGBAtuple(end), dtype=np.float64)
+    progress = np.asarray(progress, dtype=np.float64)[..., np.newaxis]
+
+    return np.rint(start + (end - start) * progress).astype(np.uint8)
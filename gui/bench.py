@@ -0,0 +1,434 @@
+import os
+import sys
+import json
+import random
+import itertools
+import timeit
+import platform
+import argparse
+import statistics
+import importlib.util
+
+
+BENCHMARKS = []
+CLEANUPS = []
+BODY_SIZES = [100, 1000, 10000]
+LAYOUT_SIZES = [10, 100, 1000]
+DEFAULT_THRESHOLD = 0.1
+
+
+def benchmark(name):
+    """
+    Register benchmark. The decorated function sets up the benchmark and returns the callable that is timed, or None
+    if the benchmark cannot run here.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+
+        return setup
+
+    return register
+
+
+def add_cleanup(func, *args, **kwargs):
+    """
+    Register function to be called once the running benchmark is done, in reverse order of registration.
+    """
+    CLEANUPS.append((func, args, kwargs))
+
+
+def make_body(paragraphs, seed=0):
+    """
+    Generate body with given number of paragraphs of random words.
+    """
+    rng = random.Random(seed)
+    words = ['commit', 'message', 'wrap', 'the', 'body', 'of', 'a', 'paragraph', 'refactor', 'cache']
+
+    return '\n'.join(' '.join(rng.choice(words) for _ in range(rng.randint(5, 40))) for _ in range(paragraphs))
+
+
+def make_temp_dir():
+    """
+    Create temporary directory that is removed once the benchmark is done.
+    """
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    add_cleanup(shutil.rmtree, directory, ignore_errors=True)
+
+    return directory
+
+
+def make_window(body):
+    """
+    Create main window showing given body, with preview up to date. The window keeps its files in a temporary directory
+    and is shut down once the benchmark is done.
+    """
+    from gitmsg import GitmsgGUI
+
+    window = GitmsgGUI(make_temp_dir())
+    add_cleanup(window.shutdown)
+    window.summary.setText('Benchmark summary')
+    window.body.setPlainText(body)
+    window.render_scheduler.flush()
+
+    return window
+
+
+for size in BODY_SIZES:
+    @benchmark(f'display_msg.keystroke.{size}')
+    def setup_display_msg_keystroke(size=size):
+        from PyQt6.QtGui import QTextCursor
+
+        window = make_window(make_body(size))
+        cursor = QTextCursor(window.body.document().findBlockByNumber(size // 2))
+
+        def run():
+            cursor.insertText('x')
+            window.render_scheduler.flush()
+
+        return run
+
+    @benchmark(f'display_msg.paste.{size}')
+    def setup_display_msg_paste(size=size):
+        window = make_window('')
+        bodies = [make_body(size, seed) for seed in range(2)]
+        state = {'i': 0}
+
+        def run():
+            state['i'] ^= 1
+            window.body.setPlainText(bodies[state['i']])
+            window.render_scheduler.flush()
+
+        return run
+
+
+for name, words in [
+    ('ascii', ['commit', 'message', 'wrap', 'the', 'body']),
+    ('cjk', ['\u30b3\u30df\u30c3\u30c8', '\u6f22\u5b57', '\u6587\u7ae0', '\u6539\u884c']),
+    ('emoji', ['\U0001F600', '\U0001F469\u200d\U0001F469\u200d\U0001F467', '\u2764\ufe0f', 'ok']),
+]:
+    @benchmark(f'MessageFormatter.wrap.{name}')
+    def setup_wrap(words=words):
+        from formatting import MessageFormatter
+
+        rng = random.Random(0)
+        paragraph = ' '.join(rng.choice(words) for _ in range(500))
+        wrapper = MessageFormatter().wrapper
+
+        return lambda: wrapper.wrap(paragraph)
+
+
+@benchmark('SummaryIndex.complete.500000')
+def setup_summary_index_complete():
+    from completion import SummaryIndex, count_prefixes
+
+    rng = random.Random(0)
+    verbs = ['Fix', 'Add', 'Update', 'Refactor', 'Bump', 'Remove', 'Improve', 'Merge']
+    nouns = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+    summaries = [
+        ' '.join([rng.choice(verbs)] + [rng.choice(nouns) for _ in range(rng.randint(1, 6))]) for _ in range(500000)
+    ]
+    index = SummaryIndex(count_prefixes(summaries))
+
+    return lambda: [index.complete(text) for text in ('F', 'Fi', 'Fix', 'Fix ')]
+
+
+@benchmark('Button.renderStyleSheet')
+def setup_button_render_style_sheet():
+    from MangoUI import Button
+
+    button = Button()
+    # style sheets of unpolished widgets are only stored until they are polished
+    button.ensurePolished()
+    colors = itertools.cycle([(i, 255 - i, 128, 255) for i in range(0, 256, 8)])
+
+    def run():
+        # a new color every call, as on every animation frame, since Qt skips style sheets that did not change
+        button.textColor = button.backgroundColor = next(colors)
+        button.renderStyleSheet()
+
+    return run
+
+
+for render_mode in ['styleSheet', 'paint']:
+    @benchmark(f'Button.animate.{render_mode}')
+    def setup_button_animate(render_mode=render_mode):
+        from PyQt6.QtGui import QColor
+        from MangoUI import Button
+
+        button = Button(renderMode=render_mode)
+        button.setText('Export Message')
+        button.resize(button.sizeHint())
+        colors = [QColor(i, 255 - i, 128) for i in range(0, 256, 8)]
+
+        def run():
+            for color in colors:
+                button.animateText(color)
+                button.animateBackground(color)
+                button.grab()
+
+        return run
+
+
+@benchmark('GitmsgGUI.startup')
+def setup_startup():
+    from PyQt6.QtWidgets import QApplication
+    from gitmsg import GitmsgGUI
+
+    directory = make_temp_dir()
+
+    def run():
+        window = GitmsgGUI(directory)
+        window.grab()
+        window.shutdown()
+        window.deleteLater()
+        QApplication.processEvents()
+
+    return run
+
+
+@benchmark('HistoryStore.search.100000')
+def setup_history_search():
+    from history import HistoryStore, INSERT_QUERY
+
+    directory = make_temp_dir()
+    store = HistoryStore(os.path.join(directory, 'history.sqlite3'))
+    rng = random.Random(0)
+    words = ['fix', 'race', 'refactor', 'bump', 'cache', 'window', 'layout', 'parser', 'export', 'history']
+    messages = [' '.join(rng.choice(words) for _ in range(12)) for _ in range(100000)]
+
+    connection = store.connect()
+    with connection:
+        connection.executemany(INSERT_QUERY, [(message, '', message, directory, 'copy', 0) for message in messages])
+
+    connection.close()
+
+    return lambda: store.search('fix cach')
+
+
+@benchmark('Clipboard.copy')
+def setup_clipboard_copy():
+    from PyQt6.QtGui import QGuiApplication
+    from clipboard import Clipboard
+
+    # only the offscreen platform keeps the clipboard inside the process, other platforms would replace the clipboard
+    # of the desktop
+    if QGuiApplication.platformName() != 'offscreen':
+        return None
+
+    clipboard = Clipboard()
+    add_cleanup(clipboard.shutdown)
+    message = make_body(10)
+
+    return lambda: clipboard.copy(message)
+
+
+@benchmark('parse_staged_changes.50000')
+def setup_parse_staged_changes():
+    from staged import parse_staged_changes
+
+    paths = [f'src/module{i % 100}/file{i}.py' for i in range(50000)]
+    lines = [f':100644 100644 1111111 2222222 M\t{path}' for path in paths] + [f'3\t1\t{path}' for path in paths]
+
+    return lambda: parse_staged_changes(lines)
+
+
+for size in LAYOUT_SIZES:
+    @benchmark(f'FlowLayout.doLayout.{size}')
+    def setup_flow_layout(size=size):
+        from PyQt6.QtCore import QRect
+        from PyQt6.QtWidgets import QLabel, QWidget
+        from MangoUI import FlowLayout
+
+        widget = QWidget()
+        layout = FlowLayout(widget)
+        for i in range(size):
+            layout.addWidget(QLabel(f'Item {i}'))
+
+        rect = QRect(0, 0, 800, 600)
+
+        # referencing the widget keeps it and the laid out items alive
+        return lambda: widget.layout().doLayout(rect, False)
+
+
+@benchmark('TagBox.addTag.removeTag')
+def setup_tag_box():
+    from MangoUI import TagBox
+
+    tag_box = TagBox()
+    for i in range(20):
+        tag_box.addTag(f'tag{i}')
+
+    def run():
+        tag_box.addTag('benchmark')
+        tag_box.removeTag(len(tag_box.getTags()) - 1)
+
+    return run
+
+
+for name, color in [
+    ('rgba', 'rgba(255, 51, 153, 255)'),
+    ('hex', '#FF3399'),
+    ('int', 0xFFFF3399),
+    ('tuple', (255, 51, 153)),
+    ('qcolor', None),
+]:
+    @benchmark(f'ColorOps.to_RGBAtuple.{name}')
+    def setup_color_ops(color=color):
+        from PyQt6.QtGui import QColor
+        from MangoUI.utils.ColorOps import to_RGBAtuple
+
+        value = QColor(255, 51, 153) if color is None else color
+
+        return lambda: to_RGBAtuple(value)
+
+
+# batch color conversions need NumPy, which is optional
+if importlib.util.find_spec('numpy') is not None:
+    @benchmark('ColorOps.RGBAints_to_RGBAarray.100000')
+    def setup_rgba_ints():
+        import numpy as np
+        from MangoUI.utils.ColorOps import RGBAints_to_RGBAarray
+
+        ints = np.random.default_rng(0).integers(0, 2**32, 100000, dtype=np.uint32)
+
+        return lambda: RGBAints_to_RGBAarray(ints)
+
+    @benchmark('ColorOps.HEXstrs_to_RGBAarray.100000')
+    def setup_hex_strs():
+        import numpy as np
+        from MangoUI.utils.ColorOps import RGBAarray_to_HEXstrs, HEXstrs_to_RGBAarray
+
+        strings = RGBAarray_to_HEXstrs(np.random.default_rng(0).integers(0, 256, (100000, 4), dtype=np.uint8))
+
+        return lambda: HEXstrs_to_RGBAarray(strings)
+
+
+def measure(func, repeat=5):
+    """
+    Time callable, calibrating the number of calls per run to take at least 0.2 seconds.
+
+    Returns
+    -------
+    dict
+        Median and minimum time per call in seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_benchmarks(pattern=None, repeat=5):
+    """
+    Run registered benchmarks whose name contains pattern.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6 import QtCore
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    for name, setup in BENCHMARKS:
+        if pattern is not None and pattern not in name:
+            continue
+
+        try:
+            func = setup()
+            if func is None:
+                print(f'skipped {name}', file=sys.stderr)
+                continue
+
+            results[name] = measure(func, repeat=repeat)
+            app.processEvents()
+        finally:
+            while len(CLEANUPS) > 0:
+                func, args, kwargs = CLEANUPS.pop()
+                func(*args, **kwargs)
+
+    return {
+        'python': platform.python_version(),
+        'qt': QtCore.QT_VERSION_STR,
+        'platform': platform.platform(),
+        'benchmarks': results,
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare median times of benchmarks found in both results.
+
+    Returns
+    -------
+    list
+        Tuples of benchmark name, baseline median, current median, ratio and whether the benchmark regressed by more
+        than threshold.
+    """
+    rows = []
+    for name, result in current['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+
+        before = baseline['benchmarks'][name]['median']
+        after = result['median']
+        ratio = after / before if before > 0 else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+
+    return rows
+
+
+def main(argv=None):
+    """
+    Run benchmarks or compare benchmark results.
+    """
+    parser = argparse.ArgumentParser(prog='bench', description='Benchmark formatting and MangoUI hot paths.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run benchmarks and save results as JSON')
+    run_parser.add_argument('--output', help='results file, defaults to standard output')
+    run_parser.add_argument('--filter', dest='pattern', help='only run benchmarks whose name contains this')
+    run_parser.add_argument('--repeat', type=int, default=5)
+
+    compare_parser = subparsers.add_parser('compare', help='compare results against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(args.pattern, args.repeat)
+        if args.output is None:
+            json.dump(results, sys.stdout, indent=4)
+            sys.stdout.write('\n')
+        else:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=4)
+
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline, current, args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f'{name:<40} {before * 1e6:12.2f} us {after * 1e6:12.2f} us {ratio:8.2f}x {flag}')
+
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import time
+import logging
+import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+from tracing import hot_path_trace
+
+
+QT_BACKEND = 'qt'
+PYPERCLIP_BACKEND = 'pyperclip'
+LATENCY_HISTORY = 100
+# platforms where the clipboard is served by the application that copied, so a copy is lost when it exits
+SERVED_CLIPBOARD_PLATFORMS = ('xcb', 'wayland')
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """
+    Latencies of the most recent operations.
+    """
+
+    def __init__(self, history=LATENCY_HISTORY):
+        self.latencies = deque(maxlen=history)
+        self.count = 0
+
+    def record(self, seconds):
+        """
+        Record latency of a single operation.
+        """
+        self.latencies.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        """
+        Summarize recorded latencies.
+
+        Returns
+        -------
+        dict
+            Number of operations ever recorded, and last, median and maximum latency in seconds of the most recent
+            ones.
+        """
+        if len(self.latencies) == 0:
+            return {'count': 0}
+
+        return {
+            'count': self.count,
+            'last': self.latencies[-1],
+            'median': statistics.median(self.latencies),
+            'max': max(self.latencies),
+        }
+
+
+class Clipboard(QObject):
+    """
+    Clipboard that copies through Qt's in-process clipboard while an application exists.
+
+    Without an application, copies go through pyperclip, which runs a command such as ``xclip`` for every copy. Those
+    copies run one at a time on a worker thread that is kept for the lifetime of the clipboard. The latency of every
+    copy is recorded, from the call to copy until the text is on the clipboard.
+
+    On X11 and Wayland the application serves its copies itself, and they are lost when it exits unless a clipboard
+    manager keeps them. When the clipboard shuts down still holding a Qt copy there, the copy is handed over to
+    pyperclip, whose ``xclip`` or ``wl-copy`` keeps serving it after the application exits.
+    """
+
+    copied = pyqtSignal(str, float)
+    copy_failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stats = LatencyStats()
+        self.executor = None
+        self.qt_text = None
+
+    @property
+    def backend(self):
+        """
+        Backend used for the next copy.
+        """
+        return QT_BACKEND if QGuiApplication.instance() is not None else PYPERCLIP_BACKEND
+
+    def copy(self, text):
+        """
+        Copy text to clipboard.
+        """
+        start = time.perf_counter()
+        if self.backend == QT_BACKEND:
+            QGuiApplication.clipboard().setText(text)
+            self.qt_text = text
+            self.finish(QT_BACKEND, start)
+            return
+
+        self.submit(self.copy_with_pyperclip, text, start)
+
+    def submit(self, fn, *args):
+        """
+        Run function on the worker thread, after pending copies.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.executor.submit(fn, *args)
+
+    @hot_path_trace.traced
+    def copy_with_pyperclip(self, text, start):
+        """
+        Copy text through pyperclip. Runs on the worker thread.
+        """
+        import pyperclip
+
+        try:
+            pyperclip.copy(text)
+        except pyperclip.PyperclipException as e:
+            self.copy_failed.emit(str(e))
+            return
+
+        self.finish(PYPERCLIP_BACKEND, start)
+
+    def finish(self, backend, start):
+        """
+        Record latency of finished copy.
+        """
+        latency = time.perf_counter() - start
+        self.stats.record(latency)
+        self.copied.emit(backend, latency)
+
+    def owns_qt_copy(self):
+        """
+        Whether the last Qt copy is still on the clipboard and would be lost when the application exits.
+        """
+        if self.qt_text is None or QGuiApplication.instance() is None:
+            return False
+
+        if QGuiApplication.platformName() not in SERVED_CLIPBOARD_PLATFORMS:
+            return False
+
+        clipboard = QGuiApplication.clipboard()
+        return clipboard.ownsClipboard() and clipboard.text() == self.qt_text
+
+    def hand_off(self, text):
+        """
+        Copy text through pyperclip, so it stays on the clipboard after the application exits. Runs on the worker
+        thread.
+        """
+        import pyperclip
+
+        try:
+            pyperclip.copy(text)
+        except pyperclip.PyperclipException:
+            logger.warning('Could not keep copied message on the clipboard', exc_info=True)
+
+    def shutdown(self):
+        """
+        Hand the last Qt copy over to pyperclip if it would be lost when the application exits, and wait for pending
+        copies to finish.
+        """
+        if self.owns_qt_copy():
+            self.submit(self.hand_off, self.qt_text)
+
+        self.qt_text = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,278 @@
+import os
+import json
+import heapq
+import subprocess
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QStringListModel, Qt, pyqtSignal
+from PyQt6.QtWidgets import QCompleter
+
+from export import find_repository, resolve_head
+from fileutils import atomic_write, cache_path
+
+
+MAX_PREFIX_WORDS = 3
+MIN_COUNT = 2
+COMPLETION_LIMIT = 8
+# ranges of prefixes longer than this have their most frequent prefixes precomputed
+MAX_SCANNED_RANGE = 256
+KEY_END = '\U0010ffff'
+CONVENTIONAL_TYPES = ('build', 'chore', 'ci', 'docs', 'feat', 'fix', 'perf', 'refactor', 'revert', 'style', 'test')
+
+
+def summary_prefixes(summary):
+    """
+    Prefixes of the first words of a summary, from one word up to the maximum number of prefix words.
+    """
+    words = summary.split()
+    for n in range(1, min(len(words), MAX_PREFIX_WORDS) + 1):
+        yield ' '.join(words[:n])
+
+
+def count_prefixes(summaries, counts=None):
+    """
+    Count how many summaries start with each prefix.
+    """
+    counts = Counter() if counts is None else counts
+    for summary in summaries:
+        counts.update(summary_prefixes(summary))
+
+    return counts
+
+
+class SummaryIndex:
+    """
+    Prefixes used by several summaries, as arrays sorted by their lowercase text so the prefixes starting with some
+    text form a contiguous range found by binary search.
+
+    The most frequent prefixes of every range longer than ``MAX_SCANNED_RANGE`` are precomputed, so completing text
+    costs a binary search and at most a scan of a short range, however many prefixes start with the text.
+    """
+
+    def __init__(self, counts):
+        prefixes = sorted([prefix for prefix, count in counts.items() if count >= MIN_COUNT], key=str.lower)
+        self.keys = [prefix.lower() for prefix in prefixes]
+        self.prefixes = prefixes
+        self.ranks = [counts[prefix] for prefix in prefixes]
+        self.top = self.rank_long_ranges()
+
+    def rank_long_ranges(self):
+        """
+        Most frequent prefixes of every range longer than ``MAX_SCANNED_RANGE``, by the text starting the range.
+
+        Ranges are split by the next character of their keys, and only ranges that are still long are split further.
+        """
+        top = {}
+        ranges = [('', 0, len(self.keys))]
+        while len(ranges) > 0:
+            key, start, stop = ranges.pop()
+            if stop - start <= MAX_SCANNED_RANGE:
+                continue
+
+            top[key] = heapq.nlargest(COMPLETION_LIMIT + 1, range(start, stop), key=self.ranks.__getitem__)
+
+            # keys equal to the text sort first, and the rest form one range per next character
+            i = start
+            while i < stop and len(self.keys[i]) == len(key):
+                i += 1
+
+            while i < stop:
+                child = self.keys[i][:len(key) + 1]
+                end = bisect_left(self.keys, child + KEY_END, lo=i, hi=stop)
+                ranges.append((child, i, end))
+                i = end
+
+        return top
+
+    def complete(self, text, limit=COMPLETION_LIMIT):
+        """
+        Most frequent prefixes that start with text and are longer than it, most frequent first.
+        """
+        key = text.lower()
+        best = self.top.get(key) if limit <= COMPLETION_LIMIT else None
+        if best is None:
+            start = bisect_left(self.keys, key)
+            stop = bisect_left(self.keys, key + KEY_END, lo=start)
+            best = heapq.nlargest(
+                limit + 1,
+                range(start, stop),
+                key=self.ranks.__getitem__,
+            )
+
+        return [self.prefixes[i] for i in best if self.keys[i] != key][:limit]
+
+
+def git_output_lines(work_tree, *args):
+    """
+    Run git command in work tree, yielding its output line by line as it is produced.
+    """
+    process = subprocess.Popen(
+        ['git', '-C', work_tree, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding='utf-8',
+        errors='replace',
+    )
+    with process:
+        for line in process.stdout:
+            yield line.rstrip('\n')
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+
+def is_ancestor(work_tree, commit, head):
+    """
+    Check whether commit is an ancestor of head.
+    """
+    result = subprocess.run(
+        ['git', '-C', work_tree, 'merge-base', '--is-ancestor', commit, head],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    return result.returncode == 0
+
+
+def read_cache(path):
+    """
+    Read commit and prefix counts of cached index.
+
+    Returns
+    -------
+    tuple
+        Commit the prefixes were counted up to and the prefix counts, or None and no counts if there is no cache.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        return data['head'], Counter(data['counts'])
+    except (IOError, ValueError, KeyError):
+        return None, Counter()
+
+
+def write_cache(path, head, counts):
+    """
+    Write commit and prefix counts of index.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps({'head': head, 'counts': counts}, separators=(',', ':')))
+
+
+def load_index(directory, cache_dir):
+    """
+    Load summary index of the repository containing directory.
+
+    The index is read from the cache if it was built at the current HEAD. If HEAD has moved on since, only the
+    summaries of the new commits are counted. Otherwise, the summaries of all commits are counted, streaming them from
+    ``git log``. The cache keeps the counts of every prefix, including those too rare to be suggested yet.
+
+    Returns
+    -------
+    SummaryIndex or None
+        Index, or None if directory is not in a repository with commits.
+    """
+    repository = find_repository(directory)
+    if repository is None:
+        return None
+
+    head = resolve_head(repository.git_dir)
+    if head is None:
+        return None
+
+    path = cache_path(cache_dir, repository.git_dir)
+    cached_head, counts = read_cache(path)
+    if cached_head == head:
+        return SummaryIndex(counts)
+
+    if cached_head is not None and is_ancestor(repository.work_tree, cached_head, head):
+        revision_range = f'{cached_head}..{head}'
+    else:
+        counts = Counter()
+        revision_range = head
+
+    count_prefixes(git_output_lines(repository.work_tree, 'log', '--format=%s', revision_range), counts)
+    write_cache(path, head, counts)
+
+    return SummaryIndex(counts)
+
+
+class SummaryCompleter(QObject):
+    """
+    Popup completion of summary prefixes used in the repository's history.
+
+    The index is loaded on a worker thread the first time the summary is edited, and suggestions are shown from the
+    next edit on. Once a scope is set, typing a conventional commit type also suggests that type with the scope.
+    """
+
+    loaded = pyqtSignal(object)
+
+    def __init__(self, line_edit, directory, cache_dir, parent=None):
+        super().__init__(parent)
+        self.line_edit = line_edit
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self.index = None
+        self.scope = None
+        self.executor = None
+
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setWidget(self.line_edit)
+        self.completer.activated.connect(self.line_edit.setText)
+
+        self.loaded.connect(self.on_loaded)
+        self.line_edit.textEdited.connect(self.complete)
+
+    def load(self):
+        """
+        Start loading index on the worker thread.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.executor.submit(self.load_index)
+
+    def load_index(self):
+        """
+        Load index. Runs on the worker thread.
+        """
+        try:
+            index = load_index(self.directory, self.cache_dir)
+        except (OSError, subprocess.CalledProcessError):
+            index = None
+
+        self.loaded.emit(index)
+
+    def on_loaded(self, index):
+        """
+        Use loaded index.
+        """
+        self.index = index
+
+    def complete(self, text):
+        """
+        Show suggestions for text, if the index is loaded.
+        """
+        if self.executor is None:
+            self.load()
+
+        suggestions = [] if self.index is None or len(text.strip()) == 0 else self.index.complete(text)
+        if self.scope is not None and text.strip() in CONVENTIONAL_TYPES:
+            suggestions.insert(0, f'{text.strip()}({self.scope}): ')
+
+        self.model.setStringList(suggestions)
+        if len(suggestions) > 0:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def shutdown(self):
+        """
+        Wait for index to be loaded.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
@@ -0,0 +1,195 @@
+from formatting import count_trailer_paragraphs
+
+
+LINE_SEPARATOR = '\u2028'
+NBSP = '\u00a0'
+
+
+def block_paragraph(block):
+    """
+    Text of a block as a paragraph of the body.
+    """
+    return block.text().replace(LINE_SEPARATOR, '\n').replace(NBSP, ' ')
+
+
+class BodyDocument:
+    """
+    Wrapped chunks of the paragraphs of a QTextDocument, kept up to date from the positions reported by its
+    ``contentsChange`` signal.
+
+    An edit only records which blocks changed. The changed blocks are read from the document and formatted on the next
+    ``update``, so neither edits nor updates ever copy the whole document.
+
+    Formatting a block may depend on a state left by the blocks before it, such as an open fenced code block. The state
+    each block was formatted with is kept, and when an update changes the state after the changed blocks, the following
+    blocks are formatted again until their state matches.
+
+    Formatting a block also depends on whether it is part of the trailers at the end of the body, which is found again
+    on every update by reading blocks back from the end of the document up to the last blank line. Blocks that joined
+    or left the trailers are formatted again.
+    """
+
+    def __init__(self, document, format_paragraph):
+        self.document = document
+        self.format_paragraph = format_paragraph
+        self.clean_count = 1
+        self.reset()
+
+        # documents without a layout do not report every change through contentsChange
+        self.document.documentLayout()
+        self.document.contentsChange.connect(self.on_contents_change)
+
+    def reset(self):
+        """
+        Mark every block as changed.
+        """
+        count = self.document.blockCount()
+        self.paragraphs = [None] * count
+        self.chunks = [None] * count
+        self.states = [None] * count
+        self.lengths = []
+        self.removed = {}
+        self.trailer_start = count
+
+        block = self.document.begin()
+        for _ in range(count):
+            self.lengths.append(block.length() - 1)
+            block = block.next()
+
+        self.dirty_start = 0
+        self.dirty_suffix = 0
+
+    def on_contents_change(self, position, removed, added):
+        """
+        Replace the blocks touched by an edit with placeholders to be read on the next update.
+
+        Parameters
+        ----------
+        position : int
+            Position of the edit.
+
+        removed : int
+            Number of characters removed at position.
+
+        added : int
+            Number of characters added at position.
+        """
+        block = self.document.findBlock(position)
+        if not block.isValid():
+            block = self.document.lastBlock()
+
+        first = block.blockNumber()
+        offset = block.position()
+        old_stop = first + 1
+        while old_stop < len(self.lengths) and offset + self.lengths[old_stop - 1] < position + removed:
+            offset += self.lengths[old_stop - 1] + 1
+            old_stop += 1
+
+        last = self.document.findBlock(position + added)
+        if not last.isValid():
+            last = self.document.lastBlock()
+
+        count = last.blockNumber() - first + 1
+        lengths = []
+        for _ in range(count):
+            lengths.append(block.length() - 1)
+            block = block.next()
+
+        for i in range(first, old_stop):
+            if self.chunks[i] is not None:
+                self.removed[self.paragraphs[i]] = (self.chunks[i], self.states[i], i >= self.trailer_start)
+
+        # the trailer start keeps pointing at the first block formatted as a trailer
+        if self.trailer_start >= old_stop:
+            self.trailer_start += count - (old_stop - first)
+        elif self.trailer_start > first:
+            self.trailer_start = first + count
+
+        self.paragraphs[first:old_stop] = [None] * count
+        self.chunks[first:old_stop] = [None] * count
+        self.states[first:old_stop] = [None] * count
+        self.lengths[first:old_stop] = lengths
+
+        suffix = len(self.chunks) - first - count
+        if self.dirty_start is None:
+            self.dirty_start, self.dirty_suffix = first, suffix
+        else:
+            self.dirty_start, self.dirty_suffix = min(self.dirty_start, first), min(self.dirty_suffix, suffix)
+
+        if len(self.chunks) != self.document.blockCount():
+            self.reset()
+
+    def update(self):
+        """
+        Read and format changed blocks.
+
+        Returns
+        -------
+        tuple or None
+            Start and end index of the changed chunks since the previous update, in the previous and the current list
+            of chunks, or None if nothing changed.
+        """
+        if self.dirty_start is None:
+            return None
+
+        start = self.dirty_start
+        old_stop = self.clean_count - self.dirty_suffix
+        new_stop = len(self.chunks) - self.dirty_suffix
+
+        trailer_start = len(self.chunks) - count_trailer_paragraphs(self.reversed_paragraphs())
+        if trailer_start != self.trailer_start:
+            low, high = sorted((trailer_start, self.trailer_start))
+            start = min(start, low)
+            if high > new_stop:
+                old_stop += high - new_stop
+                new_stop = high
+
+        block = self.document.findBlockByNumber(start)
+        state = None if start == 0 else self.states[start - 1][1]
+        i = start
+        while i < len(self.chunks):
+            trailers = i >= trailer_start
+            if self.chunks[i] is None or self.states[i][0] != state or (i >= self.trailer_start) != trailers:
+                if i >= new_stop:
+                    old_stop += 1
+                    new_stop += 1
+
+                self.format_block(i, block, state, trailers)
+            elif i >= new_stop:
+                break
+
+            state = self.states[i][1]
+            block = block.next()
+            i += 1
+
+        self.removed = {}
+        self.dirty_start = None
+        self.clean_count = len(self.chunks)
+        self.trailer_start = trailer_start
+
+        return start, old_stop, new_stop
+
+    def reversed_paragraphs(self):
+        """
+        Read paragraphs from the last block of the document to the first.
+        """
+        block = self.document.lastBlock()
+        while block.isValid():
+            yield block_paragraph(block)
+            block = block.previous()
+
+    def format_block(self, i, block, state, trailers):
+        """
+        Read and format a single block, starting in the given state.
+        """
+        paragraph = block_paragraph(block)
+        removed = self.removed.get(paragraph)
+        if removed is not None and removed[1][0] == state and removed[2] == trailers:
+            chunk, states, _ = removed
+        else:
+            chunk, end_state = self.format_paragraph(paragraph, state, trailers)
+            states = (state, end_state)
+
+        self.paragraphs[i] = paragraph
+        self.chunks[i] = chunk
+        self.states[i] = states
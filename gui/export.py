@@ -0,0 +1,193 @@
+import os
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+
+from fileutils import atomic_write
+from tracing import hot_path_trace
+
+
+COMMIT_MESSAGE_FILE_NAME = 'COMMIT_EDITMSG'
+GIT_FILE_PREFIX = 'gitdir:'
+
+Repository = namedtuple('Repository', ['work_tree', 'git_dir'])
+
+
+def read_git_file(path):
+    """
+    Read the git directory that the ``.git`` file of a worktree or submodule points to.
+    """
+    with open(path, 'r') as f:
+        content = f.read().strip()
+
+    if not content.startswith(GIT_FILE_PREFIX):
+        return None
+
+    git_dir = content[len(GIT_FILE_PREFIX):].strip()
+
+    return os.path.normpath(os.path.join(os.path.dirname(path), git_dir))
+
+
+def find_repository(path):
+    """
+    Find the repository containing path, by looking for ``.git`` in path and each of its parents.
+
+    Linked worktrees and submodules have a ``.git`` file instead of a directory, pointing to their own git directory.
+    ``GIT_DIR`` and ``GIT_WORK_TREE`` override the search, as they do for git run in path, so relative ones are
+    relative to path.
+
+    Returns
+    -------
+    Repository or None
+        Work tree and git directory of the repository, or None if path is not in a repository.
+    """
+    path = os.path.abspath(path)
+    if 'GIT_DIR' in os.environ:
+        # relative paths are relative to the directory git runs in
+        work_tree = os.path.normpath(os.path.join(path, os.environ.get('GIT_WORK_TREE', '')))
+        return Repository(work_tree, os.path.normpath(os.path.join(path, os.environ['GIT_DIR'])))
+
+    while True:
+        dot_git = os.path.join(path, '.git')
+        if os.path.isdir(dot_git):
+            return Repository(path, dot_git)
+
+        if os.path.isfile(dot_git):
+            git_dir = read_git_file(dot_git)
+            if git_dir is not None:
+                return Repository(path, git_dir)
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+
+        path = parent
+
+
+def resolve_head(git_dir):
+    """
+    Commit checked out in the repository with git directory, or None if there is none or git could not be run.
+    """
+    try:
+        result = subprocess.run(
+            ['git', '--git-dir', git_dir, 'rev-parse', '--verify', '--quiet', 'HEAD'],
+            capture_output=True,
+            encoding='utf-8',
+        )
+    except OSError:
+        return None
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+class Exporter(QObject):
+    """
+    Export commit messages to the ``COMMIT_EDITMSG`` file of the repository, and optionally commit with them.
+
+    Finding the repository and writing the file happen on a worker thread, one export at a time and in order, so a
+    slow file system never blocks the GUI. Outside a repository, messages are exported to a fallback file in the
+    directory instead. Commits run as asynchronous ``git commit -F`` processes.
+    """
+
+    exported = pyqtSignal(str)
+    export_failed = pyqtSignal(str)
+    committed = pyqtSignal(int, str)
+    written = pyqtSignal(str, str)
+
+    def __init__(self, fallback_file_name, parent=None):
+        super().__init__(parent)
+        self.fallback_file_name = fallback_file_name
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.process = None
+        self.written.connect(self.on_written)
+
+    def export(self, text, directory, commit=False):
+        """
+        Export message on the worker thread.
+
+        Parameters
+        ----------
+        text : str
+            Commit message.
+
+        directory : str
+            Directory to look for the repository from.
+
+        commit : bool
+            Whether to commit with the message once it is written.
+        """
+        return self.executor.submit(self.write, text, directory, commit)
+
+    @hot_path_trace.traced
+    def write(self, text, directory, commit):
+        """
+        Find the repository and write message. Runs on the worker thread.
+        """
+        try:
+            repository = find_repository(directory)
+            if repository is None:
+                if commit:
+                    self.export_failed.emit(f'{os.path.abspath(directory)} is not in a git repository')
+                    return
+
+                path = os.path.join(directory, self.fallback_file_name)
+            else:
+                path = os.path.join(repository.git_dir, COMMIT_MESSAGE_FILE_NAME)
+
+            atomic_write(path, text)
+        except OSError as e:
+            self.export_failed.emit(str(e))
+            return
+
+        # signals emitted from the worker thread are delivered on the thread the exporter lives in
+        self.written.emit(path, repository.work_tree if commit else '')
+
+    def on_written(self, path, work_tree):
+        """
+        Report written message and start commit, if requested.
+        """
+        self.exported.emit(path)
+        if len(work_tree) > 0:
+            self.commit(path, work_tree)
+
+    def commit(self, path, work_tree):
+        """
+        Run ``git commit -F`` with the message file, reporting its exit code and output through ``committed``.
+        """
+        if self.process is not None:
+            self.committed.emit(-1, 'A commit is already running')
+            return
+
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(work_tree)
+        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.process.finished.connect(self.on_commit_finished)
+        self.process.errorOccurred.connect(self.on_commit_error)
+        self.process.start('git', ['commit', '-F', path])
+
+    def on_commit_finished(self, exit_code, exit_status):
+        """
+        Report finished commit.
+        """
+        output = bytes(self.process.readAll()).decode('utf-8', errors='replace')
+        self.process = None
+        self.committed.emit(exit_code, output.strip())
+
+    def on_commit_error(self, error):
+        """
+        Report commit that could not be started.
+        """
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+
+        message = self.process.errorString()
+        self.process = None
+        self.committed.emit(-1, message)
+
+    def shutdown(self):
+        """
+        Wait for pending exports to be written.
+        """
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,58 @@
+import os
+import hashlib
+import tempfile
+
+
+def read_umask():
+    """
+    Read the file mode creation mask of the process, which can only be read by setting it.
+    """
+    umask = os.umask(0o022)
+    os.umask(umask)
+
+    return umask
+
+
+# read once, as setting the mask to read it races with files created by other threads
+UMASK = read_umask()
+
+
+def atomic_write(path, text, encoding=None):
+    """
+    Write text to file through a temporary file in the same directory that is renamed over the destination, so
+    readers only ever see the old or the new content.
+
+    The file keeps the permissions of the file it replaces, or gets those of a file created by ``open``.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+        raise
+
+
+def cache_path(cache_dir, git_dir):
+    """
+    File the cached data of a repository is stored in.
+    """
+    name = hashlib.sha1(os.path.realpath(git_dir).encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_dir, f'{name}.json')
@@ -0,0 +1,281 @@
+import re
+from collections import namedtuple
+
+from textwidth import DisplayWidthWrapper, str_width, truncate
+
+
+Limits = namedtuple('Limits', ['summary', 'body_wrap'])
+DEFAULT_LIMITS = Limits(summary=50, body_wrap=72)
+
+Violation = namedtuple('Violation', ['rule', 'line', 'length'])
+
+SUMMARY_TOO_LONG = 'summary-too-long'
+MISSING_BLANK_LINE = 'missing-blank-line'
+BODY_LINE_TOO_LONG = 'body-line-too-long'
+TRAILING_WHITESPACE = 'trailing-whitespace'
+UNBREAKABLE_TOKEN = 'unbreakable-token'
+
+Token = namedtuple('Token', ['kind', 'text', 'marker', 'fence'])
+
+PROSE = 'prose'
+BULLET = 'bullet'
+CODE = 'code'
+FENCE = 'fence'
+TRAILER = 'trailer'
+
+TRAILER_KEYS = r'[a-z]+(?:-[a-z]+)*-by|fixes|closes|resolves|refs|see-also|change-id|bug|cc'
+
+TRAILER_LINE = rf'(?i:{TRAILER_KEYS}):[ \t]*\S.*'
+
+# every kind of line is an alternative of a single pattern, so each line is classified by one match
+LINE_PATTERN = re.compile(
+    r'(?P<fence>[ ]{0,3}(?P<fence_marker>`{3,}|~{3,}).*)'
+    r'|(?P<bullet>(?P<bullet_marker>[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+)\S.*)'
+    r'|(?P<code>(?:[ ]{4}|\t).*)'
+    rf'|(?P<trailer>{TRAILER_LINE})'
+    r'|(?P<prose>.*)',
+    re.DOTALL,
+)
+TRAILER_PATTERN = re.compile(TRAILER_LINE, re.DOTALL)
+URL_PATTERN = re.compile(r'([a-zA-Z][a-zA-Z0-9+.-]*://\S+)')
+
+
+def tokenize(lines, fence=None):
+    """
+    Classify lines of a message body in a single pass.
+
+    Parameters
+    ----------
+    lines : iterable
+        Lines of the body.
+
+    fence : str or None
+        Marker of the fenced code block the first line is in, if any.
+
+    Yields
+    ------
+    Token
+        Kind of the line, the line, the bullet or fence marker of the line and the marker of the fenced code block open
+        after the line. Lines of the form ``Key: value`` are of kind ``TRAILER`` wherever they are in the body, whether
+        they are trailers depends on the lines after them, see ``count_trailer_paragraphs``.
+    """
+    for line in lines:
+        match = LINE_PATTERN.match(line)
+        kind = match.lastgroup
+        marker = None
+
+        if fence is not None:
+            if kind == FENCE and match.group('fence').strip().startswith(fence) and line.strip(fence[0]).strip() == '':
+                fence = None
+            else:
+                kind = CODE
+        elif kind == FENCE:
+            marker = match.group('fence_marker')
+            fence = marker
+        elif kind == BULLET:
+            marker = match.group('bullet_marker')
+
+        yield Token(kind, line, marker, fence)
+
+
+def count_trailer_paragraphs(paragraphs):
+    """
+    Count the paragraphs at the end of a body that hold its trailers.
+
+    As in ``git interpret-trailers``, the trailers are the last block of lines of the body, after its last blank line,
+    and only if every line of that block is of the form ``Key: value``.
+
+    Parameters
+    ----------
+    paragraphs : iterable
+        Paragraphs of the body, from the last to the first. Lines of a paragraph may be separated by line breaks.
+
+    Returns
+    -------
+    int
+        Number of paragraphs at the end of the body that are trailers or blank, or 0 if the body does not end with
+        trailers.
+    """
+    count = 0
+    found = False
+    for paragraph in paragraphs:
+        for line in reversed(paragraph.split('\n')):
+            if len(line.strip()) == 0:
+                if found:
+                    return count
+            elif TRAILER_PATTERN.fullmatch(line) is None:
+                return 0
+            else:
+                found = True
+
+        count += 1
+
+    return count if found else 0
+
+
+class MessageWrapper(DisplayWidthWrapper):
+    """
+    Text wrapper that keeps URLs whole, putting a URL longer than a line on a line of its own.
+    """
+
+    def _split(self, text):
+        if '://' not in text:
+            return super()._split(text)
+
+        chunks = []
+        for i, piece in enumerate(URL_PATTERN.split(text)):
+            if i % 2 == 1:
+                chunks.append(piece)
+            elif len(piece) > 0:
+                chunks.extend(super()._split(piece))
+
+        return chunks
+
+    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+        if URL_PATTERN.fullmatch(reversed_chunks[-1]) is None:
+            return super()._handle_long_word(reversed_chunks, cur_line, cur_len, width)
+
+        if not cur_line:
+            cur_line.append(reversed_chunks.pop())
+
+
+class MessageFormatter:
+    """
+    Incremental formatter that caches the formatted output of each paragraph.
+
+    Prose is wrapped to the body wrap limit and bullets are wrapped with a hanging indent. Indented or fenced code and
+    the trailers at the end of the body, such as ``Signed-off-by:``, are kept as they are.
+    """
+
+    def __init__(self, limits=DEFAULT_LIMITS):
+        self.limits = limits
+        self.wrapper = MessageWrapper(width=self.limits.body_wrap, replace_whitespace=False)
+        self.bullet_wrappers = {}
+        self.cache = {}
+
+    def truncate_summary(self, summary):
+        """
+        Truncate summary to summary limit, in columns, without splitting grapheme clusters.
+        """
+        return truncate(summary, self.limits.summary)
+
+    def wrap_bullet(self, line, marker):
+        """
+        Wrap bullet, indenting its continuation lines to line up with the text after the marker.
+        """
+        indent = str_width(marker.expandtabs())
+        wrapper = self.bullet_wrappers.get(indent)
+        if wrapper is None:
+            wrapper = MessageWrapper(
+                width=self.limits.body_wrap,
+                replace_whitespace=False,
+                subsequent_indent=' ' * indent,
+            )
+            self.bullet_wrappers[indent] = wrapper
+
+        return '\n'.join(wrapper.wrap(text=line))
+
+    def format_paragraph(self, paragraph, fence=None, trailers=False):
+        """
+        Format single paragraph, reusing cached output of the previous pass.
+
+        Lines of a paragraph that contains line breaks are formatted separately. Lines of the form ``Key: value`` are
+        only kept as they are if the paragraph is part of the trailers at the end of the body.
+
+        Returns
+        -------
+        tuple
+            Formatted paragraph and the marker of the fenced code block open after it, if any.
+        """
+        formatted = self.cache.get((paragraph, fence, trailers))
+        if formatted is not None:
+            return formatted
+
+        lines = []
+        for token in tokenize(paragraph.split('\n'), fence):
+            if token.kind == PROSE or (token.kind == TRAILER and not trailers):
+                lines.append('\n'.join(self.wrapper.wrap(text=token.text)))
+            elif token.kind == BULLET:
+                lines.append(self.wrap_bullet(token.text, token.marker))
+            else:
+                lines.append(token.text)
+
+            fence = token.fence
+
+        return '\n'.join(lines), fence
+
+    def format_body_chunks(self, body):
+        """
+        Format every paragraph of body, re-formatting only paragraphs that changed since the previous pass.
+        """
+        cache = {}
+        chunks = []
+        fence = None
+        paragraphs = body.split('\n')
+        trailer_start = len(paragraphs) - count_trailer_paragraphs(reversed(paragraphs))
+        for i, paragraph in enumerate(paragraphs):
+            key = (paragraph, fence, i >= trailer_start)
+            formatted = cache.get(key)
+            if formatted is None:
+                formatted = self.format_paragraph(*key)
+                cache[key] = formatted
+
+            text, fence = formatted
+            chunks.append(text)
+
+        self.cache = cache
+
+        return chunks
+
+    def format_body(self, body):
+        """
+        Wrap body.
+        """
+        return '\n'.join(self.format_body_chunks(body))
+
+    def format_chunks(self, summary, body):
+        """
+        Format commit message as a list of chunks, that are joined by newlines to form the message.
+        """
+        summary = self.truncate_summary(summary)
+        chunks = self.format_body_chunks(body)
+        if len(summary.strip()) > 0:
+            return [summary, ''] + chunks
+
+        return chunks
+
+    def format(self, summary, body):
+        """
+        Format commit message from summary and body.
+        """
+        return '\n'.join(self.format_chunks(summary, body))
+
+
+def format_message(summary, body, limits=DEFAULT_LIMITS):
+    """
+    Format commit message according to the given summary and body wrap limits.
+    """
+    return MessageFormatter(limits).format(summary, body)
+
+
+def check_message(message, limits=DEFAULT_LIMITS):
+    """
+    List violations of the summary limit, blank line and body wrap rules in a raw commit message.
+
+    Line numbers start at 1 and lengths are in display columns.
+    """
+    lines = message.rstrip('\n').split('\n')
+    widths = [str_width(line) for line in lines]
+    violations = []
+
+    if widths[0] > limits.summary:
+        violations.append(Violation(SUMMARY_TOO_LONG, 1, widths[0]))
+
+    if len(lines) > 1 and len(lines[1].strip()) > 0:
+        violations.append(Violation(MISSING_BLANK_LINE, 2, widths[1]))
+
+    for i, width in enumerate(widths[1:], start=2):
+        if width > limits.body_wrap:
+            violations.append(Violation(BODY_LINE_TOO_LONG, i, width))
+
+    return violations
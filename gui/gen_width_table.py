@@ -0,0 +1,70 @@
+import os
+import sys
+import unicodedata
+
+
+TABLE_FILE_NAME = 'widthtable.py'
+FIRST_CODE_POINT = 0x300
+
+
+def char_class_width(char):
+    """
+    Display width of a single character according to its Unicode properties.
+    """
+    code = ord(char)
+    category = unicodedata.category(char)
+
+    if category in ('Mn', 'Me', 'Cf', 'Cc') or 0x1160 <= code <= 0x11FF:
+        return 0
+
+    # unassigned code points are reported as fullwidth, keep them one column wide until they are assigned
+    if category != 'Cn' and unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+
+    return 1
+
+
+def width_ranges():
+    """
+    Group code points from U+0300 onwards that are not one column wide into ranges of equal width.
+    """
+    ranges = []
+    for code in range(FIRST_CODE_POINT, sys.maxunicode + 1):
+        width = char_class_width(chr(code))
+        if width == 1:
+            continue
+
+        if len(ranges) > 0 and ranges[-1][1] == code - 1 and ranges[-1][2] == width:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code, width])
+
+    return ranges
+
+
+def main():
+    """
+    Generate display width table module.
+    """
+    ranges = width_ranges()
+    lines = [
+        f'# Generated by gen_width_table.py from Unicode {unicodedata.unidata_version}, do not edit.',
+        '# Display widths of code points from U+0300 onwards that are not one column wide, as sorted ranges of',
+        '# inclusive start and end code points and their width.',
+        '',
+        'STARTS = (',
+    ]
+    lines += [f'    0x{start:05X},' for start, _, _ in ranges]
+    lines += [')', '', 'ENDS = (']
+    lines += [f'    0x{end:05X},' for _, end, _ in ranges]
+    lines += [')', '', 'WIDTHS = (']
+    lines += [f'    {width},' for _, _, width in ranges]
+    lines += [')', '']
+
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)), TABLE_FILE_NAME)
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -1,7 +1,9 @@
 import os
 import sys
-import json
+from collections import deque
 
+# imported before everything else so that the startup trace includes the time spent importing PyQt6
+from tracing import hot_path_trace, startup_trace
 from PyQt6.QtWidgets import (
     QMainWindow,
     QApplication,
@@ -15,11 +17,54 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import (
     QPixmap,
     QIcon,
+    QTextCursor,
 )
-from MangoUI import Button
-import pyperclip
-import textwrap
-
+from PyQt6.QtCore import QTimer
+from MangoUI import Button, Theme
+from clipboard import Clipboard
+from completion import SummaryCompleter
+from formatting import Limits, MessageFormatter
+from document import BodyDocument
+from export import Exporter
+from highlighter import BodyHighlighter, SummaryHighlighter
+from history import HistoryStore
+from historypanel import HistoryPanel
+from preview import MessagePreview
+from scheduler import RenderScheduler
+from settings import SettingsStore
+from spelling import SpellChecker
+from staged import StagedAnalyzer, format_staged_changes
+
+
+startup_trace.mark('imports')
+hot_path_trace.instrument_mangoui()
+
+
+STYLE_SHEET = '''
+    QMainWindow {{
+        background: QLinearGradient(
+            x1:0 y1:0, x2:1 y2:0, stop:0 {primary_background_color}, stop:1 {secondary_background_color}
+        );
+    }}
+
+    QLabel, QStatusBar {{
+        color: {text_color};
+        font-size: {font_size}pt;
+    }}
+
+    QLineEdit, QTextEdit, QListWidget, QPlainTextEdit {{
+        color: {text_color};
+        background-color: {primary_color};
+        font-size: {font_size}pt;
+        border: 1px solid {border_color};
+        border-radius: {border_radius}px;
+    }}
+
+    QPlainTextEdit[role="preview"] {{
+        color: {secondary_color};
+        font-family: {font_family};
+    }}
+'''
 
 DEFAULT_SETTINGS = {
     "_width": 800,
@@ -32,33 +77,37 @@ DEFAULT_SETTINGS = {
 class GitmsgGUI(QMainWindow):
     """
     Graphical user interface for formatting Git commit messages.
+
+    Parameters
+    ----------
+    data_dir : str, optional
+        Directory that settings, history and caches are kept in. Defaults to the directory of this script.
     """
 
-    def __init__(self):
+    def __init__(self, data_dir=None):
         super().__init__()
-        self.init_config()
+        self.init_config(data_dir)
         self.init_styles()
         self.init_text_wrapper()
         self.init_ui()
 
-    def init_config(self):
+    def init_config(self, data_dir=None):
         """
         Set up configuration variables.
         """
         self.script_dir = os.path.dirname(os.path.realpath(__file__))
-        self.settings_file_name = os.path.join(self.script_dir, '.cached_settings')
+        self.data_dir = self.script_dir if data_dir is None else data_dir
+        self.settings_file_name = os.path.join(self.data_dir, '.cached_settings')
 
-        for attr, value in DEFAULT_SETTINGS.items():
+        self.settings = SettingsStore(self.settings_file_name, DEFAULT_SETTINGS)
+        for attr, value in self.settings.values.items():
             setattr(self, attr, value)
 
-        try:
-            with open(self.settings_file_name, 'r') as f:
-                cached_settings = json.load(f)
-
-                for attr, value in cached_settings.items():
-                    setattr(self, attr, value)
-        except IOError:
-            pass
+        self.settings_flush_delay = 500
+        self.settings_timer = QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.setInterval(self.settings_flush_delay)
+        self.settings_timer.timeout.connect(self.settings.flush)
 
         self.img_logo_small_path = os.path.join(self.script_dir, '../img/gitmsg_logo_small.png')
         self.img_icon_path = os.path.join(self.script_dir, '../img/gitmsg_icon.png')
@@ -66,30 +115,46 @@ class GitmsgGUI(QMainWindow):
         self.summary_limit = 50
         self.body_wrap_limit = 72
 
+        self.render_latency = 16
+
         self.export_file_name = 'gitmsg.txt'
+        self.export_directory = os.getcwd()
+
+        self.history_file_name = os.path.join(self.data_dir, '.history.sqlite3')
+        self.summary_index_dir = os.path.join(self.data_dir, '.summary_index')
+        self.staged_cache_dir = os.path.join(self.data_dir, '.staged_cache')
+        self.dictionary_file_name = os.path.join(self.data_dir, '.dictionary')
 
     def init_styles(self):
         """
         Set up UI styles.
         """
-        self.primary_background_color = 'rgb(23, 11, 59)'
-        self.secondary_background_color = 'rgb(52, 25, 72)'
-        self.primary_color = 'rgb(13, 0, 26)'
-        self.secondary_color = 'rgb(255, 51, 153)'
-        self.text_color = 'rgb(255, 255, 255)'
-
-        self.font_family = 'Consolas'
-        self.font_size = 11
-
-        self.border_color = 'rgb(128, 0, 64)'
-        self.border_radius = 3
+        self.theme = Theme(
+            {
+                'primary_background_color': 'rgb(23, 11, 59)',
+                'secondary_background_color': 'rgb(52, 25, 72)',
+                'primary_color': 'rgb(13, 0, 26)',
+                'secondary_color': 'rgb(255, 51, 153)',
+                'text_color': 'rgb(255, 255, 255)',
+                'font_family': 'Consolas',
+                'font_size': 11,
+                'border_color': 'rgb(128, 0, 64)',
+                'border_radius': 3,
+            },
+            STYLE_SHEET,
+            buttonColors={
+                'primaryColor': 'secondary_color',
+                'secondaryColor': 'primary_background_color',
+                'parentBackgroundColor': 'primary_color',
+            },
+        )
 
     def init_text_wrapper(self):
         """
-        Initiate text wrapper.
+        Initiate message formatter.
         """
-        self.msg = ''
-        self.wrapper = textwrap.TextWrapper(width=self.body_wrap_limit, replace_whitespace=False)
+        self.summary_chunks = []
+        self.formatter = MessageFormatter(Limits(summary=self.summary_limit, body_wrap=self.body_wrap_limit))
 
     def init_ui(self):
         """
@@ -97,123 +162,84 @@ class GitmsgGUI(QMainWindow):
         """
         self.setGeometry(self._x_pos, self._y_pos, self._width, self._height)
         self.setWindowTitle('gitmsg')
-        self.setWindowIcon(QIcon(self.img_icon_path))
 
-        gradient = (
-            'x1:0 y1:0, x2:1 y2:0, stop:0 '
-            f'{self.primary_background_color}, stop:1 {self.secondary_background_color}'
-        )
-        self.setStyleSheet(f'''
-            QMainWindow {{
-                background: QLinearGradient({gradient});
-            }}
-        ''')
+        self.render_scheduler = RenderScheduler(self.display_msg, self.render_latency, self)
 
         self.main_layout = QVBoxLayout()
         self.editor_layout = QHBoxLayout()
 
         self.inputs_layout = QVBoxLayout()
+        self.body_label_layout = QHBoxLayout()
         self.action_buttons_layout = QHBoxLayout()
 
         self.preview_layout = QVBoxLayout()
 
         self.summary_label = QLabel()
         self.summary_label.setText('Summary')
-        self.summary_label.setStyleSheet(f'''
-            QLabel {{
-                color: {self.text_color};
-                font-size: {self.font_size}pt;
-            }}
-        ''')
 
         self.summary = QLineEdit()
-        self.summary.setStyleSheet(f'''
-            QLineEdit {{
-                color: {self.text_color};
-                background-color: {self.primary_color};
-                font-size: {self.font_size}pt;
-                border: 1px solid {self.border_color};
-                border-radius: {self.border_radius}px;
-            }}
-        ''')
-        self.summary.setMaxLength(self.summary_limit)
-        self.summary.textChanged.connect(self.display_msg)
+        self.summary.textChanged.connect(self.render_scheduler.schedule)
+        self.summary.textChanged.connect(self.highlight_summary)
+        self.summary_highlighter = SummaryHighlighter(self.summary, self.formatter.limits)
+        self.summary_completer = SummaryCompleter(self.summary, self.export_directory, self.summary_index_dir, self)
 
         self.body_label = QLabel()
         self.body_label.setText('Body')
-        self.body_label.setStyleSheet(f'''
-            QLabel {{
-                color: {self.text_color};
-                font-size: {self.font_size}pt;
-            }}
-        ''')
 
         self.body = QTextEdit()
-        self.body.setStyleSheet(f'''
-            QTextEdit {{
-                color: {self.text_color};
-                background-color: {self.primary_color};
-                font-size: {self.font_size}pt;
-                border: 1px solid {self.border_color};
-                border-radius: {self.border_radius}px;
-            }}
-        ''')
-        self.body.textChanged.connect(self.display_msg)
-
-        self.export_button = Button(
-            primaryColor=self.secondary_color,
-            secondaryColor=self.primary_background_color,
-            parentBackgroundColor=self.primary_color,
-            borderWidth=1,
-            borderRadius=3,
-            fontSize=self.font_size,
+        self.body_document = BodyDocument(self.body.document(), self.formatter.format_paragraph)
+        self.spell_checker = SpellChecker(self.dictionary_file_name, parent=self)
+        self.body_highlighter = BodyHighlighter(
+            self.body.document(),
+            self.formatter.limits,
+            spell_checker=self.spell_checker,
         )
-        self.export_button.setText('Export Message')
-        self.export_button.clicked.connect(self.export_msg)
+        self.body.textChanged.connect(self.render_scheduler.schedule)
 
-        self.copy_button = Button(
-            primaryColor=self.secondary_color,
-            secondaryColor=self.primary_background_color,
-            parentBackgroundColor=self.primary_color,
-            borderWidth=1,
-            borderRadius=3,
-            fontSize=self.font_size,
-        )
-        self.copy_button.setText('Copy to Clipboard')
-        self.copy_button.clicked.connect(self.copy_msg)
+        self.export_button = self.make_button('Export Message', self.export_msg)
+        self.copy_button = self.make_button('Copy to Clipboard', self.copy_msg)
+        self.commit_button = self.make_button('Commit', self.commit_msg)
 
-        self.logo_pixmap = QPixmap(self.img_logo_small_path)
-        self.logo_pixmap.scaledToWidth(20)
+        self.clipboard = Clipboard(self)
+        self.clipboard.copied.connect(self.on_copied)
+        self.clipboard.copy_failed.connect(self.on_copy_failed)
+
+        self.exporter = Exporter(self.export_file_name, self)
+        self.exporter.exported.connect(self.on_exported)
+        self.exporter.export_failed.connect(self.on_export_failed)
+        self.exporter.committed.connect(self.on_committed)
+        # history entries of messages being exported and committed, in the order the exporter reports them
+        self.pending_exports = deque()
+        self.pending_commits = deque()
+
+        self.history = HistoryStore(self.history_file_name)
+
+        self.staged_changes = None
+        self.staged_analyzer = StagedAnalyzer(self.staged_cache_dir, self)
+        self.staged_analyzer.analyzed.connect(self.on_staged_analyzed)
+
+        self.staged_button = self.make_button('Staged Files', self.insert_staged_changes)
+        self.history_button = self.make_button('History', self.toggle_history)
+
+        self.history_panel = HistoryPanel(self.history, self.render_latency)
+        self.history_panel.entry_selected.connect(self.load_history_entry)
+        self.history_panel.hide()
 
         self.logo_label = QLabel()
-        self.logo_label.setPixmap(self.logo_pixmap)
 
         self.preview_label = QLabel()
         self.preview_label.setText('Preview')
-        self.preview_label.setStyleSheet(f'''
-            QLabel {{
-                color: {self.text_color};
-                font-size: {self.font_size}pt;
-            }}
-        ''')
-
-        self.preview = QTextEdit()
-        self.preview.setStyleSheet(f'''
-            QTextEdit {{
-                color: {self.secondary_color};
-                background-color: {self.primary_color};
-                font-family: {self.font_family};
-                font-size: {self.font_size}pt;
-                border: 1px solid {self.border_color};
-                border-radius: {self.border_radius}px;
-            }}
-        ''')
-        self.preview.setReadOnly(True)
+
+        self.preview = MessagePreview()
+        self.preview.setProperty('role', 'preview')
 
         self.inputs_layout.addWidget(self.summary_label)
         self.inputs_layout.addWidget(self.summary)
 
-        self.inputs_layout.addWidget(self.body_label)
+        self.body_label_layout.addWidget(self.body_label)
+        self.body_label_layout.addStretch()
+        self.body_label_layout.addWidget(self.staged_button)
+        self.inputs_layout.addLayout(self.body_label_layout)
         self.inputs_layout.addWidget(self.body)
 
         self.preview_layout.addWidget(self.preview_label)
@@ -221,9 +247,12 @@ class GitmsgGUI(QMainWindow):
 
         self.editor_layout.addLayout(self.inputs_layout)
         self.editor_layout.addLayout(self.preview_layout)
+        self.editor_layout.addWidget(self.history_panel)
 
         self.action_buttons_layout.addWidget(self.export_button)
         self.action_buttons_layout.addWidget(self.copy_button)
+        self.action_buttons_layout.addWidget(self.commit_button)
+        self.action_buttons_layout.addWidget(self.history_button)
         self.action_buttons_layout.addStretch()
         self.action_buttons_layout.addWidget(self.logo_label)
 
@@ -233,79 +262,267 @@ class GitmsgGUI(QMainWindow):
         self.central_widget = QWidget(self)
         self.central_widget.setLayout(self.main_layout)
         self.setCentralWidget(self.central_widget)
+        # created up front, so that it is laid out and themed with the rest of the window
+        self.statusBar()
+
+        self.theme.apply(self)
 
+        self.first_paint_done = False
+        self.resources_timer = QTimer(self)
+        self.resources_timer.setSingleShot(True)
+        self.resources_timer.setInterval(0)
+        self.resources_timer.timeout.connect(self.load_resources)
         self.show()
 
+    def make_button(self, text, slot):
+        """
+        Create button in the colors of the theme, calling slot when clicked.
+        """
+        button = Button(
+            **self.theme.buttonColorArguments(),
+            borderWidth=1,
+            borderRadius=3,
+            fontSize=self.theme.palette['font_size'],
+            renderMode='paint',
+        )
+        button.setText(text)
+        button.clicked.connect(slot)
+
+        return button
+
+    def load_resources(self):
+        """
+        Load images that are not needed for the first paint.
+        """
+        self.setWindowIcon(QIcon(self.img_icon_path))
+
+        self.logo_pixmap = QPixmap(self.img_logo_small_path)
+        self.logo_pixmap.scaledToWidth(20)
+        self.logo_label.setPixmap(self.logo_pixmap)
+
+        startup_trace.mark('resources loaded')
+        self.staged_analyzer.analyze(self.export_directory)
+        startup_trace.report()
+
+    def paintEvent(self, a0):
+        """
+        Paint event for window.
+        """
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_trace.mark('first paint')
+            self.resources_timer.start()
+
+        return super().paintEvent(a0)
+
+    def highlight_summary(self, summary):
+        """
+        Let body highlighter know whether the first lines of the body form the summary.
+        """
+        self.body_highlighter.set_summary_empty(len(summary.strip()) == 0)
+
+    @property
+    def msg(self):
+        """
+        Commit message displayed on preview widget.
+        """
+        return '\n'.join(self.summary_chunks + self.body_document.chunks)
+
+    @hot_path_trace.traced
     def display_msg(self):
         """
         Format commit message and display on preview widget.
+
+        Only the summary and the body paragraphs that changed since the previous call are formatted, and only their
+        chunks are replaced on the preview widget.
+        """
+        summary = self.formatter.truncate_summary(self.summary.text())
+        summary_chunks = [summary, ''] if len(summary.strip()) > 0 else []
+        if summary_chunks != self.summary_chunks:
+            self.preview.replace_chunks(0, len(self.summary_chunks), summary_chunks)
+            self.summary_chunks = summary_chunks
+
+        changed = self.body_document.update()
+        if changed is not None:
+            start, old_stop, new_stop = changed
+            offset = len(self.summary_chunks)
+            self.preview.replace_chunks(offset + start, offset + old_stop, self.body_document.chunks[start:new_stop])
+
+    @hot_path_trace.traced
+    def export_msg(self):
+        """
+        Export current commit message to the repository's COMMIT_EDITMSG, or to the export file outside a repository.
         """
-        summary = self.summary.text()[:self.summary_limit]
-        if len(summary.strip()) > 0:
-            summary += '\n\n'
+        self.render_scheduler.flush()
+        self.exporter.export(self.msg, self.export_directory)
+        self.pending_exports.append((self.history_entry(), False))
 
-        body = self.body.toPlainText()
-        body = ['\n'.join(self.wrapper.wrap(text=block)) for block in body.split('\n')]
-        body = '\n'.join(body)
+    @hot_path_trace.traced
+    def commit_msg(self):
+        """
+        Export current commit message and commit with it.
+        """
+        self.render_scheduler.flush()
+        self.exporter.export(self.msg, self.export_directory, commit=True)
+        self.pending_exports.append((self.history_entry(), True))
 
-        self.msg = summary + body
-        self.preview.setText(self.msg)
+    def on_exported(self, path):
+        """
+        Report exported message, and record it in history unless it is yet to be committed.
+        """
+        entry, commit = self.pending_exports.popleft()
+        if commit:
+            self.pending_commits.append(entry)
+        else:
+            self.record_history(entry, 'export')
 
-    def export_msg(self):
+        self.statusBar().showMessage(f'Exported to {path}')
+
+    def on_export_failed(self, error):
+        """
+        Report failed export.
+        """
+        self.pending_exports.popleft()
+        self.statusBar().showMessage(f'Export failed: {error}')
+
+    def on_committed(self, exit_code, output):
+        """
+        Report result of commit, recording the message in history if it was committed.
         """
-        Export current commit message as file.
+        entry = self.pending_commits.popleft()
+        lines = output.splitlines()
+        if exit_code == 0:
+            self.record_history(entry, 'commit')
+            self.statusBar().showMessage(lines[0] if len(lines) > 0 else 'Committed')
+            self.staged_analyzer.analyze(self.export_directory)
+        else:
+            self.statusBar().showMessage(f'Commit failed: {lines[-1] if len(lines) > 0 else exit_code}')
+
+    def on_staged_analyzed(self, changes):
         """
-        self.display_msg()
-        with open(self.export_file_name, 'w') as f:
-            f.write(self.msg)
+        Suggest scope of staged changes in the summary.
+        """
+        self.staged_changes = changes
+        self.summary_completer.scope = changes.scope
+        self.summary.setPlaceholderText('' if changes.scope is None else f'type({changes.scope}): summary')
 
+    def insert_staged_changes(self):
+        """
+        Append summary of staged files to the body.
+        """
+        text = '' if self.staged_changes is None else format_staged_changes(self.staged_changes)
+        if len(text) == 0:
+            self.statusBar().showMessage('No staged changes')
+            return
+
+        body = self.body.toPlainText()
+        if len(body.strip()) > 0:
+            text = '\n' * max(0, 2 - (len(body) - len(body.rstrip('\n')))) + text
+
+        cursor = self.body.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+
+        cursor.insertText(text)
+
+    @hot_path_trace.traced
     def copy_msg(self):
         """
         Copy current commit message to clipboard.
         """
-        self.display_msg()
-        pyperclip.copy(self.msg)
+        self.render_scheduler.flush()
+        self.clipboard.copy(self.msg)
+        self.record_history(self.history_entry(), 'copy')
 
-    def resizeEvent(self, a0):
+    def on_copied(self, backend, latency):
         """
-        Resize event for window.
+        Report copied message.
         """
-        _width, _height = a0.size().width(), a0.size().height()
-        try:
-            with open(self.settings_file_name, 'r') as f:
-                cached_settings = json.load(f)
-        except IOError:
-            cached_settings = {}
+        self.statusBar().showMessage('Copied to clipboard')
 
-        cached_settings['_width'] = _width
-        cached_settings['_height'] = _height
+    def on_copy_failed(self, error):
+        """
+        Report failed copy.
+        """
+        self.statusBar().showMessage(f'Copy failed: {error}')
+
+    def history_entry(self):
+        """
+        Summary, body, formatted message and directory of current commit message, or None if the message is empty.
+        """
+        if len(self.msg.strip()) == 0:
+            return None
 
-        with open(self.settings_file_name, 'w') as f:
-            json.dump(cached_settings, f, indent=4, sort_keys=True)
+        return self.summary.text(), self.body.toPlainText(), self.msg, self.export_directory
+
+    def record_history(self, entry, source):
+        """
+        Record commit message in history.
+        """
+        if entry is not None:
+            self.history.record(*entry, source)
+
+    def toggle_history(self):
+        """
+        Show or hide history panel.
+        """
+        self.history_panel.setVisible(not self.history_panel.isVisible())
+
+    def load_history_entry(self, entry):
+        """
+        Replace summary and body with those of a message from history.
+        """
+        self.summary.setText(entry.summary)
+        self.body.setPlainText(entry.body)
+
+    @hot_path_trace.traced
+    def resizeEvent(self, a0):
+        """
+        Resize event for window.
+        """
+        self.settings.update(_width=a0.size().width(), _height=a0.size().height())
+        self.settings_timer.start()
 
         return super().resizeEvent(a0)
 
+    @hot_path_trace.traced
     def moveEvent(self, a0):
         """
         Move event for window.
         """
-        _x_pos, _y_pos = a0.pos().x(), a0.pos().y()
-        try:
-            with open(self.settings_file_name, 'r') as f:
-                cached_settings = json.load(f)
-        except IOError:
-            cached_settings = {}
+        self.settings.update(_x_pos=a0.pos().x(), _y_pos=a0.pos().y())
+        self.settings_timer.start()
+
+        return super().moveEvent(a0)
 
-        cached_settings['_x_pos'] = _x_pos
-        cached_settings['_y_pos'] = _y_pos
+    def closeEvent(self, a0):
+        """
+        Close event for window.
+        """
+        self.shutdown()
 
-        with open(self.settings_file_name, 'w') as f:
-            json.dump(cached_settings, f, indent=4, sort_keys=True)
+        return super().closeEvent(a0)
 
-        return super().moveEvent(a0)
+    def shutdown(self):
+        """
+        Write pending settings and stop background work.
+        """
+        self.settings_timer.stop()
+        self.resources_timer.stop()
+        self.settings.flush()
+        self.exporter.shutdown()
+        self.clipboard.shutdown()
+        self.history_panel.shutdown()
+        self.history.shutdown()
+        self.summary_completer.shutdown()
+        self.staged_analyzer.shutdown()
+        self.spell_checker.shutdown()
 
 
 if __name__ == '__main__':  # pragma: no cover
     app = QApplication(sys.argv)
+    startup_trace.mark('application')
     window = GitmsgGUI()
-    sys.exit(app.exec())
+    startup_trace.mark('window constructed')
+    exit_code = app.exec()
+    hot_path_trace.report()
+    sys.exit(exit_code)
@@ -0,0 +1,241 @@
+import re
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtGui import QColor, QInputMethodEvent, QSyntaxHighlighter, QTextCharFormat, QTextFormat
+
+from formatting import (
+    DEFAULT_LIMITS,
+    SUMMARY_TOO_LONG,
+    MISSING_BLANK_LINE,
+    TRAILING_WHITESPACE,
+    UNBREAKABLE_TOKEN,
+    PROSE,
+    BULLET,
+    tokenize,
+)
+from spelling import MISSPELLED_WORD
+from textwidth import str_width, truncate
+
+
+SUMMARY_ROLE = 0
+SEPARATOR_ROLE = 1
+BODY_ROLE = 2
+# the block state holds the role in its lowest bits and the fenced code block open after the block above them
+FENCE_STATE_SHIFT = 2
+
+# trailing whitespace of every line of a block, or a run of non-whitespace characters
+SPAN_PATTERN = re.compile(r'(?P<space>[^\S\u2028]+)(?=\u2028|\Z)|\S+')
+
+VIOLATION_COLOR = QColor(255, 51, 153)
+VIOLATION_BACKGROUND_COLOR = QColor(255, 51, 153, 96)
+MISSPELLING_COLOR = QColor(255, 204, 0)
+
+
+def violation_spans(text, role, limits=DEFAULT_LIMITS):
+    """
+    Find the parts of a line of the message that break the summary limit, blank line, trailing whitespace and body
+    wrap rules.
+
+    Parameters
+    ----------
+    text : str
+        Text of the line. Lines of a body paragraph may be separated by line separators.
+
+    role : int
+        ``SUMMARY_ROLE``, ``SEPARATOR_ROLE`` or ``BODY_ROLE``, depending on the position of the line in the message.
+
+    limits : Limits
+        Summary and body wrap limits.
+
+    Returns
+    -------
+    list
+        Tuples of start index, length and rule of every violation.
+    """
+    if role == SEPARATOR_ROLE:
+        return [(0, len(text), MISSING_BLANK_LINE)] if len(text.strip()) > 0 else []
+
+    spans = []
+    if role == SUMMARY_ROLE and str_width(text) > limits.summary:
+        start = len(truncate(text, limits.summary))
+        spans.append((start, len(text) - start, SUMMARY_TOO_LONG))
+
+    for match in SPAN_PATTERN.finditer(text):
+        if match.lastgroup == 'space':
+            spans.append((match.start(), match.end() - match.start(), TRAILING_WHITESPACE))
+        elif role == BODY_ROLE and match.end() - match.start() > limits.body_wrap // 2:
+            if str_width(match.group()) > limits.body_wrap:
+                spans.append((match.start(), match.end() - match.start(), UNBREAKABLE_TOKEN))
+
+    return spans
+
+
+def utf16_span(text, start, length):
+    """
+    Convert span of code points in text to a span of UTF-16 code units, as used for positions by Qt.
+    """
+    if text.isascii():
+        return start, length
+
+    utf16_start = start + sum(1 for c in text[:start] if ord(c) > 0xFFFF)
+    utf16_length = length + sum(1 for c in text[start:start + length] if ord(c) > 0xFFFF)
+
+    return utf16_start, utf16_length
+
+
+def block_state(role, fence):
+    """
+    Block state of a block with role, after which the fenced code block with marker fence is open.
+    """
+    if fence is None:
+        return role
+
+    return role | (len(fence) * 2 + (fence[0] == '~')) << FENCE_STATE_SHIFT
+
+
+def state_fence(state):
+    """
+    Marker of the fenced code block open after a block with state, if any.
+    """
+    fence = max(state, 0) >> FENCE_STATE_SHIFT
+    if fence == 0:
+        return None
+
+    return ('~' if fence & 1 else '`') * (fence >> 1)
+
+
+def violation_formats():
+    """
+    Character formats used to highlight each rule.
+    """
+    background = QTextCharFormat()
+    background.setBackground(VIOLATION_BACKGROUND_COLOR)
+
+    underline = QTextCharFormat()
+    underline.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+    underline.setUnderlineColor(VIOLATION_COLOR)
+
+    misspelling = QTextCharFormat()
+    misspelling.setUnderlineStyle(QTextCharFormat.UnderlineStyle.SpellCheckUnderline)
+    misspelling.setUnderlineColor(MISSPELLING_COLOR)
+
+    return {
+        SUMMARY_TOO_LONG: background,
+        MISSING_BLANK_LINE: background,
+        TRAILING_WHITESPACE: background,
+        UNBREAKABLE_TOKEN: underline,
+        MISSPELLED_WORD: misspelling,
+    }
+
+
+class BodyHighlighter(QSyntaxHighlighter):
+    """
+    Highlighter for violations in the body editor.
+
+    Qt only highlights the blocks touched by an edit. The role of each block is stored as its block state, so when
+    blocks are inserted or removed near the top of the document, the blocks whose role changed are highlighted too.
+    While the summary is empty, the first two blocks of the body form the summary and the blank line of the message.
+
+    With a spell checker, misspellings in prose and bullet blocks are underlined too. Blocks that were not checked
+    before are highlighted again once the spell checker reports them, and blocks of code, including fenced code whose
+    fence is kept in the block state, are not checked.
+    """
+
+    def __init__(self, document, limits=DEFAULT_LIMITS, summary_empty=True, spell_checker=None):
+        self.limits = limits
+        self.summary_empty = summary_empty
+        self.formats = violation_formats()
+        self.spell_checker = spell_checker
+        self.unchecked = {}
+        super().__init__(document)
+
+        if self.spell_checker is not None:
+            self.spell_checker.checked.connect(self.on_checked)
+
+    def set_summary_empty(self, summary_empty):
+        """
+        Change whether the summary is empty, highlighting the blocks whose role changed.
+        """
+        if summary_empty == self.summary_empty:
+            return
+
+        self.summary_empty = summary_empty
+        self.rehighlightBlock(self.document().firstBlock())
+
+    def highlightBlock(self, text):
+        """
+        Highlight violations in a single block.
+        """
+        role = BODY_ROLE
+        if self.summary_empty:
+            role = min(self.currentBlock().blockNumber(), BODY_ROLE)
+
+        token = next(tokenize([text], state_fence(self.previousBlockState())))
+        self.setCurrentBlockState(block_state(role, token.fence))
+
+        if self.spell_checker is not None and token.kind in (PROSE, BULLET):
+            self.highlight_misspellings(text)
+
+        for start, length, rule in violation_spans(text, role, self.limits):
+            start, length = utf16_span(text, start, length)
+            self.setFormat(start, length, self.formats[rule])
+
+    def highlight_misspellings(self, text):
+        """
+        Underline misspellings in current block, or wait for the spell checker to report them.
+        """
+        spans = self.spell_checker.spans(text)
+        if spans is None:
+            self.unchecked.setdefault(text, []).append(self.currentBlock())
+            return
+
+        for start, length in spans:
+            start, length = utf16_span(text, start, length)
+            self.setFormat(start, length, self.formats[MISSPELLED_WORD])
+
+    def on_checked(self, text, spans):
+        """
+        Highlight blocks whose text was checked, if they still hold it.
+        """
+        for block in self.unchecked.pop(text, []):
+            if block.isValid() and block.text() == text:
+                self.rehighlightBlock(block)
+
+
+class SummaryHighlighter:
+    """
+    Highlighter for violations in a single line editor.
+
+    ``QLineEdit`` has no highlighter of its own, so formats are applied through an empty input method event, which
+    changes the formats of the text without changing the text.
+    """
+
+    def __init__(self, line_edit, limits=DEFAULT_LIMITS):
+        self.line_edit = line_edit
+        self.limits = limits
+        self.formats = violation_formats()
+        self.spans = []
+        self.line_edit.textChanged.connect(self.highlight)
+
+    def highlight(self, text):
+        """
+        Highlight violations in text of the line editor.
+        """
+        spans = violation_spans(text, SUMMARY_ROLE, self.limits)
+        if len(spans) == 0 and len(self.spans) == 0:
+            return
+
+        self.spans = spans
+        cursor = self.line_edit.cursorPosition()
+        attributes = []
+        for start, length, rule in spans:
+            start, length = utf16_span(text, start, length)
+            # the line editor only reads formats stored as QTextFormat, not as QTextCharFormat
+            attributes.append(QInputMethodEvent.Attribute(
+                QInputMethodEvent.AttributeType.TextFormat,
+                start - cursor,
+                length,
+                QTextFormat(self.formats[rule]),
+            ))
+
+        QCoreApplication.sendEvent(self.line_edit, QInputMethodEvent('', attributes))
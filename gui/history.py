@@ -0,0 +1,222 @@
+import time
+import queue
+import logging
+import sqlite3
+import threading
+from collections import namedtuple
+
+from export import find_repository
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+SEARCH_LIMIT = 50
+
+HistoryEntry = namedtuple('HistoryEntry', ['id', 'summary', 'body', 'message', 'repo', 'source', 'created'])
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY,
+        summary TEXT NOT NULL,
+        body TEXT NOT NULL,
+        message TEXT NOT NULL,
+        repo TEXT NOT NULL,
+        source TEXT NOT NULL,
+        created REAL NOT NULL
+    )
+    ''',
+]
+FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        message,
+        repo,
+        content='messages',
+        content_rowid='id'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, message, repo) VALUES (new.id, new.message, new.repo);
+    END
+    ''',
+]
+
+COLUMNS = 'id, summary, body, message, repo, source, created'
+INSERT_QUERY = 'INSERT INTO messages (summary, body, message, repo, source, created) VALUES (?, ?, ?, ?, ?, ?)'
+RECENT_QUERY = f'SELECT {COLUMNS} FROM messages ORDER BY id DESC LIMIT ?'
+FTS_QUERY = f'''
+    SELECT {COLUMNS} FROM messages
+    WHERE id IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ? ORDER BY rowid DESC LIMIT ?)
+    ORDER BY id DESC
+'''
+LIKE_QUERY = f'SELECT {COLUMNS} FROM messages WHERE message LIKE ? ESCAPE \'\\\' ORDER BY id DESC LIMIT ?'
+
+
+def match_query(text):
+    """
+    Build full-text query matching messages that contain words starting with every word of text.
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+def like_pattern(text):
+    """
+    Build LIKE pattern matching messages that contain text, for databases without full-text search.
+    """
+    escaped = text.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    return f'%{escaped}%'
+
+
+class HistoryStore:
+    """
+    Local history of commit messages, searchable by the words they contain.
+
+    Messages are written by a background thread, in batches of everything recorded since its previous write, so
+    recording a message never waits for the database. Searches read through a connection of their own, which the
+    write-ahead log keeps from waiting for writes. Searches may run on any thread, one at a time. Without the SQLite
+    FTS5 extension, searches fall back to scanning messages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.fts = None
+        self.queue = queue.Queue()
+        self.writer = None
+        self.lock = threading.Lock()
+
+    def connect(self, check_same_thread=True):
+        """
+        Open new connection to the database, creating the schema if needed.
+        """
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        with self.lock:
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+
+                if self.fts is None:
+                    try:
+                        for statement in FTS_SCHEMA:
+                            connection.execute(statement)
+
+                        self.fts = True
+                    except sqlite3.OperationalError:
+                        self.fts = False
+
+        return connection
+
+    def record(self, summary, body, message, directory, source):
+        """
+        Queue message to be written by the background thread.
+
+        Parameters
+        ----------
+        summary : str
+            Summary as typed.
+
+        body : str
+            Body as typed.
+
+        message : str
+            Formatted message.
+
+        directory : str
+            Directory the message was written in, recorded as the repository containing it if there is one.
+
+        source : str
+            How the message left the editor, such as ``export`` or ``copy``.
+        """
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write, name='history-writer', daemon=True)
+            self.writer.start()
+
+        self.queue.put((summary, body, message, directory, source, time.time()))
+
+    def write(self):
+        """
+        Write queued messages in batches until shut down. Runs on the background thread.
+
+        Messages that cannot be written, such as when the database is locked, corrupt or on a full disk, are logged
+        and dropped, so the queue keeps draining and ``flush`` returns.
+        """
+        try:
+            connection = self.connect()
+        except sqlite3.Error:
+            logger.exception('Could not open history database %s', self.path)
+            connection = None
+
+        running = True
+        while running:
+            items = [self.queue.get()]
+            while len(items) < BATCH_SIZE:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            for item in items:
+                if item is None:
+                    running = False
+                    continue
+
+                summary, body, message, directory, source, created = item
+                repository = find_repository(directory)
+                repo = directory if repository is None else repository.work_tree
+                rows.append((summary, body, message, repo, source, created))
+
+            try:
+                if connection is not None:
+                    with connection:
+                        connection.executemany(INSERT_QUERY, rows)
+            except sqlite3.Error:
+                logger.exception('Could not write %d messages to history database %s', len(rows), self.path)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+        if connection is not None:
+            connection.close()
+
+    def flush(self):
+        """
+        Wait until every queued message is written.
+        """
+        self.queue.join()
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """
+        Find most recent messages containing words that start with every word of text, or the most recent messages if
+        text is blank.
+        """
+        if self.connection is None:
+            # searches run on a worker thread, and the connection is closed on shutdown
+            self.connection = self.connect(check_same_thread=False)
+
+        if len(text.strip()) == 0:
+            rows = self.connection.execute(RECENT_QUERY, (limit,))
+        elif self.fts:
+            rows = self.connection.execute(FTS_QUERY, (match_query(text), limit))
+        else:
+            rows = self.connection.execute(LIKE_QUERY, (like_pattern(text), limit))
+
+        return [HistoryEntry(*row) for row in rows]
+
+    def shutdown(self):
+        """
+        Write queued messages and close the database.
+        """
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
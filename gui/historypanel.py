@@ -0,0 +1,111 @@
+import time
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+from scheduler import RenderScheduler
+
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryPanel(QWidget):
+    """
+    Search field and list of matching messages from the history store.
+
+    Bursts of typing are coalesced into a single search, which runs on a worker thread, so opening the database and
+    querying it never blocks the GUI. Results of searches overtaken by newer ones are dropped. The list is refreshed
+    whenever the panel is shown so newly recorded messages appear. Activating a result emits ``entry_selected`` with
+    its history entry.
+    """
+
+    entry_selected = pyqtSignal(object)
+    searched = pyqtSignal(int, object)
+
+    def __init__(self, store, latency=16, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.entries = []
+        self.executor = None
+        self.generation = 0
+        self.searched.connect(self.on_searched)
+
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText('Search history')
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self.on_item_activated)
+
+        self.scheduler = RenderScheduler(self.search, latency, self)
+        self.search_field.textChanged.connect(self.scheduler.schedule)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.search_field)
+        layout.addWidget(self.results)
+        self.setLayout(layout)
+
+    def search(self):
+        """
+        Start search for messages matching the search field on the worker thread.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.generation += 1
+        self.executor.submit(self.run_search, self.generation, self.search_field.text())
+
+    def run_search(self, generation, text):
+        """
+        Search messages, unless a newer search was started since. Runs on the worker thread.
+        """
+        if generation != self.generation:
+            return
+
+        try:
+            entries = self.store.search(text)
+        except sqlite3.Error:
+            logger.exception('Could not search history database %s', self.store.path)
+            entries = []
+
+        self.searched.emit(generation, entries)
+
+    def on_searched(self, generation, entries):
+        """
+        Show messages found by the latest search.
+        """
+        if generation != self.generation:
+            return
+
+        self.entries = entries
+        self.results.clear()
+        for entry in self.entries:
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.created))
+            summary = entry.message.split('\n', 1)[0]
+            self.results.addItem(QListWidgetItem(f'{summary}\n{entry.repo}, {created}'))
+
+    def showEvent(self, a0):
+        """
+        Show event for panel.
+        """
+        self.scheduler.flush()
+        self.search()
+
+        return super().showEvent(a0)
+
+    def on_item_activated(self, item):
+        """
+        Emit history entry of activated result.
+        """
+        self.entry_selected.emit(self.entries[self.results.row(item)])
+
+    def shutdown(self):
+        """
+        Wait for running search to finish.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
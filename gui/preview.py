@@ -0,0 +1,54 @@
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtGui import QTextCursor
+
+from document import LINE_SEPARATOR
+
+
+class MessagePreview(QPlainTextEdit):
+    """
+    Read-only preview that edits only the changed chunks of its document.
+
+    Every chunk of the message is kept in a block of its own, with the wrapped lines of a chunk separated by line
+    separators, so chunks can be found by block number without scanning the document.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+
+    def replace_chunks(self, start, stop, chunks):
+        """
+        Replace the chunks from start up to stop with new chunks.
+        """
+        if start == stop and len(chunks) == 0:
+            return
+
+        document = self.document()
+        text = '\n'.join([chunk.replace('\n', LINE_SEPARATOR) for chunk in chunks])
+
+        if start == stop:
+            if start < document.blockCount():
+                begin = end = document.findBlockByNumber(start).position()
+                text += '\n'
+            else:
+                begin = end = document.characterCount() - 1
+                text = '\n' + text
+        else:
+            first = document.findBlockByNumber(start)
+            last = document.findBlockByNumber(stop - 1)
+            begin = first.position()
+            end = last.position() + last.length() - 1
+
+            if len(chunks) == 0:
+                if stop < document.blockCount():
+                    end += 1
+                elif start > 0:
+                    begin -= 1
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.setPosition(begin)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(text)
+        cursor.endEditBlock()
@@ -0,0 +1,247 @@
+import io
+import re
+import sys
+import argparse
+
+from formatting import DEFAULT_LIMITS, TRAILER_PATTERN, Limits, MessageFormatter
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+MBOX_POSTMARK_PATTERN = re.compile(r'^From \S+ +\w{3} \w{3} [ \d]\d \d\d:\d\d:\d\d \d{4}')
+SUBJECT_PREFIX_PATTERN = re.compile(r'^(?:\[[^\]]*\]\s*)*')
+
+
+def read_records(stream, separator='\0', chunk_size=READ_CHUNK_SIZE, keep_separator=False):
+    """
+    Lazily split stream into separator-terminated records, holding at most one record in memory.
+
+    With ``keep_separator``, every record but an unterminated last one ends with the separator.
+    """
+    pieces = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+
+        start = 0
+        while True:
+            end = chunk.find(separator, start)
+            if end < 0:
+                pieces.append(chunk[start:])
+                break
+
+            pieces.append(chunk[start:end + 1] if keep_separator else chunk[start:end])
+            yield ''.join(pieces)
+            pieces = []
+            start = end + 1
+
+    tail = ''.join(pieces)
+    if tail:
+        yield tail
+
+
+def reflow_message(message, formatter):
+    """
+    Reformat raw commit message, as printed by ``git log --format=%B``.
+    """
+    ending = '\n' if message.endswith('\n') else ''
+    summary, _, body = message[:len(message) - len(ending)].partition('\n')
+    body = body.lstrip('\n')
+
+    if len(body) > 0:
+        return formatter.format(summary, body) + ending
+
+    return formatter.truncate_summary(summary) + ending
+
+
+def reflow_records(records, formatter, separator=None):
+    """
+    Reformat stream of raw commit messages.
+
+    If a separator is given, records may end with it, and it is kept after the reformatted message.
+    """
+    for record in records:
+        terminator = separator if separator is not None and record.endswith(separator) else ''
+        yield reflow_message(record[:len(record) - len(terminator)], formatter) + terminator
+
+
+def reflow_lines(lines, formatter):
+    """
+    Reformat a single raw commit message read line by line, giving the same result as ``reflow_message``.
+
+    Lines are reformatted as they are read, except for the current paragraph and the blank lines after it, which are
+    held until the next paragraph starts, since only the last paragraph of the body can hold trailers.
+    """
+    summary = None
+    ending = ''
+    body_started = False
+    fence = None
+    paragraph = []
+    blanks = []
+
+    def format_lines(lines, trailers):
+        nonlocal fence
+        for line in lines:
+            chunk, fence = formatter.format_paragraph(line, fence, trailers)
+            yield chunk
+
+    for line in lines:
+        ending = '\n' if line.endswith('\n') else ''
+        line = line[:len(line) - len(ending)]
+        if summary is None:
+            summary = formatter.truncate_summary(line)
+            continue
+
+        if not body_started:
+            # empty lines between summary and body are dropped
+            if len(line) == 0:
+                continue
+
+            body_started = True
+            if len(summary.strip()) > 0:
+                yield summary + '\n\n'
+
+        if len(line.strip()) == 0:
+            blanks.append(line)
+        elif len(blanks) > 0:
+            for chunk in format_lines(paragraph + blanks, False):
+                yield chunk + '\n'
+
+            paragraph, blanks = [line], []
+        else:
+            paragraph.append(line)
+
+    if summary is None:
+        return
+
+    if not body_started:
+        yield summary + ending
+        return
+
+    trailers = len(paragraph) > 0 and all(TRAILER_PATTERN.fullmatch(line) is not None for line in paragraph)
+    chunks = list(format_lines(paragraph, trailers)) + list(format_lines(blanks, False))
+    yield '\n'.join(chunks) + ending
+
+
+def reflow_subject(subject, formatter):
+    """
+    Truncate subject header value, keeping any ``[PATCH n/m]`` prefix intact.
+    """
+    prefix = SUBJECT_PREFIX_PATTERN.match(subject).group(0)
+
+    return prefix + formatter.truncate_summary(subject[len(prefix):])
+
+
+def reflow_patch(headers, subject_index, body, formatter):
+    """
+    Reformat headers and commit message of a single patch.
+
+    MIME encoded subjects are passed through as is, since truncating them would corrupt the encoding.
+    """
+    for i, header in enumerate(headers):
+        if i == subject_index:
+            value = ' '.join(line.strip() for line in header)[len('Subject:'):].strip()
+            if '=?' in value:
+                yield from header
+            else:
+                yield f'Subject: {reflow_subject(value, formatter)}\n'
+        else:
+            yield header
+
+    text = ''.join(body)
+    if len(text) > 0:
+        ending = '\n' if text.endswith('\n') else ''
+        yield formatter.format_body(text[:len(text) - len(ending)]) + ending
+
+
+def reflow_mbox(lines, formatter):
+    """
+    Reformat subject and commit message of every patch in a ``git format-patch`` mbox stream.
+
+    Headers other than the subject and everything after the ``---`` separator are passed through untouched, so only
+    the headers and message of the current patch are ever held in memory.
+    """
+    headers = None
+    subject_index = None
+    body = None
+
+    for line in lines:
+        if MBOX_POSTMARK_PATTERN.match(line):
+            if headers is not None:
+                yield from reflow_patch(headers, subject_index, body or [], formatter)
+
+            headers, subject_index, body = [line], None, None
+        elif headers is None:
+            yield line
+        elif body is None:
+            if line[:1] in (' ', '\t') and subject_index == len(headers) - 1:
+                headers[subject_index].append(line)
+            elif line.startswith('Subject:'):
+                subject_index = len(headers)
+                headers.append([line])
+            elif len(line.strip()) > 0:
+                headers.append(line)
+            else:
+                headers.append(line)
+                body = []
+        elif line.rstrip('\r\n') == '---' or line.startswith('diff --git '):
+            yield from reflow_patch(headers, subject_index, body, formatter)
+            headers, subject_index, body = None, None, None
+            yield line
+        else:
+            body.append(line)
+
+    if headers is not None:
+        yield from reflow_patch(headers, subject_index, body or [], formatter)
+
+
+def open_text_stream(binary):
+    """
+    Wrap binary standard stream as UTF-8 text, passing undecodable bytes and line endings through unchanged.
+    """
+    return io.TextIOWrapper(binary, encoding='utf-8', errors='surrogateescape', newline='')
+
+
+def main(argv=None):
+    """
+    Reformat commit messages read from standard input and write them to standard output.
+    """
+    parser = argparse.ArgumentParser(
+        prog='reflow',
+        description=(
+            'Reformat commit messages from standard input according to the git 50/72 rule. Without -z or --mbox, '
+            'standard input holds a single message.'
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '-z',
+        '--null',
+        action='store_true',
+        help='read and write NUL-separated messages, as printed by git log --format=%%B -z',
+    )
+    mode.add_argument('--mbox', action='store_true', help='read and write a git format-patch mbox stream')
+    parser.add_argument('--summary-limit', type=int, default=DEFAULT_LIMITS.summary)
+    parser.add_argument('--body-wrap-limit', type=int, default=DEFAULT_LIMITS.body_wrap)
+    args = parser.parse_args(argv)
+
+    formatter = MessageFormatter(Limits(summary=args.summary_limit, body_wrap=args.body_wrap_limit))
+    stdin = open_text_stream(sys.stdin.buffer)
+    stdout = open_text_stream(sys.stdout.buffer)
+
+    if args.mbox:
+        output = reflow_mbox(stdin, formatter)
+    elif args.null:
+        output = reflow_records(read_records(stdin, keep_separator=True), formatter, separator='\0')
+    else:
+        output = reflow_lines(read_records(stdin, separator='\n', keep_separator=True), formatter)
+
+    for chunk in output:
+        stdout.write(chunk)
+
+    stdout.flush()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,235 @@
+import os
+import csv
+import sys
+import json
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from formatting import DEFAULT_LIMITS, Limits, check_message
+
+
+BATCH_SIZE = 1000
+CSV_FIELDS = ['repo', 'commit', 'rule', 'line', 'length']
+
+
+def git(repo, *args, stdin=None):
+    """
+    Run git command in repository and return its output.
+    """
+    result = subprocess.run(
+        ['git', '-C', repo, *args],
+        input=stdin,
+        capture_output=True,
+        check=True,
+        encoding='utf-8',
+        errors='replace',
+    )
+
+    return result.stdout
+
+
+def git_error(error):
+    """
+    Describe why a git command failed.
+    """
+    if isinstance(error, subprocess.CalledProcessError):
+        return error.stderr.strip()
+
+    return f'git could not be run: {error}'
+
+
+def list_commits(repo, revision_range, last_scanned=None):
+    """
+    List commits in range, newest first, excluding commits reachable from the last scanned commit.
+
+    If the last scanned commit no longer exists, as after a rewritten history was garbage collected, every commit in
+    range is listed instead.
+
+    Returns
+    -------
+    tuple
+        Repository, listed commits, error message or None, and whether the last scanned commit was ignored.
+    """
+    try:
+        if last_scanned is not None:
+            try:
+                return repo, git(repo, 'rev-list', revision_range, f'^{last_scanned}').split(), None, False
+            except subprocess.CalledProcessError:
+                pass
+
+        return repo, git(repo, 'rev-list', revision_range).split(), None, last_scanned is not None
+    except (subprocess.CalledProcessError, OSError) as e:
+        return repo, [], git_error(e), False
+
+
+def scan_batch(repo, commits, limits):
+    """
+    Read messages of a batch of commits through a single git process and check them.
+
+    Returns
+    -------
+    tuple
+        Repository, number of checked commits, violations, and error message or None.
+    """
+    try:
+        output = git(
+            repo, 'log', '--no-walk=unsorted', '--stdin', '-z', '--format=%H%n%B', stdin='\n'.join(commits) + '\n'
+        )
+    except (subprocess.CalledProcessError, OSError) as e:
+        return repo, 0, [], git_error(e)
+
+    violations = []
+    for record in output.split('\0'):
+        commit, _, message = record.partition('\n')
+        if len(commit) == 0:
+            continue
+
+        for violation in check_message(message, limits):
+            violations.append({'repo': repo, 'commit': commit, **violation._asdict()})
+
+    return repo, len(commits), violations, None
+
+
+def batches(commits, batch_size):
+    """
+    Split list of commits into batches.
+    """
+    for i in range(0, len(commits), batch_size):
+        yield commits[i:i + batch_size]
+
+
+def load_state(path):
+    """
+    Load last scanned commit per repository. A missing, truncated or corrupt state file is treated as empty, so every
+    repository is scanned again.
+    """
+    if path is None:
+        return {}
+
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(path, state):
+    """
+    Save last scanned commit per repository.
+    """
+    if path is None:
+        return
+
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+
+
+def scan(repos, revision_range='HEAD', limits=DEFAULT_LIMITS, state=None, jobs=None, batch_size=BATCH_SIZE):
+    """
+    Scan commits of several repositories in parallel.
+
+    Commits are listed per repository and split into batches, and every batch is checked in a separate worker
+    process. Repositories that cannot be listed or read are reported with an ``error`` instead of aborting the scan.
+    When ``state`` maps a repository to the newest commit of a previous scan, only newer commits are scanned, and
+    ``state`` is updated in place with the newest commit of this scan. Repositories with errors keep their previous
+    state, so their commits are scanned again next time.
+    """
+    state = {} if state is None else state
+    previous = dict(state)
+    repos = list(dict.fromkeys(os.path.realpath(repo) for repo in repos))
+    report = {
+        'repositories': {repo: {'commits': 0, 'violations': 0} for repo in repos},
+        'violations': [],
+    }
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        listings = [executor.submit(list_commits, repo, revision_range, state.get(repo)) for repo in repos]
+
+        scans = []
+        for future in as_completed(listings):
+            repo, commits, error, reset = future.result()
+            if error is not None:
+                report['repositories'][repo]['error'] = error
+
+            if reset:
+                state.pop(repo, None)
+
+            if len(commits) > 0:
+                state[repo] = commits[0]
+
+            for batch in batches(commits, batch_size):
+                scans.append(executor.submit(scan_batch, repo, batch, limits))
+
+        for future in as_completed(scans):
+            repo, count, violations, error = future.result()
+            if error is not None:
+                report['repositories'][repo]['error'] = error
+                if repo in previous:
+                    state[repo] = previous[repo]
+                else:
+                    state.pop(repo, None)
+
+            report['repositories'][repo]['commits'] += count
+            report['repositories'][repo]['violations'] += len(violations)
+            report['violations'].extend(violations)
+
+    report['violations'].sort(key=lambda violation: (violation['repo'], violation['commit'], violation['line']))
+
+    return report
+
+
+def write_report(report, f, output_format):
+    """
+    Write scan report as JSON or CSV.
+    """
+    if output_format == 'csv':
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(report['violations'])
+    else:
+        json.dump(report, f, indent=4)
+        f.write('\n')
+
+
+def main(argv=None):
+    """
+    Scan repositories for commit messages that break the git 50/72 rule.
+    """
+    parser = argparse.ArgumentParser(
+        prog='scanner',
+        description='Report commits that break the git 50/72 rule across several repositories.',
+    )
+    parser.add_argument('repos', nargs='+', help='paths to git repositories')
+    parser.add_argument('--range', default='HEAD', dest='revision_range', help='git revision range to scan')
+    parser.add_argument('--state', help='file that records the last scanned commit per repository')
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', dest='output_format')
+    parser.add_argument('--output', help='report file, defaults to standard output')
+    parser.add_argument('--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--summary-limit', type=int, default=DEFAULT_LIMITS.summary)
+    parser.add_argument('--body-wrap-limit', type=int, default=DEFAULT_LIMITS.body_wrap)
+    args = parser.parse_args(argv)
+
+    state = load_state(args.state)
+    report = scan(
+        args.repos,
+        revision_range=args.revision_range,
+        limits=Limits(summary=args.summary_limit, body_wrap=args.body_wrap_limit),
+        state=state,
+        jobs=args.jobs,
+        batch_size=args.batch_size,
+    )
+    save_state(args.state, state)
+
+    if args.output is None:
+        write_report(report, sys.stdout, args.output_format)
+    else:
+        with open(args.output, 'w', newline='') as f:
+            write_report(report, f, args.output_format)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
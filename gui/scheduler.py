@@ -0,0 +1,45 @@
+from PyQt6.QtCore import QObject, QTimer
+
+
+class RenderScheduler(QObject):
+    """
+    Coalesce bursts of render requests into a single render.
+
+    The first request after a render starts a single-shot timer and every further request until it fires is merged
+    into the same render, so a render happens at most ``latency`` milliseconds after the first unrendered change. A
+    latency of 0 renders once the event loop is idle.
+    """
+
+    def __init__(self, render, latency=16, parent=None):
+        super().__init__(parent)
+        self.render = render
+        self.pending = False
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.set_latency(latency)
+
+    def set_latency(self, latency):
+        """
+        Set latency budget in milliseconds.
+        """
+        self.latency = max(0, int(latency))
+        self.timer.setInterval(self.latency)
+
+    def schedule(self):
+        """
+        Request a render within the latency budget.
+        """
+        self.pending = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """
+        Run pending render synchronously.
+        """
+        self.timer.stop()
+        if self.pending:
+            self.pending = False
+            self.render()
@@ -0,0 +1,58 @@
+import json
+
+from fileutils import atomic_write
+from tracing import hot_path_trace
+
+
+class SettingsStore:
+    """
+    In-memory settings with dirty tracking, written back to a JSON file only when flushed.
+    """
+
+    def __init__(self, path, defaults=None):
+        self.path = path
+        self.values = dict(defaults or {})
+        self.dirty = set()
+        self.values.update(self.read())
+
+    def read(self):
+        """
+        Read settings currently stored on disk.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def get(self, key, default=None):
+        """
+        Get setting value.
+        """
+        return self.values.get(key, default)
+
+    def update(self, **values):
+        """
+        Set setting values, marking changed settings as dirty.
+        """
+        for key, value in values.items():
+            if self.values.get(key) != value:
+                self.values[key] = value
+                self.dirty.add(key)
+
+    @hot_path_trace.traced
+    def flush(self):
+        """
+        Write dirty settings to disk atomically.
+
+        Settings are merged into the file's current content, so settings written by other instances are kept.
+        """
+        if len(self.dirty) == 0:
+            return False
+
+        settings = self.read()
+        settings.update({key: self.values[key] for key in self.dirty})
+        atomic_write(self.path, json.dumps(settings, indent=4, sort_keys=True))
+        self.dirty.clear()
+
+        return True
@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import mmap
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from fileutils import atomic_write
+
+
+DICTIONARY_SOURCES = [
+    '/usr/share/dict/words',
+    '/usr/share/hunspell/en_US.dic',
+    '/usr/share/myspell/en_US.dic',
+]
+CACHE_SIZE = 4096
+
+MISSPELLED_WORD = 'misspelled-word'
+
+# runs of letters, joined by apostrophes as in "don't"
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+# URLs, paths and inline code, which are not prose
+SKIP_PATTERN = re.compile(r'`[^`]*`?|[a-zA-Z][a-zA-Z0-9+.-]*://\S+|\S*[/\\]\S*')
+
+
+def read_words(path):
+    """
+    Read words from a word list with one word per line, or from a hunspell dictionary.
+
+    The first line of a hunspell dictionary is its number of words, and words are followed by their affix flags.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            word = line.split('/', 1)[0].strip()
+            if len(word) > 0 and not word.isdigit():
+                yield word
+
+
+def build_word_list(words, path):
+    """
+    Write words as a sorted list of unique lowercase words, one per line, which ``WordList`` searches in place.
+
+    Words are sorted by code point, which is the order of their UTF-8 encoded bytes.
+    """
+    words = sorted({word.lower() for word in words})
+    atomic_write(path, ''.join(f'{word}\n' for word in words), encoding='utf-8')
+
+    return len(words)
+
+
+class WordList:
+    """
+    Sorted word list file, memory-mapped and searched by bisecting its bytes.
+
+    Opening the list takes the same time however many words it has, and its pages are only read from disk as searches
+    touch them.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size > 0 else None
+
+    def __contains__(self, word):
+        if self.map is None:
+            return False
+
+        key = word.lower().encode('utf-8')
+        lo = 0
+        hi = self.size
+        # invariant: the line starting at lo is the first line that may be greater than or equal to key
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.map.rfind(b'\n', lo, mid) + 1 or lo
+            end = self.map.find(b'\n', start)
+            if end == -1:
+                end = self.size
+
+            if self.map[start:end] < key:
+                lo = end + 1
+            else:
+                hi = start
+
+        end = self.map.find(b'\n', lo)
+
+        return self.map[lo:end if end != -1 else self.size] == key
+
+    def close(self):
+        """
+        Unmap and close the word list.
+        """
+        if self.map is not None:
+            self.map.close()
+
+        self.file.close()
+
+
+def misspelled_spans(text, words):
+    """
+    Find words of prose text that are not in the word list.
+
+    Words with capitals after their first letter, such as acronyms and identifiers, are not checked, nor are URLs,
+    paths and inline code.
+
+    Returns
+    -------
+    list
+        Tuples of start index and length of every misspelled word.
+    """
+    skipped = [match.span() for match in SKIP_PATTERN.finditer(text)] if '`' in text or '/' in text else []
+
+    spans = []
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group()
+        if len(word) < 2 or not word[1:].islower():
+            continue
+
+        if any(start <= match.start() < end for start, end in skipped):
+            continue
+
+        word = word.lower()
+        if word in words:
+            continue
+
+        stem = word[:-2] if word[-2:] in ("'s", '\u2019s') else None
+        if stem is not None and stem in words:
+            continue
+
+        spans.append((match.start(), match.end() - match.start()))
+
+    return spans
+
+
+class SpellChecker(QObject):
+    """
+    Spell checker of paragraphs, checking them on a worker thread.
+
+    ``spans`` returns the misspellings of a paragraph if it was checked before, and otherwise queues it to be checked,
+    reporting the result through ``checked``. The word list is opened on the worker thread before the first check,
+    compiling it from the first available dictionary source if it does not exist. Without a dictionary, nothing is
+    reported as misspelled.
+    """
+
+    checked = pyqtSignal(str, object)
+
+    def __init__(self, path, sources=DICTIONARY_SOURCES, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.sources = sources
+        self.words = None
+        self.loaded = False
+        self.closing = False
+        self.executor = None
+        self.cache = OrderedDict()
+        self.pending = set()
+        self.checked.connect(self.on_checked)
+
+    def load(self):
+        """
+        Open word list, compiling it first if needed. Runs on the worker thread.
+        """
+        self.loaded = True
+        try:
+            if not os.path.exists(self.path):
+                source = next((source for source in self.sources if os.path.exists(source)), None)
+                if source is None:
+                    return
+
+                build_word_list(read_words(source), self.path)
+
+            self.words = WordList(self.path)
+        except OSError:
+            self.words = None
+
+    def spans(self, text):
+        """
+        Misspellings of text, or None if it is queued to be checked.
+        """
+        spans = self.cache.get(text)
+        if spans is not None:
+            self.cache.move_to_end(text)
+            return spans
+
+        if text not in self.pending:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1)
+
+            self.pending.add(text)
+            self.executor.submit(self.check, text)
+
+        return None
+
+    def check(self, text):
+        """
+        Check text. Runs on the worker thread.
+        """
+        if self.closing:
+            return
+
+        if not self.loaded:
+            self.load()
+
+        spans = [] if self.words is None else misspelled_spans(text, self.words)
+        self.checked.emit(text, spans)
+
+    def on_checked(self, text, spans):
+        """
+        Cache checked text.
+        """
+        self.pending.discard(text)
+        self.cache[text] = spans
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def shutdown(self):
+        """
+        Stop checking and close word list.
+        """
+        self.closing = True
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+        if self.words is not None:
+            self.words.close()
+            self.words = None
+
+
+def main(argv=None):
+    """
+    Compile word lists into the dictionary used by the spell checker.
+    """
+    parser = argparse.ArgumentParser(
+        prog='spelling',
+        description='Compile word lists or hunspell dictionaries into a sorted word list for spell checking.',
+    )
+    parser.add_argument('sources', nargs='+', help='word lists with one word per line, or hunspell .dic files')
+    parser.add_argument('--output', required=True, help='word list file to write')
+    args = parser.parse_args(argv)
+
+    count = build_word_list((word for source in args.sources for word in read_words(source)), args.output)
+    sys.stdout.write(f'{count} words written to {args.output}\n')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
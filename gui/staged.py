@@ -0,0 +1,268 @@
+import os
+import json
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+
+from export import find_repository, resolve_head
+from fileutils import atomic_write, cache_path
+
+
+MAX_LISTED_FILES = 20
+DIFF_ARGS = [
+    '-c', 'core.quotePath=false',
+    'diff', '--cached', '--no-renames', '--no-color', '--no-ext-diff', '--raw', '--numstat',
+]
+
+StagedFile = namedtuple('StagedFile', ['status', 'path', 'added', 'deleted'])
+StagedChanges = namedtuple('StagedChanges', ['files', 'added', 'deleted', 'binary', 'scope', 'listed'])
+
+
+class StagedChangesParser:
+    """
+    Incremental parser of ``git diff --raw --numstat`` output.
+
+    git prints the raw line of every file, holding its status, before the numstat lines, holding its line counts, in
+    the same order. Only totals, the directory shared by every file and the first files are kept, so memory stays
+    bounded however many files are staged.
+    """
+
+    def __init__(self, max_listed=MAX_LISTED_FILES):
+        self.max_listed = max_listed
+        self.statuses = []
+        self.listed = []
+        self.files = 0
+        self.added = 0
+        self.deleted = 0
+        self.binary = 0
+        self.common = None
+
+    def feed(self, line):
+        """
+        Parse a single line of output.
+        """
+        line = line.rstrip('\n')
+        if line.startswith(':'):
+            if len(self.statuses) < self.max_listed:
+                self.statuses.append(line.split('\t', 1)[0].split(' ')[-1][:1])
+
+            return
+
+        fields = line.split('\t', 2)
+        if len(fields) != 3:
+            return
+
+        added, deleted, path = fields
+        if added == '-':
+            added, deleted = None, None
+            self.binary += 1
+        else:
+            added, deleted = int(added), int(deleted)
+            self.added += added
+            self.deleted += deleted
+
+        if self.files < self.max_listed:
+            status = self.statuses[self.files] if self.files < len(self.statuses) else 'M'
+            self.listed.append(StagedFile(status, path, added, deleted))
+
+        self.files += 1
+
+        directories = path.split('/')[:-1]
+        if self.common is None:
+            self.common = directories
+        else:
+            n = 0
+            while n < min(len(self.common), len(directories)) and self.common[n] == directories[n]:
+                n += 1
+
+            del self.common[n:]
+
+    def result(self):
+        """
+        Staged changes parsed so far.
+        """
+        scope = self.common[-1] if self.common else None
+
+        return StagedChanges(self.files, self.added, self.deleted, self.binary, scope, self.listed)
+
+
+def parse_staged_changes(lines):
+    """
+    Parse ``git diff --raw --numstat`` output lines.
+    """
+    parser = StagedChangesParser()
+    for line in lines:
+        parser.feed(line)
+
+    return parser.result()
+
+
+def format_staged_changes(changes):
+    """
+    Format staged changes as a body paragraph followed by a list of the first files.
+
+    Returns
+    -------
+    str
+        Summary of staged changes, or an empty string if nothing is staged.
+    """
+    if changes.files == 0:
+        return ''
+
+    files = 'file' if changes.files == 1 else 'files'
+    lines = [f'Changes {changes.files} {files} (+{changes.added} -{changes.deleted}).', '']
+    for staged_file in changes.listed:
+        stats = 'binary' if staged_file.added is None else f'+{staged_file.added} -{staged_file.deleted}'
+        lines.append(f'- {staged_file.status} {staged_file.path} ({stats})')
+
+    if changes.files > len(changes.listed):
+        lines.append(f'- and {changes.files - len(changes.listed)} more')
+
+    return '\n'.join(lines)
+
+
+def index_signature(git_dir):
+    """
+    Modification time and size of the index file of a repository and its checked out commit, or None if it has no
+    index.
+
+    The staged changes are the differences between the index and the checked out commit, so commands such as
+    ``git reset --soft`` change them without touching the index.
+    """
+    try:
+        stat = os.stat(os.path.join(git_dir, 'index'))
+    except OSError:
+        return None
+
+    return [stat.st_mtime_ns, stat.st_size, resolve_head(git_dir)]
+
+
+def read_cache(path, signature):
+    """
+    Read cached staged changes, if they were analyzed for the index with signature.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        if data['index'] != signature:
+            return None
+
+        changes = data['changes']
+        listed = [StagedFile(*staged_file) for staged_file in changes.pop('listed')]
+
+        return StagedChanges(listed=listed, **changes)
+    except (IOError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_cache(path, signature, changes):
+    """
+    Write staged changes analyzed for the index with signature.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps({'index': signature, 'changes': changes._asdict()}, separators=(',', ':')))
+
+
+class StagedAnalyzer(QObject):
+    """
+    Analyze changes staged in the repository, to suggest a scope and summarize files for the body.
+
+    The diff runs as an asynchronous git process whose output is parsed line by line as it arrives. Results are cached
+    by the modification time and size of the index file, which git rewrites whenever it stages changes, and by the
+    checked out commit, so analyzing an unchanged index against the same commit only reads the cache.
+    """
+
+    analyzed = pyqtSignal(object)
+    analysis_failed = pyqtSignal(str)
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.process = None
+        self.parser = None
+        self.cache_file = None
+        self.signature = None
+
+    def analyze(self, directory):
+        """
+        Analyze changes staged in the repository containing directory, reporting them through ``analyzed``.
+        """
+        if self.process is not None:
+            return
+
+        repository = find_repository(directory)
+        if repository is None:
+            self.analysis_failed.emit(f'{os.path.abspath(directory)} is not in a git repository')
+            return
+
+        self.cache_file = cache_path(self.cache_dir, repository.git_dir)
+        self.signature = index_signature(repository.git_dir)
+        if self.signature is None:
+            self.analyzed.emit(parse_staged_changes([]))
+            return
+
+        changes = read_cache(self.cache_file, self.signature)
+        if changes is not None:
+            self.analyzed.emit(changes)
+            return
+
+        self.parser = StagedChangesParser()
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(repository.work_tree)
+        self.process.setStandardErrorFile(QProcess.nullDevice())
+        self.process.readyReadStandardOutput.connect(self.read_output)
+        self.process.finished.connect(self.on_finished)
+        self.process.errorOccurred.connect(self.on_error)
+        self.process.start('git', DIFF_ARGS)
+
+    def read_output(self):
+        """
+        Parse complete lines of output read so far.
+        """
+        while self.process.canReadLine():
+            self.parser.feed(bytes(self.process.readLine()).decode('utf-8', errors='replace'))
+
+    def on_finished(self, exit_code, exit_status):
+        """
+        Report and cache analyzed changes.
+        """
+        self.read_output()
+        rest = bytes(self.process.readAll()).decode('utf-8', errors='replace')
+        if len(rest) > 0:
+            self.parser.feed(rest)
+
+        self.process = None
+        if exit_status != QProcess.ExitStatus.NormalExit or exit_code != 0:
+            self.analysis_failed.emit(f'git diff exited with code {exit_code}')
+            return
+
+        changes = self.parser.result()
+        try:
+            write_cache(self.cache_file, self.signature, changes)
+        except OSError:
+            pass
+
+        self.analyzed.emit(changes)
+
+    def on_error(self, error):
+        """
+        Report diff that could not be started.
+        """
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+
+        message = self.process.errorString()
+        self.process = None
+        self.analysis_failed.emit(message)
+
+    def shutdown(self):
+        """
+        Stop running analysis.
+        """
+        if self.process is not None:
+            process = self.process
+            self.process = None
+            process.finished.disconnect(self.on_finished)
+            process.kill()
+            process.waitForFinished()
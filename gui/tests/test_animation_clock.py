@@ -0,0 +1,113 @@
+import sys
+from unittest import TestCase
+from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+from PyQt6.QtCore import QAbstractAnimation, QEasingCurve
+from PyQt6.QtTest import QTest
+from MangoUI import Button, Slider
+from MangoUI.utils.AnimationClock import AnimationClock, ClockAnimation
+from MangoUI.utils.ColorFrames import colorFrames
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestAnimationClock(TestCase):
+    def setUp(self):
+        self.clock = AnimationClock(frameRate=50)
+        self.widget = QWidget()
+        self.widget.show()
+        self.values = []
+        self.animation = ClockAnimation(
+            self.widget,
+            self.values.append,
+            duration=100,
+            easingCurve=QEasingCurve.Type.Linear,
+            clock=self.clock,
+        )
+
+    def test_timer_runs_while_animating(self):
+        self.assertEqual(self.clock.timer.interval(), 20)
+        self.assertFalse(self.clock.timer.isActive())
+
+        self.animation.start()
+        self.assertTrue(self.clock.timer.isActive())
+
+        self.animation.advance(self.animation.lastTick + 40)
+        self.animation.advance(self.animation.lastTick + 80)
+
+        self.assertEqual(self.values, [0.4, 1.0])
+        self.assertFalse(self.animation.running)
+        self.assertFalse(self.clock.timer.isActive())
+
+    def test_reverse_while_running(self):
+        self.animation.start()
+        self.animation.advance(self.animation.lastTick + 60)
+        self.animation.setDirection(QAbstractAnimation.Direction.Backward)
+        self.animation.start()
+        self.animation.advance(self.animation.lastTick + 20)
+        self.animation.advance(self.animation.lastTick + 50)
+
+        self.assertEqual(self.values, [0.6, 0.4, 0.0])
+        self.assertFalse(self.clock.timer.isActive())
+
+    def test_hidden_target_skips_to_end(self):
+        self.widget.hide()
+        self.animation.start()
+        self.clock.tick()
+
+        self.assertEqual(self.values, [1.0])
+        self.assertFalse(self.clock.timer.isActive())
+
+    def test_frames(self):
+        animation = ClockAnimation(self.widget, self.values.append, duration=100, frames='abc', clock=self.clock)
+        animation.start()
+        for elapsed in (10, 10, 30, 20, 30):
+            animation.advance(animation.lastTick + elapsed)
+
+        self.assertEqual(self.values, ['a', 'b', 'c'])
+
+    def test_shared_instance(self):
+        self.assertIs(AnimationClock.instance(), AnimationClock.instance())
+
+
+class TestColorFrames(TestCase):
+    def test_color_frames(self):
+        black = (0, 0, 0, 255)
+        orange = (200, 100, 0, 255)
+
+        self.assertEqual(colorFrames(((black, orange), (orange, black)), QEasingCurve.Type.Linear, 100, 20), (
+            (black, orange),
+            ((100, 50, 0, 255), (100, 50, 0, 255)),
+            (orange, black),
+        ))
+
+    def test_buttons_share_frames(self):
+        buttons = [Button(primaryColor='#102030', secondaryColor=(1, 2, 3)) for _ in range(2)]
+
+        self.assertIs(buttons[0].colorAnimation.frames, buttons[1].colorAnimation.frames)
+
+
+class TestAnimatedWidgets(TestCase):
+    def test_button_hover(self):
+        button = Button(primaryColor=(0, 0, 0), secondaryColor=(200, 100, 0), animationDuration=10)
+        button.show()
+        button.colorAnimation.start()
+        QTest.qWait(100)
+
+        self.assertEqual((button.textColor, button.backgroundColor), ((200, 100, 0, 255), (0, 0, 0, 255)))
+        self.assertNotIn(button.colorAnimation, AnimationClock.instance().animations)
+
+    def test_slider(self):
+        slider = Slider(animationDuration=10)
+        slider.resize(100, 100)
+        for text in ('first', 'second'):
+            slider.addWidget(QLabel(text))
+
+        slider.show()
+        slider.slideNext()
+        self.assertTrue(slider.active)
+        QTest.qWait(100)
+
+        self.assertFalse(slider.active)
+        self.assertEqual(slider.currentIndex(), 1)
+        self.assertEqual(slider.widget(1).pos(), slider.widget(0).pos())
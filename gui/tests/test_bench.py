@@ -0,0 +1,11 @@
+from unittest import TestCase
+from bench import compare_results
+
+
+class TestBench(TestCase):
+    def test_compare_results(self):
+        baseline = {'benchmarks': {'fast': {'median': 1.0}, 'slow': {'median': 1.0}, 'removed': {'median': 1.0}}}
+        current = {'benchmarks': {'fast': {'median': 1.05}, 'slow': {'median': 1.5}, 'added': {'median': 1.0}}}
+        rows = compare_results(baseline, current, threshold=0.1)
+
+        self.assertEqual([(name, regressed) for name, _, _, _, regressed in rows], [('fast', False), ('slow', True)])
@@ -0,0 +1,81 @@
+import sys
+from unittest import TestCase, mock
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtTest import QSignalSpy
+from clipboard import Clipboard, LatencyStats
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestClipboard(TestCase):
+    def setUp(self):
+        self.clipboard = Clipboard()
+        self.addCleanup(self.clipboard.shutdown)
+
+    def test_copy_qt(self):
+        spy = QSignalSpy(self.clipboard.copied)
+        self.clipboard.copy('Summary')
+
+        self.assertEqual(self.clipboard.backend, 'qt')
+        self.assertEqual(QApplication.clipboard().text(), 'Summary')
+        self.assertEqual(spy[0][0], 'qt')
+        self.assertEqual(self.clipboard.stats.summary()['count'], 1)
+
+    def test_shutdown_hands_off_qt_copy(self):
+        self.clipboard.copy('Summary')
+        with mock.patch('clipboard.QGuiApplication.platformName', return_value='xcb'), \
+                mock.patch.object(QApplication.clipboard(), 'ownsClipboard', return_value=True), \
+                mock.patch('pyperclip.copy') as m:
+            self.clipboard.shutdown()
+
+        m.assert_called_once_with('Summary')
+
+    def test_shutdown_keeps_replaced_qt_copy(self):
+        self.clipboard.copy('Summary')
+        QApplication.clipboard().setText('Copied elsewhere')
+        with mock.patch('clipboard.QGuiApplication.platformName', return_value='xcb'), \
+                mock.patch.object(QApplication.clipboard(), 'ownsClipboard', return_value=True), \
+                mock.patch('pyperclip.copy') as m:
+            self.clipboard.shutdown()
+
+        m.assert_not_called()
+
+    def test_shutdown_without_served_clipboard(self):
+        self.clipboard.copy('Summary')
+        with mock.patch('clipboard.QGuiApplication.platformName', return_value='windows'), \
+                mock.patch('pyperclip.copy') as m:
+            self.clipboard.shutdown()
+
+        m.assert_not_called()
+
+    def test_copy_pyperclip(self):
+        spy = QSignalSpy(self.clipboard.copied)
+        with mock.patch('clipboard.QGuiApplication.instance', return_value=None), mock.patch('pyperclip.copy') as m:
+            self.clipboard.copy('Summary')
+            self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        m.assert_called_once_with('Summary')
+        self.assertEqual(spy[0][0], 'pyperclip')
+
+    def test_copy_pyperclip_failed(self):
+        import pyperclip
+
+        spy = QSignalSpy(self.clipboard.copy_failed)
+        error = pyperclip.PyperclipException('no clipboard mechanism')
+        with mock.patch('clipboard.QGuiApplication.instance', return_value=None), \
+                mock.patch('pyperclip.copy', side_effect=error):
+            self.clipboard.copy('Summary')
+            self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        self.assertEqual(spy[0], ['no clipboard mechanism'])
+        self.assertEqual(self.clipboard.stats.summary(), {'count': 0})
+
+
+class TestLatencyStats(TestCase):
+    def test_summary(self):
+        stats = LatencyStats(history=3)
+        for latency in [4, 1, 2, 3]:
+            stats.record(latency)
+
+        self.assertEqual(stats.summary(), {'count': 4, 'last': 3, 'median': 2, 'max': 3})
@@ -0,0 +1,119 @@
+from unittest import TestCase, skipIf
+from PyQt6.QtGui import QColor
+from MangoUI.utils.ColorOps import (
+    COLOR_CACHE_SIZE,
+    HEXstr_to_RGBAtuple,
+    HEXstrs_to_RGBAarray,
+    RGBAarray_to_HEXstrs,
+    RGBAarray_to_RGBAints,
+    RGBAints_to_RGBAarray,
+    RGBAstr_to_RGBAtuple,
+    cached_to_RGBAtuple,
+    interpolate_RGBAarray,
+    interpolate_RGBAtuple,
+    np,
+    to_RGBAtuple,
+)
+
+
+class TestColorOps(TestCase):
+    def test_to_RGBAtuple(self):
+        for color in (
+            'rgba(255, 51, 153, 128)',
+            ' rgba ( 255 , 51 , 153 , 128 ) ',
+            '#80FF3399',
+            '80 FF 33 99',
+            0x80FF3399,
+            (255, 51, 153, 128, 0),
+            QColor(255, 51, 153, 128),
+        ):
+            self.assertEqual(to_RGBAtuple(color), (255, 51, 153, 128))
+
+        self.assertEqual(to_RGBAtuple('rgb(255, 51, 153)'), (255, 51, 153, 255))
+        self.assertEqual(to_RGBAtuple('#FF3399'), (255, 51, 153, 255))
+        self.assertEqual(to_RGBAtuple((255, 51, 153)), (255, 51, 153, 255))
+
+    def test_to_RGBAtuple_invalid(self):
+        for color in ('rgba(1, 2)', '#FF33', 'red', -1, 2**32):
+            with self.assertRaises(ValueError):
+                to_RGBAtuple(color)
+
+        for color in (1.5, [1, 2, 3], None):
+            with self.assertRaises(TypeError):
+                to_RGBAtuple(color)
+
+        with self.assertRaises(ValueError):
+            RGBAstr_to_RGBAtuple('#FF3399')
+
+        with self.assertRaises(ValueError):
+            HEXstr_to_RGBAtuple('rgb(1, 2, 3)')
+
+    def test_to_RGBAtuple_cached(self):
+        cached_to_RGBAtuple.cache_clear()
+        for _ in range(3):
+            to_RGBAtuple('#FF3399')
+            to_RGBAtuple((1, 2, 3))
+
+        info = cached_to_RGBAtuple.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize), (2, 1, COLOR_CACHE_SIZE))
+
+        for i in range(COLOR_CACHE_SIZE + 1):
+            to_RGBAtuple(i)
+
+        self.assertEqual(cached_to_RGBAtuple.cache_info().currsize, COLOR_CACHE_SIZE)
+
+
+@skipIf(np is None, 'NumPy is not installed')
+class TestColorOpsArrays(TestCase):
+    def test_RGBAints(self):
+        ints = [0x80FF3399, 0xFF000000, 0x00010203]
+        array = RGBAints_to_RGBAarray(ints)
+
+        self.assertEqual(array.dtype, np.uint8)
+        self.assertEqual(array.tolist(), [[255, 51, 153, 128], [0, 0, 0, 255], [1, 2, 3, 0]])
+        self.assertEqual(RGBAarray_to_RGBAints(array).tolist(), ints)
+        self.assertEqual(RGBAarray_to_RGBAints([[1, 2, 3]]).tolist(), [0xFF010203])
+        self.assertEqual(RGBAints_to_RGBAarray(np.zeros((2, 3), dtype=np.uint32)).shape, (2, 3, 4))
+        for i in ints:
+            self.assertEqual(tuple(RGBAints_to_RGBAarray(i)), to_RGBAtuple(i))
+
+    def test_RGBAints_invalid(self):
+        with self.assertRaises(ValueError):
+            RGBAints_to_RGBAarray([-1])
+
+        with self.assertRaises(ValueError):
+            RGBAints_to_RGBAarray([2**32])
+
+        with self.assertRaises(TypeError):
+            RGBAints_to_RGBAarray([1.5])
+
+        with self.assertRaises(ValueError):
+            RGBAarray_to_RGBAints([[1, 2]])
+
+        with self.assertRaises(ValueError):
+            RGBAarray_to_RGBAints([[1, 2, 256]])
+
+    def test_HEXstrs(self):
+        strings = ['#FF3399', '80FF3399', '#abcdef']
+        array = HEXstrs_to_RGBAarray(strings)
+
+        self.assertEqual(array.tolist(), [[255, 51, 153, 255], [255, 51, 153, 128], [171, 205, 239, 255]])
+        self.assertEqual(RGBAarray_to_HEXstrs(array).tolist(), ['#FFFF3399', '#80FF3399', '#FFABCDEF'])
+        self.assertEqual(RGBAarray_to_HEXstrs([1, 2, 3, 4]), '#04010203')
+        for string in strings:
+            self.assertEqual(tuple(HEXstrs_to_RGBAarray(string)), to_RGBAtuple(string))
+
+    def test_HEXstrs_invalid(self):
+        for strings in (['#FF33'], ['#FF3399', '#GG3399'], ['#FF33\u0663\u0663'], ['#FF3399AABB']):
+            with self.assertRaises(ValueError):
+                HEXstrs_to_RGBAarray(strings)
+
+    def test_interpolate_RGBAarray(self):
+        progress = np.linspace(0, 1, 9)
+        gradient = interpolate_RGBAarray('#000000', (255, 128, 1, 0), progress)
+
+        self.assertEqual(gradient.shape, (9, 4))
+        self.assertEqual(
+            gradient.tolist(),
+            [list(interpolate_RGBAtuple((0, 0, 0, 255), (255, 128, 1, 0), p)) for p in progress],
+        )
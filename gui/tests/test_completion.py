@@ -0,0 +1,122 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from unittest import TestCase, mock, skipIf
+from PyQt6.QtWidgets import QApplication, QLineEdit
+from PyQt6.QtTest import QSignalSpy, QTest
+from completion import (
+    SummaryCompleter,
+    SummaryIndex,
+    count_prefixes,
+    load_index,
+    read_cache,
+    write_cache,
+)
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', repo, *args], capture_output=True, check=True)
+
+
+class TestSummaryIndex(TestCase):
+    def test_complete(self):
+        counts = count_prefixes([
+            'Fix race in watcher',
+            'Fix race in parser',
+            'Fix typo',
+            'fix typo',
+            'Bump version',
+        ])
+        index = SummaryIndex(counts)
+
+        self.assertEqual(index.complete('fi'), ['Fix', 'Fix race', 'Fix race in'])
+        self.assertEqual(index.complete('Fix r'), ['Fix race', 'Fix race in'])
+        self.assertEqual(index.complete('Fix race in'), [])
+        self.assertEqual(index.complete('Bump'), [])
+        self.assertEqual(index.complete('fix', limit=1), ['Fix race'])
+
+    def test_complete_precomputed(self):
+        summaries = [f'{verb} {noun} {i % 7}' for verb in ('Fix', 'Add', 'fix') for noun in 'abcdef' for i in range(20)]
+        counts = count_prefixes(summaries * 2)
+        with mock.patch('completion.MAX_SCANNED_RANGE', 4):
+            index = SummaryIndex(counts)
+
+        self.assertIn('fix', index.top)
+        self.assertIn('', index.top)
+        scanned = SummaryIndex(counts)
+        self.assertEqual(scanned.top, {})
+        for text in ('', 'f', 'fix', 'Fix ', 'fix a', 'fix a 3', 'add', 'z'):
+            self.assertEqual(index.complete(text), scanned.complete(text), text)
+            self.assertEqual(index.complete(text, limit=20), scanned.complete(text, limit=20), text)
+
+    def test_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'index', 'cache.json')
+        counts = count_prefixes(['Fix a', 'Fix b'])
+        write_cache(path, 'head', counts)
+
+        self.assertEqual(read_cache(path), ('head', counts))
+        self.assertEqual(read_cache(os.path.join(directory, 'missing.json')), (None, {}))
+
+
+@skipIf(shutil.which('git') is None, 'git is not installed')
+class TestLoadIndex(TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo)
+        self.cache_dir = os.path.join(self.repo, '.git', 'summary_index')
+
+        git(self.repo, 'init')
+        git(self.repo, 'config', 'user.name', 'gitmsg')
+        git(self.repo, 'config', 'user.email', 'gitmsg@example.com')
+        for summary in ['Fix race in watcher', 'Fix race in parser', 'Bump version']:
+            self.commit(summary)
+
+    def commit(self, summary):
+        git(self.repo, 'commit', '--allow-empty', '-m', summary)
+
+    def test_load_index(self):
+        index = load_index(self.repo, self.cache_dir)
+        self.assertEqual(index.complete('F'), ['Fix', 'Fix race', 'Fix race in'])
+
+        with mock.patch('completion.git_output_lines') as m:
+            self.assertEqual(load_index(self.repo, self.cache_dir).prefixes, index.prefixes)
+
+        m.assert_not_called()
+
+        self.commit('Bump dependencies')
+        with mock.patch('completion.git_output_lines', return_value=iter(['Bump dependencies'])) as m:
+            self.assertEqual(load_index(self.repo, self.cache_dir).complete('B'), ['Bump'])
+
+        self.assertIn('..', m.call_args.args[-1])
+
+    def test_load_index_outside_repository(self):
+        self.assertIsNone(load_index(tempfile.gettempdir(), self.cache_dir))
+
+    def test_completer(self):
+        line_edit = QLineEdit()
+        completer = SummaryCompleter(line_edit, self.repo, self.cache_dir)
+        self.addCleanup(completer.shutdown)
+
+        spy = QSignalSpy(completer.loaded)
+        QTest.keyClicks(line_edit, 'F')
+        self.assertTrue(len(spy) > 0 or spy.wait(5000))
+        QTest.keyClicks(line_edit, 'i')
+
+        self.assertEqual(completer.model.stringList(), ['Fix', 'Fix race', 'Fix race in'])
+
+    def test_completer_scope(self):
+        line_edit = QLineEdit()
+        completer = SummaryCompleter(line_edit, self.repo, self.cache_dir)
+        self.addCleanup(completer.shutdown)
+        completer.scope = 'gui'
+
+        QTest.keyClicks(line_edit, 'fix')
+
+        self.assertEqual(completer.model.stringList()[0], 'fix(gui): ')
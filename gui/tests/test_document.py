@@ -0,0 +1,104 @@
+import sys
+import random
+from unittest import TestCase
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextCursor, QTextDocument
+from document import BodyDocument
+from formatting import Limits, MessageFormatter
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestBodyDocument(TestCase):
+    def setUp(self):
+        self.formatter = MessageFormatter(Limits(summary=50, body_wrap=12))
+        self.document = QTextDocument()
+        self.body_document = BodyDocument(self.document, self.formatter.format_paragraph)
+
+    def expected_body(self):
+        return MessageFormatter(self.formatter.limits).format_body(self.document.toPlainText())
+
+    def test_update(self):
+        self.document.setPlainText('first paragraph\nsecond paragraph')
+        self.assertEqual(self.body_document.update(), (0, 1, 2))
+
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(len('first paragraph\nsecond'))
+        cursor.insertText(' edited')
+
+        self.assertEqual(self.body_document.update(), (1, 2, 2))
+        self.assertEqual('\n'.join(self.body_document.chunks), self.expected_body())
+        self.assertIsNone(self.body_document.update())
+
+    def test_update_reads_changed_blocks_only(self):
+        self.document.setPlainText('\n'.join(f'paragraph {i}' for i in range(100)))
+        self.body_document.update()
+
+        cursor = QTextCursor(self.document.findBlockByNumber(50))
+        cursor.insertText('edited ')
+
+        wrapper = self.formatter.wrapper
+        with mock_wrap(wrapper) as m:
+            self.assertEqual(self.body_document.update(), (50, 51, 51))
+
+        m.assert_called_once_with(text='edited paragraph 50')
+
+    def test_update_follows_fenced_code_blocks(self):
+        self.document.setPlainText('first\nwrapped paragraph\nwrapped paragraph\nlast')
+        self.body_document.update()
+
+        cursor = QTextCursor(self.document.findBlockByNumber(1))
+        cursor.insertText('```\n')
+
+        self.assertEqual(self.body_document.update(), (1, 4, 5))
+        self.assertEqual(self.body_document.chunks[2:], ['wrapped paragraph', 'wrapped paragraph', 'last'])
+
+        cursor = QTextCursor(self.document.findBlockByNumber(3))
+        cursor.insertText('```\n')
+
+        self.assertEqual(self.body_document.update(), (3, 5, 6))
+        self.assertEqual('\n'.join(self.body_document.chunks), self.expected_body())
+
+    def test_update_follows_trailers(self):
+        self.document.setPlainText('Fixes: wrapped paragraph\nlast paragraph')
+        self.assertEqual(self.body_document.update(), (0, 1, 2))
+        self.assertEqual(self.body_document.chunks[0], 'Fixes:\nwrapped\nparagraph')
+
+        cursor = QTextCursor(self.document.findBlockByNumber(1))
+        cursor.insertText('Cc: ')
+
+        self.assertEqual(self.body_document.update(), (0, 2, 2))
+        self.assertEqual(self.body_document.chunks, ['Fixes: wrapped paragraph', 'Cc: last paragraph'])
+
+        cursor.insertText('\n')
+
+        self.assertEqual(self.body_document.update(), (0, 2, 3))
+        self.assertEqual('\n'.join(self.body_document.chunks), self.expected_body())
+
+    def test_update_random_edits(self):
+        rng = random.Random(0)
+        pieces = [
+            'a', 'word ', '\n', '\n\n', 'longer words that wrap ', 'Fixes: ',
+            '\u2028', '\U0001F600', '\u00a0', '```', '- ',
+        ]
+        for _ in range(500):
+            cursor = QTextCursor(self.document)
+            length = self.document.characterCount() - 1
+            start = rng.randint(0, length)
+            cursor.setPosition(start)
+            cursor.setPosition(rng.randint(start, min(length, start + 10)), QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(''.join(rng.choice(pieces) for _ in range(rng.randint(0, 4))))
+
+            if rng.random() < 0.3:
+                self.body_document.update()
+                self.assertEqual('\n'.join(self.body_document.chunks), self.expected_body())
+
+        self.body_document.update()
+        self.assertEqual('\n'.join(self.body_document.chunks), self.expected_body())
+
+
+def mock_wrap(wrapper):
+    from unittest import mock
+
+    return mock.patch.object(wrapper, 'wrap', wraps=wrapper.wrap)
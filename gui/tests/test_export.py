@@ -0,0 +1,131 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from unittest import TestCase, mock, skipIf
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtTest import QSignalSpy
+from export import Exporter, Repository, find_repository, resolve_head
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def git(repo, *args):
+    return subprocess.run(['git', '-C', repo, *args], capture_output=True, check=True, text=True).stdout
+
+
+class TestFindRepository(TestCase):
+    def setUp(self):
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop('GIT_DIR', None)
+        os.environ.pop('GIT_WORK_TREE', None)
+
+    def test_find_repository(self):
+        repo = os.path.join(self.directory, 'repo')
+        os.makedirs(os.path.join(repo, '.git'))
+        os.makedirs(os.path.join(repo, 'a', 'b'))
+
+        expected = Repository(repo, os.path.join(repo, '.git'))
+        self.assertEqual(find_repository(repo), expected)
+        self.assertEqual(find_repository(os.path.join(repo, 'a', 'b')), expected)
+
+    def test_find_repository_worktree(self):
+        worktree = os.path.join(self.directory, 'worktree')
+        git_dir = os.path.join(self.directory, 'repo', '.git', 'worktrees', 'worktree')
+        os.makedirs(worktree)
+        os.makedirs(git_dir)
+        with open(os.path.join(worktree, '.git'), 'w') as f:
+            f.write('gitdir: ../repo/.git/worktrees/worktree\n')
+
+        self.assertEqual(find_repository(worktree), Repository(worktree, git_dir))
+
+    def test_find_repository_git_dir(self):
+        os.environ['GIT_DIR'] = os.path.join(self.directory, 'custom.git')
+
+        self.assertEqual(find_repository(self.directory).git_dir, os.environ['GIT_DIR'])
+
+    def test_find_repository_relative_git_dir(self):
+        os.environ['GIT_DIR'] = os.path.join('repo', 'custom.git')
+        os.environ['GIT_WORK_TREE'] = 'repo'
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(tempfile.gettempdir())
+
+        expected = Repository(os.path.join(self.directory, 'repo'), os.path.join(self.directory, 'repo', 'custom.git'))
+        self.assertEqual(find_repository(self.directory), expected)
+
+    @skipIf(shutil.which('git') is None, 'git is not installed')
+    def test_resolve_head(self):
+        commit = ['-c', 'user.name=gitmsg', '-c', 'user.email=gitmsg@example.com', 'commit', '--allow-empty', '-m']
+        repo = os.path.join(self.directory, 'repo')
+        git(self.directory, 'init', repo)
+        git_dir = os.path.join(repo, '.git')
+        self.assertIsNone(resolve_head(git_dir))
+
+        git(repo, *commit, 'a')
+        head = git(repo, 'rev-parse', 'HEAD').strip()
+        self.assertEqual(resolve_head(git_dir), head)
+
+        git(repo, 'pack-refs', '--all')
+        self.assertEqual(resolve_head(git_dir), head)
+
+        worktree = os.path.join(self.directory, 'worktree')
+        git(repo, 'worktree', 'add', '--detach', worktree)
+        git(worktree, *commit, 'b')
+        self.assertEqual(resolve_head(find_repository(worktree).git_dir), git(worktree, 'rev-parse', 'HEAD').strip())
+        self.assertEqual(resolve_head(git_dir), head)
+
+
+class TestExporter(TestCase):
+    def setUp(self):
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.exporter = Exporter('gitmsg.txt')
+        self.addCleanup(self.exporter.shutdown)
+
+    def test_export_outside_repository(self):
+        spy = QSignalSpy(self.exporter.exported)
+        self.exporter.export('Summary', self.directory)
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        path = os.path.join(self.directory, 'gitmsg.txt')
+        self.assertEqual(spy[0], [path])
+        with open(path, 'r') as f:
+            self.assertEqual(f.read(), 'Summary')
+
+    def test_export_failed(self):
+        spy = QSignalSpy(self.exporter.export_failed)
+        self.exporter.export('Summary', os.path.join(self.directory, 'missing'))
+
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+    def test_commit_outside_repository(self):
+        spy = QSignalSpy(self.exporter.export_failed)
+        self.exporter.export('Summary', self.directory, commit=True)
+
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+        self.assertIn('not in a git repository', spy[0][0])
+
+    @skipIf(shutil.which('git') is None, 'git is not installed')
+    def test_commit(self):
+        git(self.directory, 'init')
+        git(self.directory, 'config', 'user.name', 'gitmsg')
+        git(self.directory, 'config', 'user.email', 'gitmsg@example.com')
+        with open(os.path.join(self.directory, 'file'), 'w') as f:
+            f.write('content')
+
+        git(self.directory, 'add', 'file')
+
+        spy = QSignalSpy(self.exporter.committed)
+        self.exporter.export('Summary\n\nBody', self.directory, commit=True)
+
+        self.assertTrue(spy.wait(5000))
+        self.assertEqual(spy[0][0], 0)
+        self.assertEqual(git(self.directory, 'log', '--format=%B', '-1'), 'Summary\n\nBody\n\n')
@@ -0,0 +1,31 @@
+import os
+import stat
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+from fileutils import UMASK, atomic_write
+
+
+class TestAtomicWrite(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'COMMIT_EDITMSG')
+
+    def test_atomic_write(self):
+        atomic_write(self.path, 'first')
+        atomic_write(self.path, 'second')
+
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), 'second')
+
+        self.assertEqual(os.listdir(self.directory), ['COMMIT_EDITMSG'])
+
+    @skipIf(os.name == 'nt', 'file modes are not supported')
+    def test_atomic_write_permissions(self):
+        atomic_write(self.path, 'first')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o666 & ~UMASK)
+
+        os.chmod(self.path, 0o640)
+        atomic_write(self.path, 'second')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
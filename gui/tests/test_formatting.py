@@ -0,0 +1,138 @@
+import os
+import sys
+import subprocess
+from unittest import TestCase
+from formatting import (
+    DEFAULT_LIMITS,
+    Limits,
+    MessageFormatter,
+    Violation,
+    check_message,
+    format_message,
+    tokenize,
+)
+
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+IMPORT_TIME_BUDGET = 0.1
+
+
+class TestFormatting(TestCase):
+    def test_format_message(self):
+        summary = 'This is a summary'
+        body = [
+            'This is an incredibly detailed, unnecessarily long, pretentious,',
+            'obnoxious paragraph',
+        ]
+        expected_msg = summary + '\n\n' + '\n'.join(body)
+
+        self.assertEqual(format_message(summary, ' '.join(body)), expected_msg)
+
+    def test_format_message_limits(self):
+        msg = format_message('Summary that is too long', 'one two three four', Limits(summary=7, body_wrap=10))
+
+        self.assertEqual(msg, 'Summary\n\none two\nthree four')
+
+    def test_format_message_empty_summary(self):
+        self.assertEqual(format_message('', 'Body'), 'Body')
+        self.assertEqual(format_message('Summary', ''), 'Summary\n\n')
+
+    def test_formatter_keeps_only_current_paragraphs(self):
+        formatter = MessageFormatter(DEFAULT_LIMITS)
+        formatter.format_body('first\nsecond')
+        formatter.format_body('second\nthird')
+
+        self.assertEqual(set(formatter.cache), {('second', None, False), ('third', None, False)})
+
+    def test_tokenize(self):
+        lines = [
+            'Prose',
+            '- bullet',
+            '  2. nested',
+            '    code',
+            '```python',
+            '- not a bullet',
+            '```',
+            'Signed-off-by: Someone <someone@example.com>',
+            'Note: prose',
+        ]
+        tokens = list(tokenize(lines))
+
+        self.assertEqual(
+            [token.kind for token in tokens],
+            ['prose', 'bullet', 'bullet', 'code', 'fence', 'code', 'fence', 'trailer', 'prose'],
+        )
+        self.assertEqual([token.marker for token in tokens[1:3]], ['- ', '  2. '])
+        self.assertEqual([token.fence for token in tokens[3:7]], [None, '```', '```', None])
+
+    def test_format_message_structure(self):
+        url = 'https://example.com/' + 'long-path/' * 8
+        body = '\n'.join([
+            'A bullet list:',
+            '- first item that is long enough to wrap',
+            '    indented code that is long enough to wrap',
+            '```',
+            'fenced code that is long enough to wrap',
+            '```',
+            f'See {url} for more',
+            '',
+            'Co-authored-by: Someone With A Long Name <someone@example.com>',
+        ])
+        expected_body = '\n'.join([
+            'A bullet list:',
+            '- first item that is',
+            '  long enough to',
+            '  wrap',
+            '    indented code that is long enough to wrap',
+            '```',
+            'fenced code that is long enough to wrap',
+            '```',
+            'See',
+            url,
+            'for more',
+            '',
+            'Co-authored-by: Someone With A Long Name <someone@example.com>',
+        ])
+
+        self.assertEqual(format_message('', body, Limits(summary=50, body_wrap=20)), expected_body)
+
+    def test_format_message_trailers(self):
+        prose = 'Bug: when the window is resized the preview scrolls back to the top'
+        trailers = ['Signed-off-by: Someone With A Long Name <someone@example.com>', 'Cc: Someone Else']
+        expected_prose = 'Bug: when the window is resized the\npreview scrolls back to the top'
+        limits = Limits(summary=50, body_wrap=40)
+
+        self.assertEqual(
+            format_message('', '\n'.join([prose, '', *trailers]), limits),
+            '\n'.join([expected_prose, '', *trailers]),
+        )
+        self.assertEqual(
+            format_message('', '\n'.join([prose, 'and more prose']), limits),
+            '\n'.join([expected_prose, 'and more prose']),
+        )
+
+    def test_check_message(self):
+        message = 'Summary that is too long\nMissing blank line\n\nBody line that is too long\n'
+        violations = check_message(message, Limits(summary=10, body_wrap=20))
+        expected_violations = [
+            Violation('summary-too-long', 1, 24),
+            Violation('missing-blank-line', 2, 18),
+            Violation('body-line-too-long', 4, 26),
+        ]
+
+        self.assertEqual(violations, expected_violations)
+        self.assertEqual(check_message('Summary\n\nBody\n'), [])
+
+    def test_import_time(self):
+        code = (
+            'import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import formatting\n'
+            'print(time.perf_counter() - start)\n'
+            'print("PyQt6" in sys.modules)\n'
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=GUI_DIR, capture_output=True, text=True, check=True)
+        elapsed, qt_imported = result.stdout.split()
+
+        self.assertLess(float(elapsed), IMPORT_TIME_BUDGET)
+        self.assertEqual(qt_imported, 'False')
@@ -1,9 +1,15 @@
+import os
 import sys
+import shutil
+import tempfile
 from unittest import TestCase, mock
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtTest import QTest
+from PyQt6.QtTest import QTest, QSignalSpy
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from MangoUI import Button
 from gitmsg import GitmsgGUI
+from staged import parse_staged_changes
 
 
 app = QApplication(sys.argv)
@@ -11,7 +17,19 @@ app = QApplication(sys.argv)
 
 class TestGitmsgGUI(TestCase):
     def setUp(self):
-        self.window = GitmsgGUI()
+        self.window = self.make_window()
+
+    def make_window(self):
+        """
+        Create window that keeps its files in a temporary directory, and shut it down after the test.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        window = GitmsgGUI(directory)
+        window.spell_checker.sources = []
+        self.addCleanup(window.shutdown)
+
+        return window
 
     def test_msg(self):
         summary = 'This is a summary'
@@ -22,9 +40,57 @@ class TestGitmsgGUI(TestCase):
         expected_msg = summary + '\n\n' + '\n'.join(body)
         self.window.summary.setText(summary)
         self.window.body.setText(' '.join(body))
+        self.window.render_scheduler.flush()
 
         self.assertEqual(self.window.msg, expected_msg)
 
+    def test_summary_overflow_highlighted(self):
+        summary = 'This is a summary that is much longer than fifty characters'
+        self.window.summary.setText(summary)
+        self.window.render_scheduler.flush()
+
+        self.assertEqual(self.window.summary.text(), summary)
+        self.assertEqual(self.window.summary_highlighter.spans, [(50, len(summary) - 50, 'summary-too-long')])
+        self.assertEqual(self.window.msg, summary[:50] + '\n\n')
+        self.assertFalse(self.window.body_highlighter.summary_empty)
+
+    def test_msg_render_coalesces_changes(self):
+        wrapper = self.window.formatter.wrapper
+        with mock.patch.object(wrapper, 'wrap', wraps=wrapper.wrap) as m:
+            for text in ('T', 'Th', 'The', 'The summary'):
+                self.window.summary.setText(text)
+
+            self.window.body.setText('The')
+            self.window.body.setText('The body')
+
+            self.assertEqual(self.window.preview.toPlainText(), '')
+            m.assert_not_called()
+
+            QTest.qWait(self.window.render_latency + 50)
+
+        m.assert_called_once_with(text='The body')
+        self.assertEqual(self.window.msg, 'The summary\n\nThe body')
+        self.assertEqual(self.window.preview.toPlainText(), self.window.msg)
+
+    def test_settings_write_behind(self):
+        with mock.patch('settings.atomic_write') as m:
+            self.window.resize(640, 480)
+            self.window.move(10, 20)
+
+            m.assert_not_called()
+            QTest.qWait(self.window.settings_flush_delay + 50)
+
+        m.assert_called_once()
+        self.assertEqual(self.window.settings.get('_width'), 640)
+        self.assertEqual(self.window.settings.get('_height'), 480)
+        self.assertEqual(self.window.settings.dirty, set())
+
+    def test_resources_loaded_after_first_paint(self):
+        QTest.qWait(50)
+
+        self.assertTrue(self.window.first_paint_done)
+        self.assertFalse(self.window.logo_label.pixmap().isNull())
+
     def test_export_msg(self):
         summary = 'This is a summary'
         body = [
@@ -35,13 +101,19 @@ class TestGitmsgGUI(TestCase):
         self.window.summary.setText(summary)
         self.window.body.setText(' '.join(body))
 
-        m = mock.mock_open()
-        with mock.patch('builtins.open', m):
-            QTest.mouseClick(self.window.export_button, Qt.MouseButton.LeftButton)
+        repo = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repo)
+        os.mkdir(os.path.join(repo, '.git'))
+        self.window.export_directory = os.path.join(repo, 'subdirectory')
+
+        spy = QSignalSpy(self.window.exporter.exported)
+        QTest.mouseClick(self.window.export_button, Qt.MouseButton.LeftButton)
+        self.assertTrue(spy.wait(1000))
 
-        m.assert_called_once_with(self.window.export_file_name, 'w')
-        handle = m()
-        handle.write.assert_called_once_with(expected_msg)
+        path = os.path.join(repo, '.git', 'COMMIT_EDITMSG')
+        self.assertEqual(spy[0], [path])
+        with open(path, 'r') as f:
+            self.assertEqual(f.read(), expected_msg)
 
     def test_copy_msg(self):
         summary = 'This is a summary'
@@ -53,8 +125,96 @@ class TestGitmsgGUI(TestCase):
         self.window.summary.setText(summary)
         self.window.body.setText(' '.join(body))
 
-        m = mock.MagicMock()
-        with mock.patch('pyperclip.copy', m):
+        with mock.patch('pyperclip.copy') as m:
             QTest.mouseClick(self.window.copy_button, Qt.MouseButton.LeftButton)
 
-        m.assert_called_once_with(expected_msg)
+        m.assert_not_called()
+        self.assertEqual(QApplication.clipboard().text(), expected_msg)
+        self.assertEqual(self.window.clipboard.stats.count, 1)
+
+    def test_history(self):
+        self.window.summary.setText('Summary')
+        self.window.body.setPlainText('Body')
+        QTest.mouseClick(self.window.copy_button, Qt.MouseButton.LeftButton)
+        self.window.history.flush()
+
+        self.window.summary.setText('')
+        self.window.body.setPlainText('')
+        spy = QSignalSpy(self.window.history_panel.searched)
+        QTest.mouseClick(self.window.history_button, Qt.MouseButton.LeftButton)
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+        # the spy is called on the worker thread, before the results are shown on the GUI thread
+        app.processEvents()
+
+        results = self.window.history_panel.results
+        self.assertTrue(self.window.history_panel.isVisible())
+        self.assertEqual(results.count(), 1)
+
+        results.itemActivated.emit(results.item(0))
+        self.window.render_scheduler.flush()
+
+        self.assertEqual(self.window.msg, 'Summary\n\nBody')
+
+    def test_history_records_successful_exports_only(self):
+        self.window.summary.setText('Summary')
+        self.window.export_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.window.export_directory)
+
+        spy = QSignalSpy(self.window.exporter.export_failed)
+        with mock.patch('export.atomic_write', side_effect=OSError('No space left on device')):
+            QTest.mouseClick(self.window.export_button, Qt.MouseButton.LeftButton)
+            self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        spy = QSignalSpy(self.window.exporter.exported)
+        self.window.body.setPlainText('Body')
+        QTest.mouseClick(self.window.export_button, Qt.MouseButton.LeftButton)
+        self.assertTrue(spy.wait(1000))
+        self.window.history.flush()
+
+        entries = self.window.history.search('')
+        self.assertEqual([(entry.body, entry.source) for entry in entries], [('Body', 'export')])
+
+    def test_button_animation_repaints_without_style_sheet(self):
+        button = self.window.export_button
+        with mock.patch.object(button, 'setStyleSheet') as m:
+            button.animateText(QColor(1, 2, 3))
+            button.animateBackground(QColor(4, 5, 6))
+
+        m.assert_not_called()
+        self.assertEqual((button.textColor, button.backgroundColor), ((1, 2, 3, 255), (4, 5, 6, 255)))
+
+    def test_theme_applied_to_window(self):
+        self.assertIn('QPlainTextEdit[role="preview"]', self.window.styleSheet())
+        self.assertEqual(self.window.preview.property('role'), 'preview')
+        for widget in (self.window.summary, self.window.body, self.window.preview, self.window.statusBar()):
+            self.assertEqual(widget.styleSheet(), '')
+
+        self.assertEqual(self.window.export_button.primaryColor, (255, 51, 153, 255))
+
+    def test_buttons_created_with_theme_colors(self):
+        setup = Button.setupAnimationColors
+        with mock.patch.object(Button, 'setupAnimationColors', autospec=True, side_effect=setup) as m:
+            self.make_window()
+
+        self.assertEqual(m.call_count, 5)
+
+    def test_insert_staged_changes(self):
+        self.window.body.setPlainText('Body\n')
+        self.window.on_staged_analyzed(parse_staged_changes(['2\t1\tgui/gitmsg.py']))
+        QTest.mouseClick(self.window.staged_button, Qt.MouseButton.LeftButton)
+
+        self.assertEqual(self.window.body.toPlainText(), 'Body\n\nChanges 1 file (+2 -1).\n\n- M gui/gitmsg.py (+2 -1)')
+        self.assertEqual(self.window.summary.placeholderText(), 'type(gui): summary')
+
+    def test_msg_rewraps_changed_paragraphs_only(self):
+        paragraphs = [f'Paragraph number {i} of a long message' for i in range(10)]
+        self.window.body.setText('\n'.join(paragraphs))
+        self.window.render_scheduler.flush()
+
+        paragraphs[3] = 'This paragraph was edited'
+        with mock.patch.object(self.window.formatter.wrapper, 'wrap', wraps=self.window.formatter.wrapper.wrap) as m:
+            self.window.body.setText('\n'.join(paragraphs))
+            self.window.render_scheduler.flush()
+
+        m.assert_called_once_with(text='This paragraph was edited')
+        self.assertEqual(self.window.msg, '\n'.join(paragraphs))
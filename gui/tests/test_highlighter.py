@@ -0,0 +1,108 @@
+import sys
+from unittest import TestCase
+from PyQt6.QtWidgets import QApplication, QLineEdit
+from PyQt6.QtGui import QTextCursor, QTextDocument
+from formatting import (
+    Limits,
+    SUMMARY_TOO_LONG,
+    MISSING_BLANK_LINE,
+    TRAILING_WHITESPACE,
+    UNBREAKABLE_TOKEN,
+)
+from highlighter import (
+    SUMMARY_ROLE,
+    SEPARATOR_ROLE,
+    BODY_ROLE,
+    BodyHighlighter,
+    SummaryHighlighter,
+    utf16_span,
+    violation_spans,
+)
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+LIMITS = Limits(summary=10, body_wrap=20)
+
+
+class TestViolationSpans(TestCase):
+    def test_summary(self):
+        self.assertEqual(violation_spans('Short', SUMMARY_ROLE, LIMITS), [])
+        self.assertEqual(
+            violation_spans('Summary that is too long ', SUMMARY_ROLE, LIMITS),
+            [(10, 15, SUMMARY_TOO_LONG), (24, 1, TRAILING_WHITESPACE)],
+        )
+        self.assertEqual(violation_spans('\u6f22' * 6, SUMMARY_ROLE, LIMITS), [(5, 1, SUMMARY_TOO_LONG)])
+
+    def test_separator(self):
+        self.assertEqual(violation_spans('', SEPARATOR_ROLE, LIMITS), [])
+        self.assertEqual(violation_spans('  ', SEPARATOR_ROLE, LIMITS), [])
+        self.assertEqual(violation_spans('Body', SEPARATOR_ROLE, LIMITS), [(0, 4, MISSING_BLANK_LINE)])
+
+    def test_body(self):
+        url = 'https://example.com/a/long/path'
+        text = f'See {url} \t\u2028next line '
+
+        self.assertEqual(
+            violation_spans(text, BODY_ROLE, LIMITS),
+            [(4, len(url), UNBREAKABLE_TOKEN), (4 + len(url), 2, TRAILING_WHITESPACE), (47, 1, TRAILING_WHITESPACE)],
+        )
+        self.assertEqual(violation_spans('word ' * 20 + 'word', BODY_ROLE, LIMITS), [])
+
+    def test_utf16_span(self):
+        self.assertEqual(utf16_span('abc', 1, 2), (1, 2))
+        self.assertEqual(utf16_span('\U0001F600a\U0001F600b', 1, 2), (2, 3))
+
+
+class TestBodyHighlighter(TestCase):
+    def setUp(self):
+        self.document = QTextDocument()
+        self.document.documentLayout()
+        self.highlighter = BodyHighlighter(self.document, LIMITS)
+
+    def block_ranges(self):
+        ranges = []
+        block = self.document.begin()
+        while block.isValid():
+            ranges.append([(r.start, r.length) for r in block.layout().formats()])
+            block = block.next()
+
+        return ranges
+
+    def test_summary_empty(self):
+        self.document.setPlainText('Summary that is too long\nNot blank\nBody ')
+
+        self.assertEqual(self.block_ranges(), [[(10, 14)], [(0, 9)], [(4, 1)]])
+
+        self.highlighter.set_summary_empty(False)
+
+        self.assertEqual(self.block_ranges(), [[], [], [(4, 1)]])
+
+    def test_roles_follow_inserted_and_removed_blocks(self):
+        self.document.setPlainText('Summary\n\nBody line')
+        self.assertEqual(self.block_ranges(), [[], [], []])
+
+        QTextCursor(self.document).insertText('Summary that is too long\n')
+        self.assertEqual(self.block_ranges(), [[(10, 14)], [(0, 7)], [], []])
+
+        cursor = QTextCursor(self.document)
+        cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        self.assertEqual(self.block_ranges(), [[], [], []])
+
+
+class TestSummaryHighlighter(TestCase):
+    def test_highlight_keeps_text_and_selection(self):
+        line_edit = QLineEdit()
+        highlighter = SummaryHighlighter(line_edit, LIMITS)
+        line_edit.setText('Summary that is too long')
+        line_edit.setSelection(0, 7)
+        highlighter.highlight('Summary that is too long ')
+
+        self.assertEqual(highlighter.spans, [(10, 15, SUMMARY_TOO_LONG), (24, 1, TRAILING_WHITESPACE)])
+        self.assertEqual(line_edit.text(), 'Summary that is too long')
+        self.assertEqual(line_edit.selectedText(), 'Summary')
+
+        line_edit.setText('Summary')
+
+        self.assertEqual(highlighter.spans, [])
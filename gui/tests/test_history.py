@@ -0,0 +1,83 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest import TestCase, mock
+from history import HistoryStore, match_query
+
+
+class TestHistoryStore(TestCase):
+    def setUp(self):
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = HistoryStore(os.path.join(self.directory, 'history.sqlite3'))
+        self.addCleanup(self.store.shutdown)
+
+    def record(self, *messages):
+        for message in messages:
+            summary, _, body = message.partition('\n\n')
+            self.store.record(summary, body, message, self.directory, 'copy')
+
+        self.store.flush()
+
+    def test_search(self):
+        self.record('Fix race in file watcher', 'Refactor parser\n\nFix error messages', 'Bump version')
+
+        self.assertEqual(
+            [entry.summary for entry in self.store.search('fix')],
+            ['Refactor parser', 'Fix race in file watcher'],
+        )
+        self.assertEqual([entry.summary for entry in self.store.search('fi wat')], ['Fix race in file watcher'])
+        self.assertEqual([entry.summary for entry in self.store.search('')][0], 'Bump version')
+        self.assertEqual(self.store.search('missing'), [])
+
+        entry = self.store.search('bump')[0]
+        self.assertEqual((entry.message, entry.repo, entry.source), ('Bump version', self.directory, 'copy'))
+
+    def test_search_limit(self):
+        self.record(*[f'Message {i}' for i in range(10)])
+
+        self.assertEqual([entry.summary for entry in self.store.search('message', limit=2)], ['Message 9', 'Message 8'])
+
+    def test_search_records_repository(self):
+        repo = os.path.join(self.directory, 'repo')
+        os.makedirs(os.path.join(repo, '.git'))
+        self.store.record('Summary', '', 'Summary', os.path.join(repo, 'subdirectory'), 'export')
+        self.store.flush()
+
+        self.assertEqual(self.store.search('summary')[0].repo, repo)
+
+    def test_search_without_fts(self):
+        self.record('Fix 100% of bugs', 'Fix 100 bugs')
+        self.store.fts = False
+
+        self.assertEqual([entry.summary for entry in self.store.search('100%')], ['Fix 100% of bugs'])
+
+    def test_write_error_keeps_draining(self):
+        self.record('Before')
+        with mock.patch('history.INSERT_QUERY', 'INSERT INTO missing VALUES (?, ?, ?, ?, ?, ?)'), \
+                self.assertLogs('history', 'ERROR'):
+            self.store.record('Lost', '', 'Lost', self.directory, 'copy')
+            # flush on another thread, so that a stuck writer fails the test instead of hanging it
+            flusher = threading.Thread(target=self.store.flush, daemon=True)
+            flusher.start()
+            flusher.join(5)
+
+        self.assertFalse(flusher.is_alive())
+
+        self.record('After')
+        self.assertEqual([entry.summary for entry in self.store.search('')], ['After', 'Before'])
+
+    def test_open_error_keeps_draining(self):
+        with mock.patch.object(self.store, 'connect', side_effect=sqlite3.OperationalError('disk I/O error')), \
+                self.assertLogs('history', 'ERROR'):
+            self.store.record('Lost', '', 'Lost', self.directory, 'copy')
+            flusher = threading.Thread(target=self.store.flush, daemon=True)
+            flusher.start()
+            flusher.join(5)
+
+        self.assertFalse(flusher.is_alive())
+
+    def test_match_query(self):
+        self.assertEqual(match_query('fix "race'), '"fix"* """race"*')
@@ -0,0 +1,27 @@
+import os
+import sys
+import subprocess
+from unittest import TestCase
+
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+INSTRUMENT_CODE = 'from tracing import HotPathTrace\nHotPathTrace("trace.json").instrument_mangoui()'
+
+
+class TestMangoUIImports(TestCase):
+    def test_import_class_after_submodule(self):
+        for code, name in [
+            ('from MangoUI import Theme\nfrom MangoUI import Button', 'Button'),
+            ('from MangoUI import TagBox\nfrom MangoUI import FlowLayout', 'FlowLayout'),
+            (f'{INSTRUMENT_CODE}\nfrom MangoUI import Button', 'Button'),
+            ('import MangoUI\nCanvas = MangoUI.Canvas', 'Canvas'),
+        ]:
+            # a fresh interpreter, since the modules are already imported here
+            result = subprocess.run(
+                [sys.executable, '-c', f'{code}\nassert isinstance({name}, type), {name}'],
+                cwd=GUI_DIR,
+                capture_output=True,
+                text=True,
+            )
+
+            self.assertEqual(result.returncode, 0, result.stderr)
@@ -0,0 +1,50 @@
+import sys
+import random
+from unittest import TestCase
+from PyQt6.QtWidgets import QApplication
+from preview import MessagePreview
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestPreview(TestCase):
+    def setUp(self):
+        self.preview = MessagePreview()
+
+    def test_replace_chunks(self):
+        self.preview.replace_chunks(0, 1, ['Summary', '', 'Body'])
+        self.preview.replace_chunks(2, 2, ['First paragraph\nwrapped'])
+        self.preview.replace_chunks(3, 4, [])
+        self.preview.replace_chunks(0, 2, [])
+
+        self.assertEqual(self.preview.toPlainText(), 'First paragraph\nwrapped')
+        self.assertEqual(self.preview.document().blockCount(), 1)
+
+    def test_replace_chunks_random(self):
+        rng = random.Random(0)
+        words = ['', 'a', 'b', 'a\nb', 'long chunk']
+        chunks = ['']
+        for _ in range(1000):
+            start = rng.randint(0, len(chunks))
+            stop = rng.randint(start, len(chunks))
+            new = [rng.choice(words) for _ in range(rng.randint(0, 3))]
+            if len(chunks) - (stop - start) + len(new) == 0:
+                continue
+
+            chunks[start:stop] = new
+            self.preview.replace_chunks(start, stop, new)
+
+            self.assertEqual(self.preview.toPlainText(), '\n'.join(chunks))
+            self.assertEqual(self.preview.document().blockCount(), len(chunks))
+
+    def test_replace_chunks_keeps_scroll_position(self):
+        self.preview.resize(200, 100)
+        self.preview.replace_chunks(0, 1, [f'Line {i}' for i in range(500)])
+        scroll_bar = self.preview.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum() // 2)
+        value = scroll_bar.value()
+
+        self.preview.replace_chunks(499, 500, ['Last line'])
+
+        self.assertEqual(scroll_bar.value(), value)
@@ -0,0 +1,121 @@
+import io
+import os
+import sys
+import subprocess
+from unittest import TestCase
+from formatting import Limits, MessageFormatter
+from reflow import read_records, reflow_lines, reflow_mbox, reflow_message, reflow_records
+
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+class TestReflow(TestCase):
+    def setUp(self):
+        self.formatter = MessageFormatter(Limits(summary=10, body_wrap=12))
+
+    def test_read_records(self):
+        stream = io.StringIO('first\0second message\0\0third')
+        records = list(read_records(stream, chunk_size=4))
+
+        self.assertEqual(records, ['first', 'second message', '', 'third'])
+
+        stream = io.StringIO('first\nsecond\n')
+        self.assertEqual(list(read_records(stream, '\n', chunk_size=4, keep_separator=True)), ['first\n', 'second\n'])
+
+    def test_reflow_records(self):
+        records = [
+            'Summary that is too long\n\nBody that needs to be wrapped\n',
+            'Short\n',
+            'Short\n\n\nBody\n',
+        ]
+        expected = [
+            'Summary th\n\nBody that\nneeds to be\nwrapped\n',
+            'Short\n',
+            'Short\n\nBody\n',
+        ]
+
+        self.assertEqual(list(reflow_records(records, self.formatter)), expected)
+
+    def test_reflow_records_separator(self):
+        records = ['Short\n\0', 'Summary that is too long\n']
+        expected = ['Short\n\0', 'Summary th\n']
+
+        self.assertEqual(list(reflow_records(records, self.formatter, separator='\0')), expected)
+
+    def test_reflow_lines(self):
+        messages = [
+            'Summary that is too long\n\n\nBody that needs to be wrapped\n\nBug: prose that looks like a trailer\n',
+            'Summary\n\nBody\n\nFixes: a trailer that is long\nCc: Someone\n\n',
+            'Summary\n\n  \nCc: Someone',
+            '\nBody without summary\n',
+            'Summary only',
+            '',
+        ]
+        for message in messages:
+            lines = read_records(io.StringIO(message), '\n', keep_separator=True)
+            self.assertEqual(''.join(reflow_lines(lines, self.formatter)), reflow_message(message, self.formatter))
+
+    def test_reflow_lines_streams(self):
+        def lines():
+            yield 'Summary\n'
+            yield '\n'
+            yield 'First paragraph\n'
+            yield '\n'
+            yield 'Second paragraph\n'
+            raise AssertionError('read past the second paragraph')
+
+        output = reflow_lines(lines(), self.formatter)
+
+        self.assertEqual(next(output), 'Summary\n\n')
+        self.assertEqual(next(output), 'First\nparagraph\n')
+
+    def test_main_null_round_trip(self):
+        for messages in ('Summary\n\nBody\n\0Summary\n', 'Summary\n\0Summary\n\0'):
+            result = subprocess.run(
+                [sys.executable, 'reflow.py', '-z'],
+                cwd=GUI_DIR,
+                input=messages.encode('utf-8'),
+                capture_output=True,
+                check=True,
+            )
+
+            self.assertEqual(result.stdout.decode('utf-8'), messages)
+
+    def test_reflow_mbox(self):
+        mbox = (
+            'From 0123456789abcdef0123456789abcdef01234567 Mon Sep 17 00:00:00 2001\n'
+            'From: Author <author@example.com>\n'
+            'Subject: [PATCH 1/2] Summary that is\n'
+            ' too long\n'
+            '\n'
+            'Body that needs to be wrapped\n'
+            '---\n'
+            ' file | 1 +\n'
+            '\n'
+            'diff --git a/file b/file\n'
+            '+line that should never be wrapped by reflow\n'
+            'From 76543210fedcba9876543210fedcba9876543210 Mon Sep 17 00:00:00 2001\n'
+            'Subject: =?UTF-8?q?Encoded=20subject=20that=20is=20long?=\n'
+            '\n'
+            'Body\n'
+        )
+        expected = (
+            'From 0123456789abcdef0123456789abcdef01234567 Mon Sep 17 00:00:00 2001\n'
+            'From: Author <author@example.com>\n'
+            'Subject: [PATCH 1/2] Summary th\n'
+            '\n'
+            'Body that\nneeds to be\nwrapped\n'
+            '---\n'
+            ' file | 1 +\n'
+            '\n'
+            'diff --git a/file b/file\n'
+            '+line that should never be wrapped by reflow\n'
+            'From 76543210fedcba9876543210fedcba9876543210 Mon Sep 17 00:00:00 2001\n'
+            'Subject: =?UTF-8?q?Encoded=20subject=20that=20is=20long?=\n'
+            '\n'
+            'Body\n'
+        )
+        output = ''.join(reflow_mbox(io.StringIO(mbox), self.formatter))
+
+        self.assertEqual(output, expected)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import subprocess
+from unittest import TestCase, mock, skipIf
+from formatting import DEFAULT_LIMITS
+from scanner import list_commits, load_state, scan, scan_batch
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', repo, *args], capture_output=True, check=True)
+
+
+@skipIf(shutil.which('git') is None, 'git is not installed')
+class TestScanner(TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo)
+
+        git(self.repo, 'init')
+        git(self.repo, 'config', 'user.name', 'gitmsg')
+        git(self.repo, 'config', 'user.email', 'gitmsg@example.com')
+        self.commit('Summary that is far too long to fit within the fifty character limit')
+        self.commit('Short summary\n\nBody')
+
+    def commit(self, message):
+        with open(os.path.join(self.repo, 'file'), 'a') as f:
+            f.write(message)
+
+        git(self.repo, 'add', 'file')
+        git(self.repo, 'commit', '-m', message)
+
+    def test_scan(self):
+        report = scan([self.repo], jobs=2, batch_size=1)
+        repo = os.path.realpath(self.repo)
+
+        self.assertEqual(report['repositories'], {repo: {'commits': 2, 'violations': 1}})
+        self.assertEqual(len(report['violations']), 1)
+        self.assertEqual(report['violations'][0]['rule'], 'summary-too-long')
+
+    def test_scan_incremental(self):
+        state = {}
+        scan([self.repo], jobs=1, state=state)
+        self.commit('Summary\nwithout blank line')
+        report = scan([self.repo], jobs=1, state=state)
+        repo = os.path.realpath(self.repo)
+
+        self.assertEqual(report['repositories'], {repo: {'commits': 1, 'violations': 1}})
+        self.assertEqual(report['violations'][0]['rule'], 'missing-blank-line')
+
+    def test_scan_invalid_repo(self):
+        path = os.path.join(self.repo, 'missing')
+        report = scan([path], jobs=1)
+
+        self.assertIn('error', report['repositories'][path])
+
+    def test_scan_unknown_state(self):
+        repo = os.path.realpath(self.repo)
+        state = {repo: '0' * 40}
+        report = scan([self.repo], jobs=1, state=state)
+        head = subprocess.run(['git', '-C', self.repo, 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout
+
+        self.assertEqual(report['repositories'], {repo: {'commits': 2, 'violations': 1}})
+        self.assertEqual(state, {repo: head.strip()})
+
+    def test_load_state_corrupt(self):
+        path = os.path.join(self.repo, 'state.json')
+        for content in ('{"repo": "01234', '["repo"]'):
+            with open(path, 'w') as f:
+                f.write(content)
+
+            self.assertEqual(load_state(path), {})
+
+        self.assertEqual(load_state(os.path.join(self.repo, 'missing.json')), {})
+
+    def test_scan_batch_error(self):
+        repo, count, violations, error = scan_batch(self.repo, ['0' * 40], DEFAULT_LIMITS)
+
+        self.assertEqual((repo, count, violations), (self.repo, 0, []))
+        self.assertIsNotNone(error)
+
+    def test_git_not_found(self):
+        with mock.patch('scanner.subprocess.run', side_effect=FileNotFoundError(2, 'No such file', 'git')):
+            repo, commits, error, reset = list_commits(self.repo, 'HEAD', '0' * 40)
+
+        self.assertEqual(commits, [])
+        self.assertTrue(error.startswith('git could not be run'))
@@ -0,0 +1,48 @@
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+from settings import SettingsStore
+
+
+class TestSettingsStore(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, 'settings.json')
+
+    def test_defaults_and_cached_values(self):
+        with open(self.path, 'w') as f:
+            json.dump({'_width': 1024}, f)
+
+        store = SettingsStore(self.path, {'_width': 800, '_height': 600})
+
+        self.assertEqual(store.get('_width'), 1024)
+        self.assertEqual(store.get('_height'), 600)
+        self.assertFalse(store.flush())
+
+    def test_flush_writes_dirty_settings_only(self):
+        store = SettingsStore(self.path, {'_width': 800, '_height': 600})
+        store.update(_width=800)
+        self.assertFalse(store.flush())
+
+        store.update(_width=1024)
+        self.assertTrue(store.flush())
+
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {'_width': 1024})
+
+        self.assertEqual(os.listdir(self.dir), ['settings.json'])
+
+    def test_flush_keeps_settings_of_other_instances(self):
+        first = SettingsStore(self.path)
+        second = SettingsStore(self.path)
+
+        first.update(_width=1024)
+        second.update(_x_pos=10)
+        first.flush()
+        second.flush()
+
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {'_width': 1024, '_x_pos': 10})
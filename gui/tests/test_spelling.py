@@ -0,0 +1,135 @@
+import os
+import sys
+import shutil
+import tempfile
+from io import StringIO
+from contextlib import redirect_stdout
+from unittest import TestCase
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextDocument
+from PyQt6.QtTest import QSignalSpy
+from highlighter import BodyHighlighter
+from spelling import SpellChecker, WordList, build_word_list, main, misspelled_spans, read_words
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+WORDS = ['a', 'and', 'commit', 'fix', 'message', 'race', 'the', 'in', 'watcher', "don't", 'été', 'zebra']
+
+
+class TestWordList(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'words')
+
+    def open(self, words):
+        build_word_list(words, self.path)
+        word_list = WordList(self.path)
+        self.addCleanup(word_list.close)
+
+        return word_list
+
+    def test_contains(self):
+        word_list = self.open(WORDS + ['Fix', 'FIX'])
+
+        for word in WORDS:
+            self.assertIn(word, word_list)
+
+        self.assertIn('Watcher', word_list)
+        for word in ['', 'aa', 'b', 'fi', 'fixes', 'zebras', 'zz', 'é', "don"]:
+            self.assertNotIn(word, word_list)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read().count(b'\n'), len(WORDS))
+
+    def test_contains_every_word(self):
+        words = [f'w{i:05d}' for i in range(0, 20000, 3)]
+        word_list = self.open(words)
+
+        self.assertTrue(all(word in word_list for word in words))
+        self.assertFalse(any(f'w{i:05d}' in word_list for i in range(1, 20000, 3)))
+
+    def test_empty(self):
+        self.assertNotIn('word', self.open([]))
+
+    def test_read_words(self):
+        path = os.path.join(self.directory, 'en.dic')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('3\ncommit/SM\nfix/MS\n\nrace\n')
+
+        self.assertEqual(list(read_words(path)), ['commit', 'fix', 'race'])
+
+    def test_main(self):
+        source = os.path.join(self.directory, 'source')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('Fix\nfix\nrace\n')
+
+        with redirect_stdout(StringIO()) as output:
+            main([source, '--output', self.path])
+
+        self.assertEqual(output.getvalue(), f'2 words written to {self.path}\n')
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'fix\nrace\n')
+
+
+class TestMisspelledSpans(TestCase):
+    def test_misspelled_spans(self):
+        words = set(WORDS)
+
+        self.assertEqual(misspelled_spans('Fix the rcae in watcher', words), [(8, 4)])
+        self.assertEqual(misspelled_spans("Don't fix the watcher's rcae's", words), [(24, 6)])
+        self.assertEqual(misspelled_spans('Fix HTTP in setUp and x', words), [])
+        self.assertEqual(misspelled_spans('Fix `qwrt` in gui/qwrt.py and https://qwrt.example', words), [])
+
+
+class TestSpellChecker(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        source = os.path.join(self.directory, 'source')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(WORDS))
+
+        self.spell_checker = SpellChecker(os.path.join(self.directory, 'dictionary'), [source])
+        self.addCleanup(self.spell_checker.shutdown)
+
+    def test_spans(self):
+        spy = QSignalSpy(self.spell_checker.checked)
+        self.assertIsNone(self.spell_checker.spans('Fix the rcae'))
+        self.assertIsNone(self.spell_checker.spans('Fix the rcae'))
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        self.assertEqual(list(spy[0]), ['Fix the rcae', [(8, 4)]])
+        self.assertEqual(self.spell_checker.spans('Fix the rcae'), [(8, 4)])
+        self.assertTrue(os.path.exists(self.spell_checker.path))
+
+    def test_spans_without_dictionary(self):
+        self.spell_checker.sources = []
+        spy = QSignalSpy(self.spell_checker.checked)
+        self.spell_checker.spans('Fix the rcae')
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+        self.assertEqual(self.spell_checker.spans('Fix the rcae'), [])
+
+    def test_highlighter(self):
+        document = QTextDocument()
+        document.documentLayout()
+        highlighter = BodyHighlighter(document, spell_checker=self.spell_checker, summary_empty=False)
+
+        spy = QSignalSpy(self.spell_checker.checked)
+        document.setPlainText('Fix the rcae\n```\nrcae\n```\n    rcae\nrcae')
+        while len(spy) < 2:
+            self.assertTrue(spy.wait(1000))
+
+        app.processEvents()
+
+        ranges = []
+        block = document.begin()
+        while block.isValid():
+            ranges.append([(r.start, r.length) for r in block.layout().formats()])
+            block = block.next()
+
+        self.assertEqual(ranges, [[(8, 4)], [], [], [], [], [(0, 4)]])
+        self.assertEqual(highlighter.unchecked, {})
@@ -0,0 +1,146 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from unittest import TestCase, mock, skipIf
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtTest import QSignalSpy
+from staged import (
+    StagedAnalyzer,
+    StagedChangesParser,
+    StagedFile,
+    format_staged_changes,
+    parse_staged_changes,
+    read_cache,
+    write_cache,
+)
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+DIFF_OUTPUT = [
+    ':100644 100644 1111111 2222222 M\tgui/gitmsg.py',
+    ':000000 100644 0000000 3333333 A\tgui/tests/test_staged.py',
+    ':100644 000000 4444444 0000000 D\tgui/img/logo.png',
+    '30\t2\tgui/gitmsg.py',
+    '10\t0\tgui/tests/test_staged.py',
+    '-\t-\tgui/img/logo.png',
+]
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', repo, *args], capture_output=True, check=True)
+
+
+class TestStagedChanges(TestCase):
+    def test_parse_staged_changes(self):
+        changes = parse_staged_changes(DIFF_OUTPUT)
+
+        self.assertEqual((changes.files, changes.added, changes.deleted, changes.binary), (3, 40, 2, 1))
+        self.assertEqual(changes.scope, 'gui')
+        self.assertEqual(changes.listed, [
+            StagedFile('M', 'gui/gitmsg.py', 30, 2),
+            StagedFile('A', 'gui/tests/test_staged.py', 10, 0),
+            StagedFile('D', 'gui/img/logo.png', None, None),
+        ])
+
+    def test_parse_staged_changes_scope(self):
+        self.assertEqual(parse_staged_changes(['1\t1\tgui/tests/a.py', '1\t1\tgui/tests/b.py']).scope, 'tests')
+        self.assertIsNone(parse_staged_changes(['1\t1\tgui/a.py', '1\t1\tREADME.md']).scope)
+        self.assertIsNone(parse_staged_changes([]).scope)
+
+    def test_parser_bounded(self):
+        parser = StagedChangesParser(max_listed=2)
+        for i in range(1000):
+            parser.feed(f':100644 100644 1111111 2222222 M\tsrc/{i}.py')
+
+        for i in range(1000):
+            parser.feed(f'1\t0\tsrc/{i}.py')
+
+        changes = parser.result()
+        self.assertEqual((changes.files, changes.added), (1000, 1000))
+        self.assertEqual(len(parser.statuses), 2)
+        self.assertEqual(len(changes.listed), 2)
+
+    def test_format_staged_changes(self):
+        changes = parse_staged_changes(DIFF_OUTPUT)
+
+        self.assertEqual(format_staged_changes(changes), '\n'.join([
+            'Changes 3 files (+40 -2).',
+            '',
+            '- M gui/gitmsg.py (+30 -2)',
+            '- A gui/tests/test_staged.py (+10 -0)',
+            '- D gui/img/logo.png (binary)',
+        ]))
+        self.assertEqual(format_staged_changes(changes._replace(files=5)).splitlines()[-1], '- and 2 more')
+        self.assertEqual(format_staged_changes(parse_staged_changes([])), '')
+
+    def test_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'cache', 'staged.json')
+        changes = parse_staged_changes(DIFF_OUTPUT)
+        write_cache(path, [1, 2], changes)
+
+        self.assertEqual(read_cache(path, [1, 2]), changes)
+        self.assertIsNone(read_cache(path, [1, 3]))
+        self.assertIsNone(read_cache(os.path.join(directory, 'missing.json'), [1, 2]))
+
+
+@skipIf(shutil.which('git') is None, 'git is not installed')
+class TestStagedAnalyzer(TestCase):
+    def setUp(self):
+        self.repo = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.repo)
+        self.cache_dir = os.path.join(self.repo, '.git', 'staged_cache')
+
+        git(self.repo, 'init')
+        os.makedirs(os.path.join(self.repo, 'gui'))
+        for name in ('a.py', 'b.py'):
+            with open(os.path.join(self.repo, 'gui', name), 'w') as f:
+                f.write('a\nb\n')
+
+        git(self.repo, 'add', '.')
+
+        self.analyzer = StagedAnalyzer(self.cache_dir)
+        self.addCleanup(self.analyzer.shutdown)
+
+    def test_analyze(self):
+        spy = QSignalSpy(self.analyzer.analyzed)
+        self.analyzer.analyze(self.repo)
+        self.assertTrue(len(spy) > 0 or spy.wait(5000))
+
+        changes = spy[0][0]
+        self.assertEqual((changes.files, changes.added, changes.scope), (2, 4, 'gui'))
+        self.assertEqual([staged_file.status for staged_file in changes.listed], ['A', 'A'])
+
+        with mock.patch('staged.QProcess') as m:
+            self.analyzer.analyze(self.repo)
+
+        m.assert_not_called()
+        self.assertEqual(spy[1][0], changes)
+
+    def test_analyze_outside_repository(self):
+        spy = QSignalSpy(self.analyzer.analysis_failed)
+        self.analyzer.analyze(tempfile.gettempdir())
+
+        self.assertTrue(len(spy) > 0 or spy.wait(1000))
+
+    def test_analyze_after_soft_reset(self):
+        git(self.repo, '-c', 'user.name=gitmsg', '-c', 'user.email=gitmsg@example.com', 'commit', '-m', 'First')
+        with open(os.path.join(self.repo, 'gui', 'a.py'), 'a') as f:
+            f.write('c\n')
+
+        git(self.repo, 'add', '.')
+        git(self.repo, '-c', 'user.name=gitmsg', '-c', 'user.email=gitmsg@example.com', 'commit', '-m', 'Second')
+        spy = QSignalSpy(self.analyzer.analyzed)
+        self.analyzer.analyze(self.repo)
+        self.assertTrue(len(spy) > 0 or spy.wait(5000))
+        self.assertEqual(spy[0][0].files, 0)
+
+        # moves HEAD back without touching the index
+        git(self.repo, 'reset', '--soft', 'HEAD~1')
+        self.analyzer.analyze(self.repo)
+        self.assertTrue(len(spy) > 1 or spy.wait(5000))
+        self.assertEqual((spy[1][0].files, spy[1][0].added), (1, 1))
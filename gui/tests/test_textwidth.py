@@ -0,0 +1,62 @@
+import textwrap
+from unittest import TestCase
+from textwidth import DisplayWidthWrapper, char_width, graphemes, str_width, truncate
+
+
+FAMILY = '\U0001F469\u200d\U0001F469\u200d\U0001F467'
+FLAG = '\U0001F1EF\U0001F1F5'
+HEART = '\u2764\ufe0f'
+E_ACUTE = 'e\u0301'
+
+
+class TestTextWidth(TestCase):
+    def test_char_width(self):
+        self.assertEqual(char_width('a'), 1)
+        self.assertEqual(char_width('\u00e9'), 1)
+        self.assertEqual(char_width('\u6f22'), 2)
+        self.assertEqual(char_width('\uac00'), 2)
+        self.assertEqual(char_width('\U0001F600'), 2)
+        self.assertEqual(char_width('\u0301'), 0)
+        self.assertEqual(char_width('\u200b'), 0)
+        self.assertEqual(char_width('\u0378'), 1)
+
+    def test_str_width(self):
+        self.assertEqual(str_width('commit'), 6)
+        self.assertEqual(str_width('\u6f22\u5b57 ok'), 7)
+        self.assertEqual(str_width(E_ACUTE * 3), 3)
+        self.assertEqual(str_width(FAMILY), 2)
+        self.assertEqual(str_width(FLAG), 2)
+        self.assertEqual(str_width(HEART), 2)
+
+    def test_graphemes(self):
+        text = 'a' + E_ACUTE + FAMILY + FLAG + HEART
+
+        self.assertEqual([cluster for cluster, _ in graphemes(text)], ['a', E_ACUTE, FAMILY, FLAG, HEART])
+
+    def test_truncate(self):
+        self.assertEqual(truncate('summary', 3), 'sum')
+        self.assertEqual(truncate(E_ACUTE * 3, 2), E_ACUTE * 2)
+        self.assertEqual(truncate('\u6f22\u5b57', 3), '\u6f22')
+        self.assertEqual(truncate('a' + FAMILY, 2), 'a')
+        self.assertEqual(truncate('a' + FAMILY, 3), 'a' + FAMILY)
+
+    def test_wrapper_ascii(self):
+        text = 'The quick brown fox jumps over the lazy dog, then keeps-on-running-until-it-drops ' * 5
+        for width in [10, 20, 72]:
+            self.assertEqual(DisplayWidthWrapper(width=width).wrap(text), textwrap.TextWrapper(width=width).wrap(text))
+
+    def test_wrapper_wide(self):
+        text = '\u6f22\u5b57\u304b\u306a' * 30
+        lines = DisplayWidthWrapper(width=72).wrap(text)
+
+        self.assertEqual(''.join(lines), text)
+        self.assertTrue(all(str_width(line) == 72 for line in lines[:-1]))
+
+    def test_wrapper_does_not_split_clusters(self):
+        text = ' '.join([FAMILY * 5, E_ACUTE * 20, FLAG * 7])
+        for width in range(1, 20):
+            lines = DisplayWidthWrapper(width=width).wrap(text)
+            clusters = [cluster for line in lines for cluster, _ in graphemes(line) if cluster != ' ']
+
+            self.assertEqual(clusters, [cluster for cluster, _ in graphemes(text.replace(' ', ''))])
+            self.assertTrue(all(str_width(line) <= max(width, 2) for line in lines))
@@ -0,0 +1,74 @@
+import sys
+from unittest import TestCase, mock
+from PyQt6.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+from MangoUI import Button, Theme
+
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+STYLE_SHEET = '''
+    QLabel {{
+        color: {text};
+    }}
+
+    QLabel[role="hint"] {{
+        color: {accent};
+    }}
+'''
+
+
+class TestTheme(TestCase):
+    def setUp(self):
+        self.root = QWidget()
+        self.label = QLabel(self.root)
+        self.buttons = [Button(renderMode='paint'), Button()]
+        layout = QVBoxLayout(self.root)
+        layout.addWidget(self.label)
+        for button in self.buttons:
+            layout.addWidget(button)
+
+        self.theme = Theme(
+            {'text': 'rgb(1, 2, 3)', 'accent': '#FF0A0B0C', 'background': (4, 5, 6)},
+            STYLE_SHEET,
+            buttonColors={'primaryColor': 'accent', 'secondaryColor': 'background'},
+        )
+
+    def test_apply(self):
+        with mock.patch.object(self.root, 'setUpdatesEnabled', wraps=self.root.setUpdatesEnabled) as m:
+            self.theme.apply(self.root)
+
+        self.assertEqual([call.args for call in m.call_args_list], [(False,), (True,)])
+        self.assertTrue(self.root.updatesEnabled())
+        self.assertIn('color: rgb(1, 2, 3);', self.root.styleSheet())
+        self.assertIn('color: #FF0A0B0C;', self.root.styleSheet())
+        for button in self.buttons:
+            self.assertEqual((button.primaryColor, button.secondaryColor), ((10, 11, 12, 255), (4, 5, 6, 255)))
+
+    def test_apply_unchanged(self):
+        self.theme.apply(self.root)
+        with mock.patch.object(self.root, 'setStyleSheet') as m, \
+                mock.patch.object(self.buttons[0], 'setupAnimationColors') as n:
+            self.theme.apply(self.root)
+
+        m.assert_not_called()
+        n.assert_not_called()
+
+    def test_button_color_arguments(self):
+        button = Button(self.root, **self.theme.buttonColorArguments())
+        with mock.patch.object(button, 'setupAnimationColors') as m:
+            self.theme.apply(self.root)
+
+        m.assert_not_called()
+        self.assertEqual((button.primaryColor, button.secondaryColor), ((10, 11, 12, 255), (4, 5, 6, 255)))
+
+    def test_set_palette(self):
+        self.theme.apply(self.root)
+        self.theme.setPalette(text='rgb(7, 8, 9)', accent='rgb(1, 1, 1)')
+
+        self.assertIn('color: rgb(1, 2, 3);', self.root.styleSheet())
+
+        self.theme.apply(self.root)
+
+        self.assertIn('color: rgb(7, 8, 9);', self.root.styleSheet())
+        self.assertEqual(self.buttons[1].primaryColor, (1, 1, 1, 255))
+        self.assertIn('rgba(4, 5, 6, 255)', self.buttons[1].styleSheet())
@@ -0,0 +1,139 @@
+import os
+import json
+import shutil
+import importlib
+import contextlib
+import tempfile
+import threading
+from io import StringIO
+from unittest import TestCase, mock
+from tracing import MANGOUI_HOT_PATHS, HotPathTrace, env_flag, percentile
+
+
+class Widget:
+    def render(self, value):
+        return value * 2
+
+
+class TestEnvFlag(TestCase):
+    def test_env_flag(self):
+        for value, expected in [('1', True), ('true', True), ('0', False), ('False', False), ('', False)]:
+            with mock.patch.dict(os.environ, {'GITMSG_TEST_FLAG': value}):
+                self.assertEqual(env_flag('GITMSG_TEST_FLAG'), expected, value)
+
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertFalse(env_flag('GITMSG_TEST_FLAG'))
+
+
+class TestHotPathTrace(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'trace.json')
+
+    def test_disabled(self):
+        trace = HotPathTrace()
+
+        def render():
+            pass
+
+        self.assertIs(trace.traced(render), render)
+
+        method = Widget.render
+        trace.instrument(Widget, 'render')
+        self.assertIs(Widget.render, method)
+        self.assertEqual(Widget().render(2), 4)
+        self.assertEqual(len(trace.events), 0)
+
+        trace.report()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_traced(self):
+        trace = HotPathTrace(self.path, max_events=3)
+
+        @trace.traced
+        def render(value):
+            if value < 0:
+                raise ValueError(value)
+
+            return value
+
+        for i in range(5):
+            self.assertEqual(render(i), i)
+
+        with self.assertRaises(ValueError):
+            render(-1)
+
+        self.assertEqual(len(trace.events), 3)
+        self.assertEqual(trace.counts, {render.__qualname__: 6})
+        self.assertEqual(trace.events[0][3], threading.get_ident())
+
+    def test_instrument(self):
+        class Layout:
+            def doLayout(self, rect):
+                return rect
+
+        trace = HotPathTrace(self.path)
+        trace.instrument(Layout, 'doLayout')
+        self.assertEqual(Layout().doLayout(1), 1)
+
+        self.assertEqual([event[0] for event in trace.events], [Layout.doLayout.__qualname__])
+
+    def test_instrument_mangoui(self):
+        trace = HotPathTrace(self.path)
+        methods = [(getattr(importlib.import_module(module), cls), name) for module, cls, name in MANGOUI_HOT_PATHS]
+        with contextlib.ExitStack() as stack:
+            # restores the methods replaced by instrumenting
+            for cls, name in methods:
+                stack.enter_context(mock.patch.object(cls, name, getattr(cls, name)))
+
+            trace.instrument_mangoui()
+            traced = {
+                getattr(cls, name).__qualname__ for cls, name in methods if hasattr(getattr(cls, name), '__wrapped__')
+            }
+
+        self.assertEqual(
+            traced,
+            {
+                'AnimationClock.tick',
+                'Button.paintEvent',
+                'Button.renderStyleSheet',
+                'FlowLayout.doLayout',
+                'Canvas.mouseMoveEvent',
+            },
+        )
+
+    def test_summary(self):
+        trace = HotPathTrace(self.path)
+        for i in range(1, 101):
+            trace.events.append(('display_msg', i, i / 1000, 1))
+            trace.counts['display_msg'] += 1
+
+        self.assertEqual(trace.summary(), {'display_msg': {'count': 100, 'p50': 50.0, 'p99': 99.0}})
+
+    def test_percentile(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+        self.assertEqual(percentile([7], 50), 7)
+
+    def test_report(self):
+        stream = StringIO()
+        trace = HotPathTrace(self.path, stream=stream, origin=1)
+        trace.events.append(('copy_msg', 1.5, 0.002, 7))
+        trace.counts['copy_msg'] += 1
+        trace.report()
+
+        with open(self.path, 'r') as f:
+            events = json.load(f)['traceEvents']
+
+        self.assertEqual(events, [{
+            'name': 'copy_msg',
+            'cat': 'gitmsg',
+            'ph': 'X',
+            'ts': 500000.0,
+            'dur': 2000.0,
+            'pid': os.getpid(),
+            'tid': 7,
+        }])
+        self.assertIn('copy_msg', stream.getvalue())
+        self.assertIn('2.000 ms', stream.getvalue())
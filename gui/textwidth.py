@@ -0,0 +1,172 @@
+import textwrap
+from bisect import bisect_right
+
+from widthtable import STARTS, ENDS, WIDTHS
+
+
+FIRST_TABLE_CODE_POINT = 0x300
+ZERO_WIDTH_JOINER = '\u200d'
+EMOJI_PRESENTATION_SELECTOR = '\ufe0f'
+REGIONAL_INDICATOR_START = 0x1F1E6
+REGIONAL_INDICATOR_END = 0x1F1FF
+
+
+def char_width(char):
+    """
+    Number of terminal columns taken up by a single character.
+    """
+    code = ord(char)
+    if code < FIRST_TABLE_CODE_POINT:
+        return 1
+
+    i = bisect_right(STARTS, code) - 1
+    if i >= 0 and code <= ENDS[i]:
+        return WIDTHS[i]
+
+    return 1
+
+
+def str_width(text):
+    """
+    Number of terminal columns taken up by text.
+    """
+    if text.isascii():
+        return len(text)
+
+    # joined sequences and emoji presentation change the width of a cluster, so only those need splitting
+    if ZERO_WIDTH_JOINER in text or EMOJI_PRESENTATION_SELECTOR in text:
+        return sum([width for _, width in graphemes(text)])
+
+    return sum(map(char_width, text))
+
+
+def is_regional_indicator(char):
+    """
+    Check whether character is one half of a flag.
+    """
+    return REGIONAL_INDICATOR_START <= ord(char) <= REGIONAL_INDICATOR_END
+
+
+def graphemes(text):
+    """
+    Split text into grapheme clusters.
+
+    A cluster is a character followed by its zero width characters, such as combining marks and variation selectors,
+    with characters joined by zero width joiners and pairs of regional indicators kept together.
+
+    Yields
+    ------
+    tuple
+        Cluster and its width in columns.
+    """
+    i = 0
+    n = len(text)
+    while i < n:
+        width = char_width(text[i])
+        j = i + 1
+        if is_regional_indicator(text[i]) and j < n and is_regional_indicator(text[j]):
+            width = 2
+            j += 1
+
+        while j < n and char_width(text[j]) == 0:
+            if text[j] == EMOJI_PRESENTATION_SELECTOR:
+                width = 2
+
+            j += 1
+            if text[j - 1] == ZERO_WIDTH_JOINER and j < n:
+                j += 1
+
+        yield text[i:j], width
+        i = j
+
+
+def truncate(text, width):
+    """
+    Truncate text to at most width columns without splitting grapheme clusters.
+    """
+    if text.isascii():
+        return text[:width]
+
+    length = 0
+    used = 0
+    for cluster, cluster_width in graphemes(text):
+        if used + cluster_width > width:
+            break
+
+        used += cluster_width
+        length += len(cluster)
+
+    return text[:length]
+
+
+class DisplayWidthWrapper(textwrap.TextWrapper):
+    """
+    Text wrapper that measures lines in terminal columns rather than characters.
+
+    Chunks that are all ASCII are measured with ``len``, so plain English text wraps exactly as with
+    ``textwrap.TextWrapper``. Long words are broken between grapheme clusters. ``max_lines`` is measured in characters.
+    """
+
+    def _wrap_chunks(self, chunks):
+        if self.max_lines is not None or all(chunk.isascii() for chunk in chunks):
+            return super()._wrap_chunks(chunks)
+
+        if self.width <= 0:
+            raise ValueError(f'invalid width {self.width!r} (must be > 0)')
+
+        lines = []
+        chunks.reverse()
+
+        while chunks:
+            cur_line = []
+            cur_len = 0
+            indent = self.subsequent_indent if lines else self.initial_indent
+            width = self.width - str_width(indent)
+
+            if self.drop_whitespace and chunks[-1].strip() == '' and lines:
+                del chunks[-1]
+
+            while chunks:
+                chunk_width = str_width(chunks[-1])
+                if cur_len + chunk_width > width:
+                    break
+
+                cur_line.append(chunks.pop())
+                cur_len += chunk_width
+
+            if chunks and str_width(chunks[-1]) > width:
+                self._handle_long_word(chunks, cur_line, cur_len, width)
+
+            if self.drop_whitespace and cur_line and cur_line[-1].strip() == '':
+                del cur_line[-1]
+
+            if cur_line:
+                lines.append(indent + ''.join(cur_line))
+
+        return lines
+
+    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+        chunk = reversed_chunks[-1]
+        if chunk.isascii():
+            return super()._handle_long_word(reversed_chunks, cur_line, cur_len, width)
+
+        if not self.break_long_words:
+            if not cur_line:
+                cur_line.append(reversed_chunks.pop())
+
+            return
+
+        space_left = 1 if width < 1 else width - cur_len
+        end = len(truncate(chunk, space_left))
+        if self.break_on_hyphens:
+            hyphen = chunk.rfind('-', 0, end)
+            if hyphen > 0 and any(c != '-' for c in chunk[:hyphen]):
+                end = hyphen + 1
+
+        # a cluster wider than the whole line is placed on a line of its own rather than never placed at all
+        if end == 0 and not cur_line:
+            end = len(next(graphemes(chunk))[0])
+
+        if end > 0:
+            cur_line.append(chunk[:end])
+            reversed_chunks[-1] = chunk[end:]
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import importlib
+from collections import Counter, deque
+
+from fileutils import atomic_write
+
+
+PROCESS_START = time.perf_counter()
+
+STARTUP_TRACE_ENV = 'GITMSG_STARTUP_TRACE'
+HOT_PATH_TRACE_ENV = 'GITMSG_TRACE'
+MAX_TRACE_EVENTS = 100000
+
+# modules, classes and methods of MangoUI that are wrapped in spans while hot path tracing is enabled. In paint render
+# mode each animation frame is a clock tick followed by a repaint of every animated button, and the style sheet is only
+# rendered again when colors or metrics change. In style sheet render mode it is rendered on every frame
+MANGOUI_HOT_PATHS = [
+    ('MangoUI.utils.AnimationClock', 'AnimationClock', 'tick'),
+    ('MangoUI', 'Button', 'paintEvent'),
+    ('MangoUI', 'Button', 'renderStyleSheet'),
+    ('MangoUI', 'FlowLayout', 'doLayout'),
+    ('MangoUI', 'Canvas', 'mouseMoveEvent'),
+]
+
+
+def env_flag(name):
+    """
+    Whether environment variable is set to a true value, treating unset, empty, ``0``, ``false``, ``no`` and ``off``
+    as false.
+    """
+    return os.environ.get(name, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+class StartupTrace:
+    """
+    Record startup milestones relative to the first import of this module.
+    """
+
+    def __init__(self, enabled, origin=PROCESS_START, stream=None):
+        self.enabled = enabled
+        self.origin = origin
+        self.stream = stream
+        self.marks = []
+
+    def mark(self, name):
+        """
+        Record milestone at current time.
+        """
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        """
+        Print elapsed time of every milestone since start and since the previous milestone.
+        """
+        if not self.enabled:
+            return
+
+        stream = sys.stderr if self.stream is None else self.stream
+        stream.write('gitmsg startup trace\n')
+
+        previous = self.origin
+        for name, timestamp in self.marks:
+            elapsed = (timestamp - self.origin) * 1000
+            delta = (timestamp - previous) * 1000
+            stream.write(f'  {name:<20} {elapsed:8.1f} ms  (+{delta:.1f} ms)\n')
+            previous = timestamp
+
+        stream.flush()
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    rank = -(-q * len(values) // 100)
+
+    return values[max(rank - 1, 0)]
+
+
+class HotPathTrace:
+    """
+    Record how long hot paths take, as spans that are exported in the Chrome trace event format.
+
+    Functions are traced by decorating them with ``traced``, and methods of classes that cannot be edited by
+    ``instrument``. While tracing is disabled, both leave functions untouched, so traced code runs exactly as untraced
+    code. Only the most recent spans are kept for the trace and percentiles, but every span is counted.
+    """
+
+    def __init__(self, path=None, stream=None, origin=PROCESS_START, max_events=MAX_TRACE_EVENTS):
+        self.path = path
+        self.enabled = path is not None
+        self.stream = stream
+        self.origin = origin
+        self.events = deque(maxlen=max_events)
+        self.counts = Counter()
+
+    def traced(self, func):
+        """
+        Decorate function to record a span named after it for every call, if tracing is enabled.
+        """
+        if not self.enabled:
+            return func
+
+        name = func.__qualname__
+        events = self.events
+        counts = self.counts
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                events.append((name, start, time.perf_counter() - start, threading.get_ident()))
+                counts[name] += 1
+
+        return wrapper
+
+    def instrument(self, cls, method_name):
+        """
+        Replace method of class with a traced method, if tracing is enabled.
+        """
+        method = getattr(cls, method_name)
+        traced = self.traced(method)
+        if traced is not method:
+            setattr(cls, method_name, traced)
+
+    def instrument_mangoui(self):
+        """
+        Trace hot paths of MangoUI, if tracing is enabled. The widgets are only imported when it is.
+
+        The clock connects its timer to ``tick`` when it is created, so this must run before any widget is animated.
+        """
+        if not self.enabled:
+            return
+
+        for module, cls, method_name in MANGOUI_HOT_PATHS:
+            self.instrument(getattr(importlib.import_module(module), cls), method_name)
+
+    def summary(self):
+        """
+        Summarize recorded spans.
+
+        Returns
+        -------
+        dict
+            Number of spans ever recorded, and median and 99th percentile duration in milliseconds of the most recent
+            ones, for every span name.
+        """
+        durations = {}
+        for name, _, duration, _ in list(self.events):
+            durations.setdefault(name, []).append(duration * 1000)
+
+        summary = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            summary[name] = {
+                'count': self.counts[name],
+                'p50': percentile(values, 50),
+                'p99': percentile(values, 99),
+            }
+
+        return summary
+
+    def chrome_trace(self):
+        """
+        Recorded spans as Chrome trace events, which ``chrome://tracing`` and Perfetto open.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': 'gitmsg',
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': pid,
+                'tid': tid,
+            }
+            for name, start, duration, tid in list(self.events)
+        ]
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def report(self):
+        """
+        Write recorded spans to the trace file and print their summary.
+        """
+        if not self.enabled:
+            return
+
+        atomic_write(self.path, json.dumps(self.chrome_trace()))
+
+        stream = sys.stderr if self.stream is None else self.stream
+        stream.write(f'gitmsg hot path trace written to {self.path}\n')
+        stream.write(f'  {"span":<36} {"count":>8} {"p50":>10} {"p99":>10}\n')
+        for name, stats in self.summary().items():
+            stream.write(f'  {name:<36} {stats["count"]:>8} {stats["p50"]:7.3f} ms {stats["p99"]:7.3f} ms\n')
+
+        stream.flush()
+
+
+startup_trace = StartupTrace(env_flag(STARTUP_TRACE_ENV))
+hot_path_trace = HotPathTrace(os.environ.get(HOT_PATH_TRACE_ENV) or None)